@@ -0,0 +1,72 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+from src.config import Config
+from src.data.data_loader import DataLoader
+from src.analysis.sections import required_columns
+
+
+def benchmark(file_path, engine, repeats, chunksize=None, columns=None):
+    """
+    Mede o tempo de leitura de um arquivo com um leitor de CSV.
+
+    Parameters:
+        file_path (str): Caminho do arquivo (.csv, .csv.gz ou .csv.zst).
+        engine (str): Leitor de CSV ("c" ou "pyarrow").
+        repeats (int): Número de repetições; o menor tempo é reportado.
+        chunksize (int, optional): Se informado, lê o arquivo em blocos com esse número de linhas.
+        columns (list, optional): Projeção de colunas repassada ao `DataLoader`.
+
+    Returns:
+        dict: Arquivo, leitor, modo, linhas, melhor tempo (s) e vazão (MB/s do arquivo em disco).
+    """
+    loader = DataLoader(file_path, engine=engine, columns=columns)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if chunksize:
+            rows = sum(len(chunk) for chunk in loader.iter_chunks(chunksize))
+        else:
+            rows = len(loader.load_data())
+        times.append(time.perf_counter() - start)
+
+    size_mb = os.path.getsize(file_path) / 1024 ** 2
+    return {
+        'Arquivo': os.path.basename(file_path),
+        'Leitor': engine,
+        'Modo': f"blocos de {chunksize}" if chunksize else "inteiro",
+        'Linhas': rows,
+        'Tempo (s)': min(times),
+        'MB/s': size_mb / min(times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara os leitores de CSV do DataLoader ('c' do Pandas e 'pyarrow' do Arrow)."
+    )
+    parser.add_argument("arquivos", nargs="*", default=[Config.RAW_DATA_PATH + "microdados.csv"],
+                        help="CSV(s) a serem lidos, opcionalmente compactados (.csv.gz ou .csv.zst).")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Número de repetições por combinação (reporta o menor tempo).")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Mede também a leitura em blocos com esse número de linhas.")
+    parser.add_argument("--todas-colunas", action="store_true",
+                        help="Lê todas as colunas em vez da projeção usada pelo relatório.")
+    args = parser.parse_args()
+
+    columns = None if args.todas_colunas else required_columns(Config.ANALYSIS_SECTIONS)
+    results = []
+    for file_path in args.arquivos:
+        for engine in DataLoader.ENGINES:
+            results.append(benchmark(file_path, engine, args.repeticoes, columns=columns))
+            if args.chunksize:
+                results.append(benchmark(file_path, engine, args.repeticoes, args.chunksize, columns))
+
+    print(pd.DataFrame(results).to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Mantém a raiz do projeto no sys.path dos testes, para que os módulos sejam importados como `src.*`
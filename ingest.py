@@ -0,0 +1,39 @@
+import argparse
+
+from src.config import Config
+from src.data.partitioned_store import PartitionedStore
+from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.gender_analysis import GenderAnalysis
+
+
+# Agregados por ano mantidos junto às partições (recalculados apenas para os anos ingeridos)
+YEARLY_AGGREGATES = {
+    'media_salarial_por_ano': lambda df: BasicStatistics(df).calculate_average_salary_by_year(),
+    'vinculos_ativos_por_ano_pr': lambda df: GenderAnalysis(df).top_active_employees_by_year(sigla_uf="PR"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingere extratos anuais da RAIS no armazenamento particionado por ano."
+    )
+    parser.add_argument("arquivos", nargs="+", help="CSV(s) com o extrato de um ou mais anos.")
+    parser.add_argument("--ano", type=int, default=None,
+                        help="Ingerir apenas este ano do(s) arquivo(s).")
+    parser.add_argument("--destino", default=Config.PARTITIONS_PATH,
+                        help="Diretório do armazenamento particionado.")
+    args = parser.parse_args()
+
+    store = PartitionedStore(args.destino)
+    for file_path in args.arquivos:
+        store.ingest(file_path, year=args.ano)
+
+    # Atualizar os agregados por ano (apenas os anos novos ou substituídos são recalculados)
+    for name, func in YEARLY_AGGREGATES.items():
+        result = store.yearly_aggregate(name, func)
+        print(f"\n{name}:")
+        print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
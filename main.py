@@ -1,27 +1,45 @@
 from src.data.data_loader import DataLoader
+from src.data.partitioned_store import PartitionedStore
 from src.config import Config
 from src.report.report_generator import ReportGenerator
 from src.report.analysis_to_document import AnalysisToDocument
+from src.analysis.out_of_core import OutOfCoreAnalysis
+from src.analysis.memoization import AnalysisMemo
+from src.analysis.sections import required_columns
 
 
 def main():
     # Caminho do arquivo CSV
     file_path = Config.RAW_DATA_PATH + "microdados.csv"
 
-    # Carregar e preprocessar os dados (Total: 741437)
-    loader = DataLoader(file_path)
-    data = loader.load_data()
-    data = loader.preprocess_data(data)
+    # Seções a executar e colunas que elas leem
+    sections = Config.ANALYSIS_SECTIONS
+
+    if Config.OUT_OF_CORE:
+        # Processar o CSV em blocos e gerar o relatório a partir de agregados parciais,
+        # sem carregar o conjunto completo na memória (exemplo: RAIS nacional)
+        loader = DataLoader(file_path, columns=required_columns(sections), chunksize=Config.OUT_OF_CORE_CHUNK_SIZE)
+        data = OutOfCoreAnalysis.from_chunks(loader.iter_preprocessed_chunks())
+    elif Config.USE_PARTITIONS:
+        # Ler os anos já ingeridos (veja ingest.py)
+        data = PartitionedStore().load(columns=required_columns(sections))
+    else:
+        # Carregar e preprocessar os dados (Total: 741437), reaproveitando o cache em data/processed/
+        loader = DataLoader(file_path, columns=required_columns(sections))
+        data = loader.load_preprocessed_data()
 
     # Criar o documento com os dados
     analysis_doc = AnalysisToDocument(data)
-    analysis_doc.run_analysis()
+    analysis_doc.run_analysis(sections)
 
     # Criar o gerador de relatórios
     report_gen = ReportGenerator(data, output_dir="output")
 
     # Gerar todos os gráficos
-    report_gen.generate_all_reports()
+    report_gen.generate_all_reports(sections)
+
+    # Uso da memoização dos resultados das análises, compartilhada pelo documento e pelos gráficos
+    print(f"Memoização das análises: {AnalysisMemo.shared().stats()}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,296 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+from src.analysis.central_moments import CentralMoments
+from src.analysis.summaries import MergeableSummaries, records
+from src.config import Config
+from src.data.clustered_layout import segment_groupby
+
+
+class AggregateCube:
+    """
+    Cubo compacto de agregados compartilhado pelas análises de resumo.
+
+    Em uma única passada sobre os registros, o cubo guarda, para cada combinação observada de
+    ano, UF, município, cargo e sexo, o número de registros, a contagem, a soma, a média e a
+    soma dos quadrados dos desvios à média (M2) dos salários e o número de vínculos ativos.
+    As células são combinadas com `CentralMoments.combine`, de modo que as variâncias por grupo
+    não perdem precisão por cancelamento. As médias, somas e contagens de
+    `BasicStatistics`, `GenderAnalysis`, `RegionalAnalysis` e `EmploymentIndexes` são obtidas
+    agregando as células do cubo (da ordem de milhares), e não os registros, de modo que as
+    análises do documento e dos gráficos percorrem os dados brutos uma única vez por execução.
+
+    Os resultados são iguais aos calculados sobre os registros (a menos do arredondamento de
+    ponto flutuante das somas). O cubo é construído na primeira consulta a cada DataFrame
+    (veja `of`) e reflete os dados nesse momento. Como as células são mergeáveis, o mesmo cubo
+    também é acumulado bloco a bloco (`update`) e combinado entre partes (`merge`) no modo fora
+    da memória (`OutOfCoreAnalysis`), e as análises o consultam da mesma forma (veja `covering`).
+    """
+
+    # Dimensões do cubo (apenas as presentes no DataFrame são usadas)
+    DIMENSIONS = ['ano', 'sigla_uf', 'id_municipio', 'cbo_2002_descricao', 'sexo']
+
+    # Medidas: registros, salários não ausentes, soma, média e M2 dos salários e vínculos ativos
+    MEASURES = ['linhas', 'n', 'soma', 'media', 'm2', 'ativos']
+
+    # Cubos já construídos: id do DataFrame -> cubo (que guarda uma referência fraca ao DataFrame)
+    _registry = {}
+
+    def __init__(self, df=None, dimensions=None):
+        """
+        Constrói o cubo em uma única passada agrupada sobre os registros (ou um cubo vazio).
+
+        Parameters:
+            df (pd.DataFrame, optional): Dados pré-processados, com a coluna 'valor_remuneracao_media'.
+                                         Se None, o cubo começa vazio e é preenchido com `update`.
+            dimensions (list, optional): Dimensões do cubo. Se None, usa as de `DIMENSIONS`
+                                         presentes no DataFrame.
+        """
+        self._df = weakref.ref(df) if df is not None else None
+        if dimensions is None:
+            dimensions = [dim for dim in self.DIMENSIONS if df is not None and dim in df.columns]
+        self.dimensions = list(dimensions)
+        self.measures = []
+        self.cells = None
+        self._tables = {}
+        if df is not None:
+            self.update(df)
+
+    def update(self, chunk):
+        """
+        Incorpora um bloco de registros (por exemplo, de `DataLoader.iter_preprocessed_chunks`).
+
+        Parameters:
+            chunk (pd.DataFrame): Bloco com as dimensões do cubo e a coluna 'valor_remuneracao_media'.
+
+        Returns:
+            AggregateCube: O próprio cubo, para encadeamento.
+        """
+        salaries = chunk['valor_remuneracao_media'].astype('float64')
+        if self.dimensions:
+            # Valores ausentes nas dimensões formam células próprias, descartadas apenas nas consultas
+            keys = [chunk[dim] for dim in self.dimensions]
+            cell_means = salaries.groupby(keys, observed=True, dropna=False, sort=False).transform('mean')
+        else:
+            cell_means = salaries.mean()
+        measures = pd.DataFrame({
+            'linhas': 1,
+            'n': salaries.notna().astype('int64'),
+            'soma': salaries,
+            'm2': (salaries - cell_means) ** 2,
+        }, index=chunk.index)
+        if 'vinculo_ativo_3112' in chunk.columns or 'quantidade_vinculos_ativos' in chunk.columns:
+            measures['ativos'] = active_links(chunk)
+
+        if self.dimensions:
+            cells = (
+                pd.concat([chunk[self.dimensions], measures], axis=1)
+                .groupby(self.dimensions, observed=True, dropna=False, sort=False).sum()
+                .reset_index()
+            )
+        else:
+            cells = measures.sum().to_frame().T
+        cells['media'] = cells['soma'] / cells['n'].where(cells['n'] > 0)
+        return self._merge_cells(cells[self.dimensions + [m for m in self.MEASURES if m in cells.columns]])
+
+    def merge(self, other):
+        """
+        Combina as células de outro cubo com as mesmas dimensões (outro bloco, arquivo ou processo).
+
+        Parameters:
+            other (AggregateCube): Cubo a ser incorporado.
+
+        Returns:
+            AggregateCube: O próprio cubo, com as células combinadas.
+        """
+        if other.cells is not None:
+            self._merge_cells(other.cells)
+        return self
+
+    def _merge_cells(self, cells):
+        """Combina células (dimensões e medidas) com as atuais."""
+        if self.cells is not None:
+            combined = pd.concat([self.cells, cells], ignore_index=True)
+            if self.dimensions:
+                cells = CentralMoments.combine(combined.set_index(self.dimensions)).reset_index()
+            else:
+                cells = CentralMoments.combine(combined.set_axis(np.zeros(len(combined), dtype='int64')))
+            for col in cells.select_dtypes(include='category').columns:
+                # Blocos diferentes têm dicionários diferentes; as células combinadas guardam os valores
+                cells[col] = cells[col].astype(object)
+        self.cells = cells.reset_index(drop=True)
+        self.measures = [measure for measure in self.MEASURES if measure in self.cells.columns]
+        self._tables = {}
+        return self
+
+    @classmethod
+    def of(cls, df):
+        """
+        Cubo do DataFrame, construído na primeira chamada e reaproveitado nas seguintes.
+
+        Parameters:
+            df (pd.DataFrame): Dados pré-processados.
+
+        Returns:
+            AggregateCube ou None: O cubo, ou None se `Config.USE_AGGREGATE_CUBE` estiver desativado
+                                   ou se os dados não tiverem a coluna de salários.
+        """
+        if not Config.USE_AGGREGATE_CUBE or 'valor_remuneracao_media' not in df.columns:
+            return None
+        cube = cls._registry.get(id(df))
+        if cube is None or cube._df() is not df:
+            cube = cls(df)
+            cls._registry[id(df)] = cube
+            weakref.finalize(df, cls._registry.pop, id(df), None)
+        return cube
+
+    @classmethod
+    def covering(cls, data, keys, column):
+        """
+        Cubo que responde a uma agregação de `column` pelas chaves, nos dois modos de análise.
+
+        Parameters:
+            data (pd.DataFrame ou MergeableSummaries): Dados (usa o cubo de `of`) ou resumos
+                                                       (usa o primeiro dos seus cubos que cobrir as chaves).
+            keys (list): Dimensões de agrupamento.
+            column (str): Coluna agregada.
+
+        Returns:
+            AggregateCube ou None: O cubo, ou None se nenhum cobrir a agregação.
+        """
+        if isinstance(data, MergeableSummaries):
+            cubes = data.cubes
+        else:
+            cube = cls.of(data)
+            cubes = [cube] if cube is not None else []
+        return next((cube for cube in cubes if cube.supports(keys, column)), None)
+
+    def table(self, keys):
+        """
+        Medidas combinadas pelas dimensões informadas, descartando valores ausentes nas chaves.
+
+        Parameters:
+            keys (list): Dimensões de agrupamento (subconjunto de `dimensions`).
+
+        Returns:
+            pd.DataFrame: Medidas indexadas pelas chaves, na ordem de `groupby`.
+        """
+        keys = list(keys)
+        if tuple(keys) not in self._tables:
+            cells = self.cells.dropna(subset=keys)
+            self._tables[tuple(keys)] = CentralMoments.combine(cells.set_index(keys)[self.measures])
+        return self._tables[tuple(keys)]
+
+    def totals(self):
+        """
+        Medidas combinadas sobre todos os registros.
+
+        Returns:
+            pd.Series: Uma entrada por medida.
+        """
+        cells = self.cells[self.measures]
+        return CentralMoments.combine(cells.set_axis(np.zeros(len(cells), dtype='int64'))).iloc[0]
+
+    def supports(self, keys, column):
+        """
+        Indica se o cubo responde a uma agregação de `column` pelas chaves informadas.
+
+        Returns:
+            bool: True se todas as chaves forem dimensões do cubo e a coluna for uma medida dele.
+        """
+        if not set(keys) <= set(self.dimensions):
+            return False
+        if column == 'quantidade_vinculos_ativos':
+            return 'ativos' in self.measures
+        return column == 'valor_remuneracao_media'
+
+    def aggregate(self, keys, column, agg):
+        """
+        Equivalente a `df.groupby(keys, observed=True)[column].agg(agg)`, a partir do cubo.
+
+        Parameters:
+            keys (list): Dimensões de agrupamento.
+            column (str): 'valor_remuneracao_media' ou 'quantidade_vinculos_ativos'.
+            agg (str ou list): "mean", "sum", "count", "size" ou uma lista delas.
+
+        Returns:
+            pd.Series ou pd.DataFrame: Série (para uma agregação) ou DataFrame (para uma lista).
+        """
+        table = self.table(keys)
+        if column == 'valor_remuneracao_media':
+            counts, sums = table['n'], table['soma']
+        else:
+            counts, sums = table['linhas'], table['ativos']
+        results = {
+            'count': counts,
+            'sum': sums,
+            'mean': sums / counts.where(counts > 0),
+            'size': table['linhas'],
+        }
+        if isinstance(agg, str):
+            return results[agg].rename(column)
+        return pd.DataFrame({name: results[name] for name in agg})
+
+
+# Indicadores de vínculo ativo já calculados: id do DataFrame -> (referência fraca, indicador)
+_active_links = {}
+
+
+def active_links(df):
+    """
+    Indicador de vínculo ativo em 31/12 de cada registro, calculado uma vez por DataFrame.
+
+    Substitui a coluna derivada 'quantidade_vinculos_ativos', que deixou de ser gravada no
+    DataFrame compartilhado. Se a coluna existir nos dados, ela é usada diretamente.
+
+    Parameters:
+        df (pd.DataFrame): Dados com a coluna 'vinculo_ativo_3112'.
+
+    Returns:
+        pd.Series: 1 para vínculo ativo ('Sim') e 0 caso contrário, com o nome 'quantidade_vinculos_ativos'.
+    """
+    if 'quantidade_vinculos_ativos' in df.columns:
+        return df['quantidade_vinculos_ativos']
+    entry = _active_links.get(id(df))
+    if entry is None or entry[0]() is not df:
+        indicator = (df['vinculo_ativo_3112'] == 'Sim').astype('int64').rename('quantidade_vinculos_ativos')
+        entry = (weakref.ref(df), indicator)
+        _active_links[id(df)] = entry
+        weakref.finalize(df, _active_links.pop, id(df), None)
+    return entry[1]
+
+
+def grouped_aggregate(data, by, column, agg):
+    """
+    Equivalente a `df.groupby(by, observed=True)[column].agg(agg)`, respondido pelo cubo quando possível.
+
+    Sem cubo (ou para colunas que ele não cobre), usa as reduções por segmento de um
+    `ClusteredLayout`, se houver, ou o `groupby` do Pandas. A coluna 'quantidade_vinculos_ativos'
+    é obtida de `active_links` quando não estiver no DataFrame. Com resumos mergeáveis, a
+    agregação vem sempre de um dos seus cubos.
+
+    Parameters:
+        data (pd.DataFrame ou MergeableSummaries): Dados ou resumos.
+        by (str ou list): Coluna(s) de agrupamento.
+        column (str): Coluna agregada.
+        agg (str ou list): "mean", "sum", "count", "size" ou uma lista delas.
+
+    Returns:
+        pd.Series ou pd.DataFrame: Mesmo retorno do `groupby` correspondente.
+
+    Raises:
+        ValueError: Se os resumos não tiverem um cubo que cubra a agregação.
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    cube = AggregateCube.covering(data, keys, column)
+    if cube is not None:
+        return cube.aggregate(keys, column, agg)
+    if isinstance(data, MergeableSummaries):
+        raise ValueError(f"Agregação de '{column}' por {keys} não suportada no modo fora da memória.")
+    df = records(data)
+    if column == 'quantidade_vinculos_ativos' and column not in df.columns:
+        return active_links(df).groupby([df[key] for key in keys], observed=True).agg(agg)
+    if isinstance(by, str):
+        return segment_groupby(df, by, column, agg)
+    return df.groupby(keys, observed=True)[column].agg(agg)
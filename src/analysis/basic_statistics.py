@@ -1,20 +1,55 @@
+from src.analysis.central_moments import CentralMoments
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, record_count, records
+from src.config import Config
+
+
 class BasicStatistics:
     """
     Classe para cálculos básicos de estatísticas sobre o conjunto de dados.
 
     Essa classe fornece métodos para calcular métricas fundamentais, como o número total
     de empregados, a média salarial e estatísticas de distribuição salarial.
+
+    As médias, a variância, a assimetria e a curtose dos salários (gerais e por ano) saem de um
+    único acumulador de momentos centrais (`CentralMoments`), calculado uma vez por instância
+    (ou lido dos resumos mergeáveis, no modo fora da memória).
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    REQUIRED_COLUMNS = ['ano', 'valor_remuneracao_media']
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo as informações de empregados.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo as informações de
+                                                     empregados, ou resumos mergeáveis.
+        """
+        self.data = df
+        self.df = records(df)
+        self._moments = None
+
+    def central_moments(self, median=Config.MEDIAN_METHOD):
+        """
+        Momentos centrais dos salários por ano (ou do conjunto todo, sem a coluna 'ano'), em uma única passada.
+
+        Parameters:
+            median (str, optional): Modo da mediana: "exact" ou "sketch". Com resumos mergeáveis,
+                                    a mediana é sempre estimada pelo sketch dos resumos.
+
+        Returns:
+            CentralMoments: Acumulador de momentos, reaproveitado pelos demais métodos.
         """
-        self.df = df
+        if isinstance(self.data, MergeableSummaries):
+            return self.data.moments
+        if self._moments is None or self._moments.median_method != median:
+            by = 'ano' if 'ano' in self.df.columns else None
+            self._moments = CentralMoments.from_frame(self.df, by=by, median=median)
+        return self._moments
 
+    @memoized
     def calculate_average_salary_by_year(self):
         """
         Calcula a média salarial para cada ano.
@@ -25,8 +60,9 @@ class BasicStatistics:
         if 'ano' not in self.df.columns or 'valor_remuneracao_media' not in self.df.columns:
             raise ValueError("As colunas 'ano' e 'valor_remuneracao_media' são necessárias para esta análise.")
 
-        # Agrupar por ano e calcular a média salarial
-        salary_by_year = self.df.groupby('ano')['valor_remuneracao_media'].mean().reset_index()
+        # Média salarial de cada ano, a partir dos momentos por ano (sem o grupo de ano ausente)
+        salary_by_year = self.central_moments().table['media']
+        salary_by_year = salary_by_year[salary_by_year.index.notna()].reset_index()
         salary_by_year.columns = ['Ano', 'Média Salarial']
         return salary_by_year
 
@@ -37,8 +73,9 @@ class BasicStatistics:
         Returns:
             int: Total de registros no DataFrame, representando o número de empregados.
         """
-        return len(self.df)
+        return record_count(self.data)
 
+    @memoized
     def calculate_average_salary(self):
         """
         Calcula o salário médio dos empregados.
@@ -49,14 +86,32 @@ class BasicStatistics:
         Exemplo de Uso:
             Use este método para obter uma visão geral do salário médio no conjunto de dados.
         """
-        return self.df['valor_remuneracao_media'].mean()
+        return self.salary_moments()["Média"]
+
+    @memoized
+    def salary_moments(self, median=Config.MEDIAN_METHOD):
+        """
+        Calcula, de uma vez, a contagem, a média, a variância, a assimetria, a curtose e a mediana dos salários.
+
+        Parameters:
+            median (str, optional): Modo da mediana: "exact" (exata) ou "sketch" (estimada por `KLLSketch`).
+
+        Returns:
+            dict: "Registros", "Média", "Variância", "Desvio Padrão", "Assimetria", "Curtose"
+                  (em excesso) e "Mediana", com as mesmas correções de viés do Pandas.
+
+        Exemplo de Uso:
+            Use este método para descrever a forma da distribuição salarial (assimetria e caudas).
+        """
+        return self.central_moments(median).summary()
 
+    @memoized
     def salary_distribution(self):
         """
         Calcula estatísticas descritivas sobre os salários.
 
-        Retorna informações sobre a média, mediana, desvio padrão e o coeficiente
-        de variação dos salários no conjunto de dados.
+        Retorna informações sobre a média, mediana, desvio padrão, coeficiente de variação,
+        assimetria e curtose dos salários no conjunto de dados, todas obtidas de `salary_moments`.
 
         Returns:
             dict: Um dicionário contendo as seguintes métricas:
@@ -64,14 +119,19 @@ class BasicStatistics:
                 - "Mediana Salarial": Valor central da distribuição salarial.
                 - "Desvio Padrão": Variabilidade dos salários em relação à média.
                 - "Coeficiente de Variação (%)": Proporção da variabilidade em relação à média.
+                - "Assimetria": Assimetria da distribuição (positiva com cauda à direita).
+                - "Curtose": Curtose em excesso (positiva com caudas mais pesadas que a normal).
 
         Exemplo de Uso:
             Use este método para entender a dispersão e a centralidade dos salários, especialmente
             útil para identificar se os salários estão uniformemente distribuídos ou possuem outliers.
         """
+        moments = self.salary_moments()
         return {
-            "Média Salarial": self.df['valor_remuneracao_media'].mean(),
-            "Mediana Salarial": self.df['valor_remuneracao_media'].median(),
-            "Desvio Padrão": self.df['valor_remuneracao_media'].std(),
-            "Coeficiente de Variação (%)": (self.df['valor_remuneracao_media'].std() / self.df['valor_remuneracao_media'].mean()) * 100
+            "Média Salarial": moments["Média"],
+            "Mediana Salarial": moments["Mediana"],
+            "Desvio Padrão": moments["Desvio Padrão"],
+            "Coeficiente de Variação (%)": (moments["Desvio Padrão"] / moments["Média"]) * 100,
+            "Assimetria": moments["Assimetria"],
+            "Curtose": moments["Curtose"]
         }
@@ -0,0 +1,254 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, records
+from src.config import Config
+
+
+class Bootstrap:
+    """
+    Intervalos de confiança por bootstrap para as métricas salariais do relatório.
+
+    Os registros são comprimidos uma única vez em contagens por salário distinto e gênero
+    (masculino, feminino e demais). Cada réplica sorteia, em vez de copiar linhas, um peso para
+    cada contagem: Poisson(contagem) no bootstrap de Poisson (equivalente a um peso Poisson(1)
+    por registro) ou uma multinomial sobre todas as contagens no bootstrap clássico (com o
+    tamanho da amostra fixo). As réplicas são geradas em lotes vetorizados e distribuídas entre
+    processos, e as métricas de cada réplica são calculadas a partir das contagens sorteadas:
+
+        - Salário Médio e Salário Mediano (de todos os registros);
+        - Diferença Salarial: salário médio masculino menos o feminino (`GenderAnalysis.gender_salary_gap`);
+        - IDS (%): Índice de Disparidade Salarial (`EmploymentIndexes.salary_disparity_index`).
+
+    Os intervalos são os percentis das réplicas. A memória e o tempo de cada réplica dependem do
+    número de salários distintos, e não do número de registros. Cada grupo de `STREAM_SIZE`
+    réplicas tem o seu próprio fluxo de números aleatórios, derivado da semente, de modo que os
+    resultados não dependem do número de processos nem do tamanho dos lotes.
+    """
+
+    METRICS = ['Salário Médio', 'Salário Mediano', 'Diferença Salarial', 'IDS (%)']
+
+    # Gêneros contados separadamente; os demais valores (inclusive ausentes) formam um terceiro grupo
+    GROUPS = ['Masculino', 'Feminino']
+
+    # Colunas das contagens por salário (veja `salary_counts`)
+    COUNT_COLUMNS = GROUPS + ['Outros']
+
+    # Réplicas por fluxo de números aleatórios (unidade de distribuição entre os processos)
+    STREAM_SIZE = 64
+
+    def __init__(self, df):
+        """
+        Inicializa o bootstrap de um DataFrame.
+
+        Parameters:
+            df (pd.DataFrame ou MergeableSummaries): Dados com a coluna 'valor_remuneracao_media'
+                                                     (e 'sexo', para a diferença salarial e o IDS),
+                                                     ou resumos mergeáveis (veja `OutOfCoreAnalysis`).
+        """
+        self.data = df
+        self.df = records(df)
+        self._compressed = None
+
+    @staticmethod
+    def salary_counts(df):
+        """
+        Contagens de registros por salário distinto e gênero de um DataFrame (ou de um bloco).
+
+        As contagens de blocos diferentes são somadas com `DataFrame.add(..., fill_value=0)`.
+
+        Parameters:
+            df (pd.DataFrame): Dados com a coluna 'valor_remuneracao_media' (e, opcionalmente, 'sexo').
+
+        Returns:
+            pd.DataFrame: Indexado pelos salários distintos em ordem crescente, com as colunas de
+                          `COUNT_COLUMNS` (os demais gêneros e os ausentes ficam em "Outros").
+        """
+        salaries = df['valor_remuneracao_media'].to_numpy(dtype='float64', na_value=np.nan)
+        groups = np.full(len(salaries), len(Bootstrap.GROUPS))
+        if 'sexo' in df.columns:
+            for code, gender in enumerate(Bootstrap.GROUPS):
+                groups[(df['sexo'] == gender).to_numpy()] = code
+
+        valid = ~np.isnan(salaries)
+        values, inverse = np.unique(salaries[valid], return_inverse=True)
+        width = len(Bootstrap.COUNT_COLUMNS)
+        counts = np.bincount(inverse * width + groups[valid], minlength=len(values) * width)
+        return pd.DataFrame(
+            counts.reshape(len(values), width).astype('int64'),
+            index=pd.Index(values, name='valor_remuneracao_media'),
+            columns=Bootstrap.COUNT_COLUMNS,
+        )
+
+    def compressed(self):
+        """
+        Contagens de registros por salário distinto e gênero, calculadas uma vez (ou lidas dos resumos).
+
+        Returns:
+            tuple: (salários distintos em ordem crescente, contagens com uma coluna por grupo
+                   de `GROUPS` mais uma para os demais).
+        """
+        if self._compressed is None:
+            if isinstance(self.data, MergeableSummaries):
+                counts = self.data.salary_counts.sort_index()
+            else:
+                counts = self.salary_counts(self.df)
+            self._compressed = counts.index.to_numpy(dtype='float64'), counts.to_numpy(dtype='int64')
+        return self._compressed
+
+    @memoized
+    def confidence_intervals(self, n_replicates=Config.BOOTSTRAP_REPLICATES, level=0.95,
+                             method=Config.BOOTSTRAP_METHOD, seed=0):
+        """
+        Estimativas e intervalos de confiança das métricas salariais.
+
+        Parameters:
+            n_replicates (int): Número de réplicas.
+            level (float): Nível de confiança dos intervalos (exemplo: 0.95).
+            method (str): "poisson" ou "multinomial".
+            seed (int): Semente das réplicas.
+
+        Returns:
+            pd.DataFrame: Indexado pelas métricas de `METRICS`, com as colunas "Estimativa",
+                          "Limite Inferior" e "Limite Superior".
+
+        Exemplo de Uso:
+            Bootstrap(df).confidence_intervals(n_replicates=1000, level=0.95)
+        """
+        values, counts = self.compressed()
+        return bootstrap_intervals(values, counts, n_replicates, level, method, seed)
+
+    @staticmethod
+    def metrics(values, weights):
+        """
+        Métricas de um lote de réplicas.
+
+        Parameters:
+            values (np.ndarray): Salários distintos em ordem crescente (k).
+            weights (np.ndarray): Contagens sorteadas de cada réplica (réplicas × k × grupos).
+
+        Returns:
+            np.ndarray: Uma linha por réplica e uma coluna por métrica de `METRICS`.
+        """
+        if not len(values):
+            return np.full((len(weights), len(Bootstrap.METRICS)), np.nan)
+
+        totals = weights.sum(axis=1)
+        sums = np.einsum('bkg,k->bg', weights, values)
+        overall = weights.sum(axis=2)
+        n = overall.sum(axis=1)
+
+        # Mediana: média dos valores de posição floor((n + 1) / 2) e floor(n / 2) + 1
+        cumulative = np.cumsum(overall, axis=1)
+        lower = (cumulative < ((n + 1) // 2)[:, None]).sum(axis=1)
+        upper = (cumulative < (n // 2 + 1)[:, None]).sum(axis=1)
+        last = len(values) - 1
+        median = (values[np.minimum(lower, last)] + values[np.minimum(upper, last)]) / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = sums.sum(axis=1) / n
+            male, female = sums[:, 0] / totals[:, 0], sums[:, 1] / totals[:, 1]
+            gap = male - female
+            ids = gap / male * 100
+        return np.column_stack([mean, median, gap, ids])
+
+    @staticmethod
+    def resample(rng, counts, size, method):
+        """
+        Sorteia as contagens de um lote de réplicas.
+
+        Parameters:
+            rng (np.random.Generator): Gerador de números aleatórios.
+            counts (np.ndarray): Contagens observadas (k × grupos).
+            size (int): Número de réplicas do lote.
+            method (str): "poisson" ou "multinomial".
+
+        Returns:
+            np.ndarray: Contagens sorteadas (réplicas × k × grupos).
+
+        Raises:
+            ValueError: Se o método não for suportado.
+        """
+        if method == "poisson":
+            return rng.poisson(counts, size=(size,) + counts.shape)
+        if method == "multinomial":
+            n = counts.sum()
+            draws = rng.multinomial(n, counts.ravel() / n, size=size)
+            return draws.reshape((size,) + counts.shape)
+        raise ValueError("Método não suportado. Escolha 'poisson' ou 'multinomial'.")
+
+
+def bootstrap_intervals(values, counts, n_replicates=Config.BOOTSTRAP_REPLICATES, level=0.95,
+                        method=Config.BOOTSTRAP_METHOD, seed=0, max_workers=Config.MAX_WORKERS):
+    """
+    Calcula as réplicas em um pool de processos e resume os intervalos de confiança.
+
+    Parameters:
+        values (np.ndarray): Salários distintos em ordem crescente.
+        counts (np.ndarray): Contagens por salário e grupo (veja `Bootstrap.compressed`).
+        n_replicates (int): Número de réplicas.
+        level (float): Nível de confiança.
+        method (str): "poisson" ou "multinomial".
+        seed (int): Semente das réplicas.
+        max_workers (int, optional): Processos usados (None usa o número de CPUs).
+
+    Returns:
+        pd.DataFrame: Mesmo retorno de `Bootstrap.confidence_intervals`.
+    """
+    if method not in ("poisson", "multinomial"):
+        raise ValueError("Método não suportado. Escolha 'poisson' ou 'multinomial'.")
+
+    # Réplicas por lote, para que as contagens sorteadas de um lote caibam em BOOTSTRAP_MEMORY_MB
+    batch_size = max(1, int(Config.BOOTSTRAP_MEMORY_MB * 1024 ** 2 // max(counts.nbytes, 1)))
+
+    # Um fluxo por grupo de STREAM_SIZE réplicas, independente do número de processos
+    sizes = [min(Bootstrap.STREAM_SIZE, n_replicates - start) for start in range(0, n_replicates, Bootstrap.STREAM_SIZE)]
+    streams = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(streams)))
+    shares = np.array_split(np.arange(len(streams)), workers)
+    tasks = [(values, counts, [streams[i] for i in share], method, batch_size) for share in shares]
+    if workers == 1:
+        parts = [_bootstrap_replicates(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_bootstrap_replicates, tasks))
+    replicates = np.concatenate(parts)
+
+    estimates = Bootstrap.metrics(values, counts[None])[0]
+    alpha = (1 - level) / 2
+    with warnings.catch_warnings():
+        # Métricas indefinidas em todas as réplicas (por exemplo, sem a coluna 'sexo') ficam NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lower, upper = np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({
+        'Estimativa': estimates,
+        'Limite Inferior': lower,
+        'Limite Superior': upper,
+    }, index=Bootstrap.METRICS)
+
+
+def _bootstrap_replicates(task):
+    """
+    Gera as réplicas de alguns fluxos, em lotes (executada em um processo do pool).
+
+    Os lotes de um fluxo são sorteados em sequência do mesmo gerador, com os mesmos valores
+    de um único sorteio do fluxo inteiro.
+
+    Parameters:
+        task (tuple): (salários, contagens, fluxos como pares (réplicas, semente), método, tamanho do lote).
+
+    Returns:
+        np.ndarray: Métricas de cada réplica.
+    """
+    values, counts, streams, method, batch_size = task
+    parts = [np.empty((0, len(Bootstrap.METRICS)))]
+    for n_replicates, seed in streams:
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_replicates, batch_size):
+            size = min(batch_size, n_replicates - start)
+            parts.append(Bootstrap.metrics(values, Bootstrap.resample(rng, counts, size, method)))
+    return np.concatenate(parts)
@@ -0,0 +1,292 @@
+import numpy as np
+import pandas as pd
+from src.config import Config
+from src.data.quantile_sketch import KLLSketch
+
+
+class CentralMoments:
+    """
+    Momentos centrais mergeáveis (contagem, média e somas dos desvios à média elevados a 2, 3 e 4)
+    de uma coluna numérica, opcionalmente por grupo.
+
+    Cada bloco é resumido em uma única passada vetorizada, com os desvios calculados em relação à
+    média do próprio bloco, e os resumos de blocos, partições ou processos diferentes são combinados
+    com as fórmulas de Chan et al. (deslocando os momentos de cada parte para a média combinada).
+    Ao contrário de somas de potências dos valores, os momentos não perdem precisão por
+    cancelamento quando a variância é pequena em relação à média. A partir deles saem, de uma vez,
+    a média, a variância, a assimetria e a curtose, com as mesmas correções de viés do Pandas.
+
+    A mediana (do conjunto todo) depende do modo:
+        - "exact": contagens de cada valor distinto, também mergeáveis; a mediana é exata;
+        - "sketch": um `KLLSketch`, com memória fixa e erro de rank dado por `KLLSketch.rank_error`;
+        - None: a mediana não é calculada.
+
+    Valores ausentes da coluna são ignorados; registros com chave de grupo ausente formam um
+    grupo próprio, de modo que `total` inclui todos os valores.
+    """
+
+    COLUMNS = ['n', 'media', 'm2', 'm3', 'm4']
+
+    def __init__(self, by=None, column='valor_remuneracao_media', median=Config.MEDIAN_METHOD, sketch_k=Config.SKETCH_K):
+        """
+        Inicializa momentos vazios.
+
+        Parameters:
+            by (str ou list, optional): Coluna(s) que definem os grupos (None para o conjunto todo).
+            column (str): Coluna numérica resumida.
+            median (str, optional): Modo da mediana: "exact", "sketch" ou None.
+            sketch_k (int): Precisão do sketch no modo "sketch".
+
+        Raises:
+            ValueError: Se o modo da mediana não for suportado.
+        """
+        if median not in ("exact", "sketch", None):
+            raise ValueError("Modo de mediana não suportado. Escolha 'exact', 'sketch' ou None.")
+
+        self.by = by
+        self.column = column
+        self.median_method = median
+        self.table = pd.DataFrame(columns=self.COLUMNS, dtype='float64')
+        self.value_counts = pd.Series(dtype='int64') if median == "exact" else None
+        self.sketch = KLLSketch(k=sketch_k) if median == "sketch" else None
+
+    @classmethod
+    def from_frame(cls, df, by=None, column='valor_remuneracao_media', **kwargs):
+        """
+        Resume um DataFrame (ou um bloco).
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+            by (str ou list, optional): Coluna(s) que definem os grupos.
+            column (str): Coluna numérica resumida.
+            **kwargs: Parâmetros repassados ao construtor (median, sketch_k).
+
+        Returns:
+            CentralMoments: Momentos dos dados.
+        """
+        return cls(by, column, **kwargs).update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks, by=None, column='valor_remuneracao_media', **kwargs):
+        """
+        Resume uma sequência de blocos (exemplo: `DataLoader.iter_preprocessed_chunks()`).
+
+        Returns:
+            CentralMoments: Momentos combinados de todos os blocos.
+        """
+        moments = cls(by, column, **kwargs)
+        for chunk in chunks:
+            moments.update(chunk)
+        return moments
+
+    def update(self, chunk):
+        """
+        Incorpora um bloco de dados.
+
+        Parameters:
+            chunk (pd.DataFrame): Bloco com as colunas de `by` e `column`.
+
+        Returns:
+            CentralMoments: O próprio objeto, para encadeamento.
+        """
+        values = chunk[self.column].astype('float64')
+        valid = values.notna()
+        values = values[valid]
+        if values.empty:
+            return self
+
+        if self.by is None:
+            keys = None
+        else:
+            keys = [chunk[self.by][valid]] if isinstance(self.by, str) else [chunk[col][valid] for col in self.by]
+        self._merge_table(self.describe(values, keys, dropna=False))
+
+        if self.value_counts is not None:
+            self.value_counts = self.value_counts.add(values.value_counts(), fill_value=0).astype('int64')
+        if self.sketch is not None:
+            self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        """
+        Combina os momentos de outra parte dos dados (com os mesmos grupos, coluna e modo da mediana).
+
+        Parameters:
+            other (CentralMoments): Momentos a serem incorporados.
+
+        Returns:
+            CentralMoments: O próprio objeto, com os momentos combinados.
+        """
+        self._merge_table(other.table)
+        if self.value_counts is not None:
+            self.value_counts = self.value_counts.add(other.value_counts, fill_value=0).astype('int64')
+        if self.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def _merge_table(self, part):
+        """Combina uma tabela de momentos com a atual."""
+        if part.empty:
+            return
+        if self.table.empty:
+            self.table = part.copy()
+        else:
+            self.table = self.combine(pd.concat([self.table, part]))
+
+    @staticmethod
+    def describe(values, keys=None, order=4, dropna=True):
+        """
+        Momentos de um bloco, com os desvios em relação à média de cada grupo do bloco.
+
+        Parameters:
+            values (pd.Series): Valores sem ausentes.
+            keys (list, optional): Séries com as chaves dos grupos (None para um único grupo).
+            order (int): Maior momento calculado (2 para 'm2'; 4 para 'm2', 'm3' e 'm4').
+            dropna (bool): Se False, chaves ausentes formam grupos próprios.
+
+        Returns:
+            pd.DataFrame: Colunas 'n', 'media' e 'm2' a 'm{order}', uma linha por grupo.
+        """
+        columns = CentralMoments.COLUMNS[:order + 1]
+        if keys is None:
+            x = values.to_numpy(dtype='float64')
+            mean = x.mean() if len(x) else np.nan
+            deviation = x - mean
+            powers = {'m2': deviation * deviation}
+            if order > 2:
+                powers['m3'] = powers['m2'] * deviation
+                powers['m4'] = powers['m2'] * powers['m2']
+            row = {'n': float(len(x)), 'media': mean, **{col: power.sum() for col, power in powers.items()}}
+            return pd.DataFrame([row], columns=columns)
+
+        grouped = values.groupby(keys, observed=True, dropna=dropna)
+        deviation = values - grouped.transform('mean')
+        powers = {'m2': deviation * deviation}
+        if order > 2:
+            powers['m3'] = powers['m2'] * deviation
+            powers['m4'] = powers['m2'] * powers['m2']
+        sums = pd.DataFrame(powers).groupby(keys, observed=True, dropna=dropna).sum()
+        sums.insert(0, 'media', grouped.mean())
+        sums.insert(0, 'n', grouped.count().astype('float64'))
+        return sums[columns]
+
+    @staticmethod
+    def combine(table):
+        """
+        Combina as linhas com o mesmo rótulo de grupo (fórmulas de Chan et al.).
+
+        Os momentos de cada linha são deslocados da sua média para a média combinada do grupo:
+        com d = média da linha - média combinada, M2 += n·d², M3 += 3·d·M2 + n·d³ e
+        M4 += 4·d·M3 + 6·d²·M2 + n·d⁴. As demais colunas (por exemplo, contagens de registros
+        do cubo de agregados) são somadas, e linhas sem valores (n = 0) não alteram os momentos.
+        Rótulos ausentes formam grupos próprios.
+
+        Parameters:
+            table (pd.DataFrame): Colunas 'n', 'media' e 'm2' (e, opcionalmente, 'm3' e 'm4'),
+                                  possivelmente com rótulos repetidos.
+
+        Returns:
+            pd.DataFrame: Uma linha por rótulo, em ordem crescente, com as mesmas colunas.
+        """
+        level = list(range(table.index.nlevels))
+
+        def by_group(series):
+            return series.groupby(level=level, observed=True, dropna=False)
+
+        n = table['n']
+        has_values = n > 0
+        total = by_group(n).transform('sum')
+        mean = by_group((n * table['media']).where(has_values, 0.0)).transform('sum') / total.where(total > 0)
+        d = (table['media'] - mean).where(has_values, 0.0)
+        m2, m3, m4 = (table[col].where(has_values, 0.0) if col in table else None for col in ('m2', 'm3', 'm4'))
+
+        shifted = {'m2': m2 + n * d ** 2}
+        if m3 is not None:
+            shifted['m3'] = m3 + 3 * d * m2 + n * d ** 3
+        if m4 is not None:
+            shifted['m4'] = m4 + 4 * d * m3 + 6 * d ** 2 * m2 + n * d ** 4
+
+        summed = table.drop(columns=['media', *shifted])
+        combined = pd.concat([summed, pd.DataFrame(shifted)], axis=1).groupby(level=level, observed=True, dropna=False).sum()
+        combined['media'] = by_group(mean).first()
+        return combined[table.columns]
+
+    def total(self):
+        """
+        Momentos do conjunto todo, combinando os grupos.
+
+        Returns:
+            pd.Series: Valores de `COLUMNS` (contagem zero e momentos NaN sem valores).
+        """
+        if self.table.empty:
+            return pd.Series({'n': 0.0, 'media': np.nan, 'm2': np.nan, 'm3': np.nan, 'm4': np.nan})
+        return self.combine(self.table.set_axis(np.zeros(len(self.table), dtype='int64'))).iloc[0]
+
+    @staticmethod
+    def statistics(table):
+        """
+        Estatísticas a partir dos momentos, com as correções de viés de `pd.Series.var`,
+        `pd.Series.skew` e `pd.Series.kurt` (curtose em excesso).
+
+        Parameters:
+            table (pd.DataFrame ou pd.Series): Momentos (colunas de `COLUMNS`) de um ou vários grupos.
+
+        Returns:
+            pd.DataFrame ou pd.Series: "Registros", "Média", "Variância", "Desvio Padrão",
+                                       "Assimetria" e "Curtose" (NaN com poucos valores).
+        """
+        n, m2, m3, m4 = (table[col] for col in ('n', 'm2', 'm3', 'm4'))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = np.where(n > 1, m2 / (n - 1), np.nan)
+            skew = np.where(n > 2, n * np.sqrt(n - 1) / (n - 2) * m3 / m2 ** 1.5, np.nan)
+            kurt = np.where(
+                n > 3,
+                n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)),
+                np.nan
+            )
+        # Valores constantes têm assimetria e curtose zero, como no Pandas
+        skew = np.where((n > 2) & (m2 == 0), 0.0, skew)
+        kurt = np.where((n > 3) & (m2 == 0), 0.0, kurt)
+
+        result = {
+            "Registros": n,
+            "Média": table['media'],
+            "Variância": variance,
+            "Desvio Padrão": np.sqrt(variance),
+            "Assimetria": skew,
+            "Curtose": kurt,
+        }
+        if isinstance(table, pd.Series):
+            return pd.Series({key: float(value) for key, value in result.items()})
+        return pd.DataFrame(result, index=table.index)
+
+    def median(self):
+        """
+        Mediana do conjunto todo, de acordo com o modo.
+
+        Returns:
+            float: Mediana (NaN sem valores ou com o modo None).
+        """
+        if self.sketch is not None:
+            return self.sketch.median() if len(self.sketch) else np.nan
+        if self.value_counts is None or self.value_counts.empty:
+            return np.nan
+
+        counts = self.value_counts.sort_index()
+        cumulative = counts.to_numpy().cumsum()
+        n = cumulative[-1]
+        # Média dos valores de posição floor((n + 1) / 2) e floor(n / 2) + 1
+        positions = np.searchsorted(cumulative, [(n + 1) // 2, n // 2 + 1])
+        return float(counts.index.to_numpy(dtype='float64')[positions].mean())
+
+    def summary(self):
+        """
+        Estatísticas do conjunto todo, calculadas a partir dos momentos acumulados.
+
+        Returns:
+            dict: "Registros", "Média", "Variância", "Desvio Padrão", "Assimetria", "Curtose" e "Mediana".
+
+        Exemplo de Uso:
+            CentralMoments.from_frame(df, median="exact").summary()["Assimetria"]
+        """
+        return {**self.statistics(self.total()).to_dict(), "Mediana": self.median()}
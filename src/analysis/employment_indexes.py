@@ -1,3 +1,9 @@
+import pandas as pd
+from src.analysis.aggregate_cube import AggregateCube, active_links, grouped_aggregate
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, record_count, records
+
+
 class EmploymentIndexes:
     """
     Classe para calcular índices relacionados ao mercado de trabalho em tecnologia.
@@ -10,16 +16,38 @@ class EmploymentIndexes:
       ou mais avançado em relação ao total.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    # 'vinculo_ativo_3112' dá origem ao indicador 'quantidade_vinculos_ativos' (veja `active_links`)
+    REQUIRED_COLUMNS = [
+        'sexo', 'valor_remuneracao_media', 'sigla_uf', 'id_municipio', 'ano', 'vinculo_ativo_3112',
+        'grau_instrucao_apos_2005',
+    ]
+
+    # Níveis de 'grau_instrucao_apos_2005' contados no Índice de Escolaridade
+    HIGHER_EDUCATION_LEVELS = ['MEDIO COMPL', 'SUP. INCOMP', 'SUP. COMP', 'MESTRADO', 'DOUTORADO']
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações de salários,
-                               região e escolaridade.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo informações de
+                                                     salários, região e escolaridade, ou resumos mergeáveis.
+        """
+        self.data = df
+        self.df = records(df)
+
+    @memoized
+    def average_salary_by_gender(self):
+        """
+        Calcula o salário médio de cada gênero.
+
+        Returns:
+            pd.Series: Salário médio indexado pelo gênero (coluna 'sexo').
         """
-        self.df = df
+        return grouped_aggregate(self.data, 'sexo', 'valor_remuneracao_media', 'mean')
 
+    @memoized
     def salary_disparity_index(self):
         """
         Calcula o Índice de Disparidade Salarial (IDS).
@@ -33,7 +61,7 @@ class EmploymentIndexes:
         Exemplo de Uso:
             Use este método para identificar disparidades salariais entre gêneros.
         """
-        salaries = self.df.groupby('sexo')['valor_remuneracao_media'].mean()
+        salaries = self.average_salary_by_gender()
         male_salary = salaries.get('Masculino', 0)
         female_salary = salaries.get('Feminino', 0)
 
@@ -43,6 +71,7 @@ class EmploymentIndexes:
         ids = ((male_salary - female_salary) / male_salary) * 100
         return ids
 
+    @memoized
     def regional_concentration_index(self, state):
         """
         Calcula o Índice de Concentração Regional (ICR).
@@ -60,15 +89,95 @@ class EmploymentIndexes:
             Para calcular o ICR de São Paulo:
                 regional_concentration_index("SP")
         """
-        total_national = self.df['quantidade_vinculos_ativos'].sum()
-        total_state = self.df[self.df['sigla_uf'] == state]['quantidade_vinculos_ativos'].sum()
+        total_national = self._total_active()
 
         if total_national == 0:  # Evita divisão por zero
             return None
 
-        icr = (total_state / total_national) * 100
-        return icr
+        # O ICR de todos os estados é calculado (e memorizado) de uma vez
+        icr = self.regional_concentration_indexes().set_index('Estado')['ICR (%)']
+        return icr.get(state, 0.0)
+
+    @memoized
+    def regional_concentration_indexes(self, level="estado", by_year=False):
+        """
+        Calcula o Índice de Concentração Regional (ICR) de todos os estados ou municípios.
+
+        Os vínculos ativos são somados em uma única redução agrupada por região (e por ano),
+        em vez de filtrar os dados uma vez por região.
+
+        Parameters:
+            level (str): "estado" (coluna 'sigla_uf') ou "municipio" (coluna 'id_municipio').
+            by_year (bool): Se True, calcula a série temporal: o ICR de cada região em cada ano,
+                            em relação ao total nacional do mesmo ano.
+
+        Returns:
+            pd.DataFrame: Colunas "Ano" (com `by_year`), "Estado" ou "Município", "Vínculos Ativos"
+                          e "ICR (%)" (NaN quando o total nacional é zero).
+
+        Raises:
+            ValueError: Se o nível especificado for diferente de "estado" ou "municipio".
+
+        Exemplo de Uso:
+            Para a série anual do ICR de cada estado:
+                regional_concentration_indexes(level="estado", by_year=True)
+        """
+        if level == "estado":
+            group_col, label = 'sigla_uf', 'Estado'
+        elif level == "municipio":
+            group_col, label = 'id_municipio', 'Município'
+        else:
+            raise ValueError("O nível deve ser 'estado' ou 'municipio'.")
+
+        if by_year:
+            active = grouped_aggregate(self.data, ['ano', group_col], 'quantidade_vinculos_ativos', 'sum')
+            national = grouped_aggregate(self.data, 'ano', 'quantidade_vinculos_ativos', 'sum')
+        else:
+            active = grouped_aggregate(self.data, group_col, 'quantidade_vinculos_ativos', 'sum')
+            national = self._total_active()
+        return self.concentration_table(active, national, label)
+
+    @staticmethod
+    def concentration_table(active, national, label):
+        """
+        Monta a tabela do ICR a partir dos vínculos ativos por região e do total nacional.
+
+        Parameters:
+            active (pd.Series): Vínculos ativos indexados pela região ou por (ano, região).
+            national (float ou pd.Series): Total nacional, ou total por ano indexado por 'ano'.
+            label (str): Nome da coluna da região ("Estado" ou "Município").
+
+        Returns:
+            pd.DataFrame: Mesmo retorno de `regional_concentration_indexes`.
+        """
+        if isinstance(national, pd.Series):
+            national = national.reindex(active.index.get_level_values('ano')).to_numpy()
+            columns = ['Ano', label]
+        else:
+            columns = [label]
+        national = pd.Series(national, index=active.index, dtype='float64')
+        table = pd.DataFrame({
+            'Vínculos Ativos': active,
+            'ICR (%)': active / national.where(national > 0) * 100,
+        }).reset_index()
+        table.columns = columns + ['Vínculos Ativos', 'ICR (%)']
+        return table
+
+    def _total_active(self):
+        """
+        Total nacional de vínculos ativos, a partir do cubo de agregados quando disponível.
 
+        Returns:
+            int: Número de registros com vínculo ativo.
+        """
+        cube = AggregateCube.covering(self.data, [], 'quantidade_vinculos_ativos')
+        if cube is not None:
+            return cube.totals()['ativos']
+        if isinstance(self.data, MergeableSummaries):
+            raise ValueError("Os resumos não têm vínculos ativos ('vinculo_ativo_3112').")
+        return active_links(self.df).sum()
+
+    @memoized
     def education_index(self):
         """
         Calcula o Índice de Escolaridade.
@@ -83,13 +192,13 @@ class EmploymentIndexes:
             Use este método para avaliar o nível de qualificação educacional dos empregados.
         """
         # Considera que a coluna 'grau_instrucao_apos_2005' contém a escolaridade
-        higher_education_levels = ['MEDIO COMPL', 'SUP. INCOMP', 'SUP. COMP', 'MESTRADO', 'DOUTORADO']
-
-        total_employees = len(self.df)
-        higher_education_employees = self.df[self.df['grau_instrucao_apos_2005'].isin(higher_education_levels)].shape[0]
-
+        total_employees = record_count(self.data)
         if total_employees == 0:  # Evita divisão por zero
             return None
 
+        # Registros por nível de escolaridade (pelo cubo de agregados, quando disponível)
+        levels = grouped_aggregate(self.data, 'grau_instrucao_apos_2005', 'valor_remuneracao_media', 'size')
+        higher_education_employees = levels[levels.index.isin(self.HIGHER_EDUCATION_LEVELS)].sum()
+
         education_index = (higher_education_employees / total_employees) * 100
         return education_index
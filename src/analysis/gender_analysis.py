@@ -1,3 +1,9 @@
+import pandas as pd
+from src.analysis.aggregate_cube import AggregateCube, grouped_aggregate
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, records
+
+
 class GenderAnalysis:
     """
     Classe para análise de métricas relacionadas a gênero.
@@ -7,16 +13,25 @@ class GenderAnalysis:
     em um conjunto de dados.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    # 'vinculo_ativo_3112' dá origem ao indicador 'quantidade_vinculos_ativos' (veja `active_links`)
+    REQUIRED_COLUMNS = [
+        'ano', 'sexo', 'valor_remuneracao_media', 'cbo_2002_descricao',
+        'sigla_uf', 'id_municipio', 'vinculo_ativo_3112',
+    ]
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações de gênero,
-                               salários e ocupações.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo informações de
+                                                     gênero, salários e ocupações, ou resumos mergeáveis.
         """
-        self.df = df
+        self.data = df
+        self.df = records(df)
 
+    @memoized
     def gender_salary_gap(self):
         """
         Calcula a diferença salarial entre gêneros.
@@ -34,13 +49,25 @@ class GenderAnalysis:
             Use este método para identificar disparidades salariais entre gêneros
             no conjunto de dados.
         """
-        salaries = self.df.groupby('sexo')['valor_remuneracao_media'].mean()
+        salaries = grouped_aggregate(self.data, 'sexo', 'valor_remuneracao_media', 'mean')
         return {
             "Salário Médio Masculino": salaries.get('Masculino', 0),
             "Salário Médio Feminino": salaries.get('Feminino', 0),
             "Diferença Salarial": salaries.get('Masculino', 0) - salaries.get('Feminino', 0)
         }
 
+    @memoized
+    def gender_counts(self):
+        """
+        Conta o número de homens e de mulheres.
+
+        Returns:
+            dict: {"Masculino": total de homens, "Feminino": total de mulheres}.
+        """
+        counts = grouped_aggregate(self.data, 'sexo', 'valor_remuneracao_media', 'size')
+        return {gender: int(counts.get(gender, 0)) for gender in ['Masculino', 'Feminino']}
+
+    @memoized
     def gender_equality_metrics(self, occupation=None, region=None):
         """
         Calcula métricas de igualdade de gênero com base em filtros opcionais de ocupação e região.
@@ -65,8 +92,29 @@ class GenderAnalysis:
             Para calcular a igualdade de gênero em uma ocupação específica e região:
                 gender_equality_metrics(occupation="Desenvolvedor", region="SP")
         """
-        # Cria uma cópia dos dados para evitar modificações no original
-        df_filtered = self.df.copy()
+        keys = ['cbo_2002_descricao', 'sigla_uf', 'sexo']
+        cube = AggregateCube.covering(self.data, keys, 'valor_remuneracao_media')
+        if cube is not None:
+            # Filtra as células do cubo em vez dos registros
+            cells = cube.cells
+            if occupation:
+                cells = cells[cells['cbo_2002_descricao'] == occupation]
+            if region:
+                cells = cells[cells['sigla_uf'] == region]
+            by_gender = cells.dropna(subset=['sexo']).groupby('sexo', observed=True)[['linhas', 'n', 'soma']].sum()
+            males = by_gender['linhas'].get('Masculino', 0)
+            females = by_gender['linhas'].get('Feminino', 0)
+            salary_by_gender = by_gender['soma'] / by_gender['n'].where(by_gender['n'] > 0)
+            return {
+                "Razão de Gêneros": males / females if females > 0 else None,
+                "Diferença Salarial": salary_by_gender.get('Masculino', 0) - salary_by_gender.get('Feminino', 0)
+            }
+
+        if isinstance(self.data, MergeableSummaries):
+            raise ValueError("Métricas de igualdade de gênero não suportadas sem um cubo por cargo, UF e sexo.")
+
+        # Os filtros criam novos DataFrames, sem modificar o original (não é preciso copiá-lo)
+        df_filtered = self.df
 
         # Filtra por ocupação, se especificada
         if occupation:
@@ -82,13 +130,83 @@ class GenderAnalysis:
         females = gender_counts.get('Feminino', 0)
 
         # Calcula a média salarial por gênero
-        salary_by_gender = df_filtered.groupby('sexo')['valor_remuneracao_media'].mean()
+        salary_by_gender = df_filtered.groupby('sexo', observed=True)['valor_remuneracao_media'].mean()
 
         return {
             "Razão de Gêneros": males / females if females > 0 else None,
             "Diferença Salarial": salary_by_gender.get('Masculino', 0) - salary_by_gender.get('Feminino', 0)
         }
 
+    @memoized
+    def gender_equality_matrix(self, level="estado"):
+        """
+        Calcula as métricas de igualdade de gênero de todas as combinações de ocupação e região.
+
+        Em vez de chamar `gender_equality_metrics` para cada combinação, as contagens e médias
+        salariais por ocupação, região e sexo são obtidas em uma única agregação (pelo cubo de
+        agregados, quando disponível), sem copiar os dados.
+
+        Parameters:
+            level (str): "estado" (coluna 'sigla_uf') ou "municipio" (coluna 'id_municipio').
+
+        Returns:
+            pd.DataFrame: Uma linha por combinação observada, com as colunas:
+                - "Cargo" e "Estado" ou "Município".
+                - "Homens" e "Mulheres": Número de empregados de cada gênero.
+                - "Salário Médio Masculino" e "Salário Médio Feminino".
+                - "Razão de Gêneros": Proporção de homens para mulheres (NaN sem mulheres).
+                - "Diferença Salarial": Diferença entre os salários médios (NaN se faltar um dos gêneros).
+
+        Raises:
+            ValueError: Se o nível especificado for diferente de "estado" ou "municipio", ou se os
+                        resumos mergeáveis não tiverem um cubo com as colunas do nível.
+
+        Exemplo de Uso:
+            Para um mapa de calor da diferença salarial por cargo e estado:
+                gender_equality_matrix().pivot(index="Cargo", columns="Estado", values="Diferença Salarial")
+        """
+        if level == "estado":
+            region_col, label = 'sigla_uf', 'Estado'
+        elif level == "municipio":
+            region_col, label = 'id_municipio', 'Município'
+        else:
+            raise ValueError("O nível deve ser 'estado' ou 'municipio'.")
+
+        stats = grouped_aggregate(
+            self.data, ['cbo_2002_descricao', region_col, 'sexo'], 'valor_remuneracao_media', ['size', 'mean']
+        )
+        return self.equality_table(stats, label)
+
+    @staticmethod
+    def equality_table(stats, label):
+        """
+        Monta a tabela de `gender_equality_matrix` a partir das estatísticas por ocupação, região e sexo.
+
+        Parameters:
+            stats (pd.DataFrame): Colunas "size" e "mean", indexadas por (ocupação, região, sexo).
+            label (str): Nome da coluna da região ("Estado" ou "Município").
+
+        Returns:
+            pd.DataFrame: Mesmo retorno de `gender_equality_matrix`.
+        """
+        by_gender = stats.unstack('sexo')
+        genders = ['Masculino', 'Feminino']
+        counts = by_gender['size'].reindex(columns=genders).fillna(0).astype('int64')
+        means = by_gender['mean'].reindex(columns=genders)
+        males, females = counts['Masculino'], counts['Feminino']
+
+        table = pd.DataFrame({
+            'Homens': males,
+            'Mulheres': females,
+            'Salário Médio Masculino': means['Masculino'],
+            'Salário Médio Feminino': means['Feminino'],
+            'Razão de Gêneros': males / females.where(females > 0),
+            'Diferença Salarial': means['Masculino'] - means['Feminino'],
+        }).reset_index()
+        table.columns = ['Cargo', label] + list(table.columns[2:])
+        return table
+
+    @memoized
     def compare_salary_by_gender_top_10_jobs(self):
         """
         Compara a média salarial entre homens e mulheres nos 10 cargos com mais empregados.
@@ -102,25 +220,22 @@ class GenderAnalysis:
                 - Diferença Salarial (Homens - Mulheres)
         """
         # Contar o número de empregados por cargo
-        job_counts = self.df['cbo_2002_descricao'].value_counts().head(10).index
+        job_sizes = grouped_aggregate(self.data, 'cbo_2002_descricao', 'valor_remuneracao_media', 'size')
+        job_counts = job_sizes.sort_values(ascending=False).head(10).index
 
-        # Filtrar o DataFrame para os 10 cargos com mais empregados
-        top_jobs_df = self.df[self.df['cbo_2002_descricao'].isin(job_counts)]
-
-        # Calcular a média salarial por gênero e cargo
+        # Calcular a média salarial por gênero e cargo, mantendo apenas os 10 cargos com mais empregados
+        by_job_gender = grouped_aggregate(
+            self.data, ['cbo_2002_descricao', 'sexo'], 'valor_remuneracao_media', 'mean'
+        )
+        by_job_gender = by_job_gender[by_job_gender.index.get_level_values('cbo_2002_descricao').isin(job_counts)]
         gender_salary = (
-            top_jobs_df.groupby(['cbo_2002_descricao', 'sexo'])['valor_remuneracao_media']
-            .mean()
+            by_job_gender
             .unstack(fill_value=0)  # Organiza em colunas para "Masculino" e "Feminino"
             .reset_index()
         )
 
         # Adicionar total de empregados por cargo
-        total_employees = (
-            top_jobs_df.groupby('cbo_2002_descricao')['cbo_2002_descricao']
-            .count()
-            .rename("Total de Empregados")
-        )
+        total_employees = job_sizes.loc[job_counts].rename("Total de Empregados")
 
         # Adicionar a diferença salarial
         gender_salary['Diferença Salarial'] = (
@@ -144,10 +259,14 @@ class GenderAnalysis:
 
         return result.sort_values('Total de Empregados', ascending=False).reset_index(drop=True)
 
+    @memoized
     def top_active_employees_by_year(self, id_municipio=None, sigla_uf=None):
         """
         Calcula qual empregado (homem ou mulher) tem mais vínculos ativos para cada ano.
 
+        Os vínculos ativos são somados em uma única agregação por ano, sexo e local, a partir do
+        indicador de `active_links` (calculado uma vez por DataFrame), sem alterar os dados.
+
         Parameters:
             id_municipio (int, optional): ID do município para filtrar os dados.
                                           Se None, considera todos os municípios no estado especificado.
@@ -160,44 +279,64 @@ class GenderAnalysis:
                 - ID do Município (ou Estado)
                 - Total de Vínculos Ativos
         """
-        # Contar um vínculo ativo apenas se 'vinculo_ativo_3112' for 'Sim'
-        self.df['quantidade_vinculos_ativos'] = self.df['vinculo_ativo_3112'].apply(lambda x: 1 if x == 'Sim' else 0)
-
-        # Filtrar apenas os registros com vínculos ativos
-        active_df = self.df[self.df['vinculo_ativo_3112'] == "Sim"]
-
         # Filtrar por município ou estado
         if id_municipio is not None:
-            active_df = active_df[active_df['id_municipio'] == id_municipio]
-            group_by_col = 'id_municipio'
-            rename_col = 'ID Município'
+            group_by_col, value = 'id_municipio', id_municipio
         elif sigla_uf is not None:
-            active_df = active_df[active_df['sigla_uf'] == sigla_uf]
-            group_by_col = 'sigla_uf'
-            rename_col = 'Estado'
+            group_by_col, value = 'sigla_uf', sigla_uf
         else:
-            group_by_col = 'id_municipio'
-            rename_col = 'ID Município'
+            group_by_col, value = 'id_municipio', None
 
         # Agrupar por ano, sexo e local (município ou estado), somando os vínculos ativos
-        grouped = (
-            active_df.groupby(['ano', 'sexo', group_by_col])
-            .agg({'quantidade_vinculos_ativos': 'sum'})
-            .reset_index()
-        )
+        grouped = grouped_aggregate(
+            self.data, ['ano', 'sexo', group_by_col], 'quantidade_vinculos_ativos', 'sum'
+        ).reset_index()
+        if value is not None:
+            grouped = grouped[grouped[group_by_col] == value]
 
-        # Identificar o registro com mais vínculos ativos para cada ano e gênero
-        top_active = grouped.loc[grouped.groupby(['ano', 'sexo'])['quantidade_vinculos_ativos'].idxmax()]
+        return self.top_active_table(grouped, ['ano', 'sexo'])
 
-        # Renomear as colunas para facilitar a leitura
-        top_active.rename(
-            columns={
-                'ano': 'Ano',
-                'sexo': 'Gênero',
-                group_by_col: rename_col,
-                'quantidade_vinculos_ativos': 'Total de Vínculos Ativos',
-            },
-            inplace=True,
-        )
+    @memoized
+    def top_active_municipalities_by_state(self):
+        """
+        Calcula, para cada UF, o município com mais vínculos ativos em cada ano e gênero.
 
+        Equivale a chamar `top_active_employees_by_year` para cada estado, mas em uma única
+        agregação por ano, sexo, UF e município.
+
+        Returns:
+            pd.DataFrame: Colunas "Ano", "Gênero", "Estado", "ID Município" e "Total de Vínculos Ativos".
+        """
+        grouped = grouped_aggregate(
+            self.data, ['ano', 'sexo', 'sigla_uf', 'id_municipio'], 'quantidade_vinculos_ativos', 'sum'
+        ).reset_index()
+        return self.top_active_table(grouped, ['ano', 'sexo', 'sigla_uf'])
+
+    @staticmethod
+    def top_active_table(grouped, by):
+        """
+        Seleciona o local com mais vínculos ativos em cada grupo.
+
+        Parameters:
+            grouped (pd.DataFrame): Vínculos ativos somados ('quantidade_vinculos_ativos') por
+                                    ano, sexo e local.
+            by (list): Colunas dos grupos em que o máximo é procurado (exemplo: ['ano', 'sexo']).
+
+        Returns:
+            pd.DataFrame: Uma linha por grupo, com as colunas renomeadas para leitura.
+        """
+        # Apenas locais com vínculos ativos, como na filtragem por 'vinculo_ativo_3112' == "Sim"
+        grouped = grouped[grouped['quantidade_vinculos_ativos'] > 0]
+
+        # Identificar o registro com mais vínculos ativos em cada grupo
+        top_active = grouped.loc[grouped.groupby(by, observed=True)['quantidade_vinculos_ativos'].idxmax()]
+
+        # Renomear as colunas para facilitar a leitura
+        top_active = top_active.rename(columns={
+            'ano': 'Ano',
+            'sexo': 'Gênero',
+            'sigla_uf': 'Estado',
+            'id_municipio': 'ID Município',
+            'quantidade_vinculos_ativos': 'Total de Vínculos Ativos',
+        })
         return top_active.reset_index(drop=True)
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import f as f_distribution
+from src.analysis.aggregate_cube import AggregateCube
+from src.analysis.central_moments import CentralMoments
+from src.analysis.summaries import MergeableSummaries
+
+
+class GroupMoments:
+    """
+    Estatísticas suficientes por grupo (contagem, média e soma dos quadrados dos desvios à média)
+    de uma coluna numérica.
+
+    As estatísticas são obtidas em uma única passada vetorizada e combinadas com as fórmulas de
+    Chan et al. (`CentralMoments.combine`), de modo que blocos de um CSV lido em partes, partições
+    por ano ou resultados de processos diferentes são resumidos separadamente e unidos com `merge`,
+    sem o cancelamento numérico de somas e somas de quadrados. A partir delas são calculadas a
+    ANOVA de um fator e a ANOVA de Welch, sem montar listas com os valores de cada grupo.
+
+    Valores ausentes da coluna são ignorados.
+    """
+
+    COLUMNS = ['n', 'media', 'm2']
+
+    def __init__(self, by, column='valor_remuneracao_media', table=None):
+        """
+        Inicializa as estatísticas (vazias, ou a partir de uma tabela já agregada).
+
+        Parameters:
+            by (str ou list): Coluna(s) que definem os grupos.
+            column (str): Coluna numérica resumida.
+            table (pd.DataFrame, optional): Colunas 'n', 'media' e 'm2', indexadas pelos grupos.
+        """
+        self.by = by
+        self.column = column
+        self.table = table if table is not None else pd.DataFrame(columns=self.COLUMNS, dtype='float64')
+
+    @classmethod
+    def from_frame(cls, df, by, column='valor_remuneracao_media'):
+        """
+        Resume um DataFrame (ou um bloco) em uma única agregação agrupada.
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+            by (str ou list): Coluna(s) que definem os grupos.
+            column (str): Coluna numérica resumida.
+
+        Returns:
+            GroupMoments: Estatísticas de cada grupo (grupos com chave ausente são descartados).
+        """
+        values = df[column].astype('float64')
+        valid = values.notna()
+        keys = [df[by][valid]] if isinstance(by, str) else [df[col][valid] for col in by]
+        return cls(by, column, CentralMoments.describe(values[valid], keys, order=2))
+
+    @classmethod
+    def of(cls, df, by, column='valor_remuneracao_media'):
+        """
+        Estatísticas de um DataFrame ou de resumos mergeáveis, lidas do cubo de agregados quando ele cobre os grupos.
+
+        Parameters:
+            df (pd.DataFrame ou MergeableSummaries): Dados ou resumos.
+            by (str ou list): Coluna(s) que definem os grupos.
+            column (str): Coluna numérica resumida.
+
+        Returns:
+            GroupMoments: Estatísticas de cada grupo.
+
+        Raises:
+            ValueError: Se os resumos não tiverem um cubo que cubra os grupos.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        cube = AggregateCube.covering(df, keys, column)
+        if cube is not None:
+            return cls(by, column, cube.table(keys)[cls.COLUMNS])
+        if isinstance(df, MergeableSummaries):
+            raise ValueError(f"Estatísticas por {keys} não suportadas no modo fora da memória.")
+        return cls.from_frame(df, by, column)
+
+    @classmethod
+    def from_chunks(cls, chunks, by, column='valor_remuneracao_media'):
+        """
+        Resume uma sequência de blocos (exemplo: `DataLoader.iter_preprocessed_chunks()`).
+
+        Returns:
+            GroupMoments: Estatísticas combinadas de todos os blocos.
+        """
+        moments = cls(by, column)
+        for chunk in chunks:
+            moments.update(chunk)
+        return moments
+
+    def update(self, chunk):
+        """
+        Incorpora um bloco de dados.
+
+        Parameters:
+            chunk (pd.DataFrame): Bloco com as colunas de `by` e `column`.
+
+        Returns:
+            GroupMoments: O próprio objeto, para encadeamento.
+        """
+        return self.merge(self.from_frame(chunk, self.by, self.column))
+
+    def merge(self, other):
+        """
+        Combina as estatísticas de outra parte dos dados (outro bloco, partição ou processo).
+
+        Parameters:
+            other (GroupMoments): Estatísticas dos mesmos grupos e coluna.
+
+        Returns:
+            GroupMoments: O próprio objeto, com as estatísticas combinadas.
+        """
+        if self.table.empty:
+            self.table = other.table.copy()
+        elif not other.table.empty:
+            # Blocos diferentes podem ter dicionários de categorias diferentes
+            self.table = CentralMoments.combine(pd.concat([self.table, other.table]))
+        return self
+
+    def means(self):
+        """
+        Média de cada grupo.
+
+        Returns:
+            pd.Series: Médias indexadas pelos grupos.
+        """
+        return self.table['media']
+
+    def variances(self):
+        """
+        Variância amostral (ddof=1) de cada grupo.
+
+        Returns:
+            pd.Series: Variâncias indexadas pelos grupos (NaN para grupos com menos de dois valores).
+        """
+        n = self.table['n']
+        return (self.table['m2'] / (n - 1).where(n > 1)).clip(lower=0)
+
+    def anova(self, test_name="ANOVA"):
+        """
+        ANOVA de um fator (mesmo resultado de `scipy.stats.f_oneway` sobre os valores de cada grupo).
+
+        Se todos os grupos forem constantes, a estatística é infinita (valor-p zero) quando as
+        médias diferem e NaN quando são todas iguais, como no SciPy.
+
+        Parameters:
+            test_name (str): Nome do teste no resultado.
+
+        Returns:
+            dict: "Teste", "Estatística" e "Valor-p", ou "Erro" com menos de dois grupos.
+        """
+        table = self.table[self.table['n'] > 0]
+        if len(table) < 2:
+            return {"Erro": "ANOVA requer pelo menos dois grupos para comparação."}
+
+        n = table['n'].sum()
+        grand_mean = (table['n'] * table['media']).sum() / n
+        between = (table['n'] * (table['media'] - grand_mean) ** 2).sum()
+        within = table['m2'].clip(lower=0).sum()
+        df_between, df_within = len(table) - 1, n - len(table)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stat = np.float64(between / df_between) / np.float64(within / df_within)
+        return {
+            "Teste": test_name,
+            "Estatística": stat,
+            "Valor-p": f_distribution.sf(stat, df_between, df_within)
+        }
+
+    def welch_anova(self, test_name="ANOVA de Welch"):
+        """
+        ANOVA de Welch, que não supõe variâncias iguais entre os grupos.
+
+        Grupos com menos de dois valores ou com variância nula não entram no teste, pois o peso
+        de cada grupo é o inverso da variância da sua média.
+
+        Parameters:
+            test_name (str): Nome do teste no resultado.
+
+        Returns:
+            dict: "Teste", "Estatística" e "Valor-p", ou "Erro" com menos de dois grupos válidos.
+        """
+        variances = self.variances()
+        valid = variances > 0
+        n, means, variances = self.table['n'][valid], self.means()[valid], variances[valid]
+        k = len(n)
+        if k < 2:
+            return {"Erro": "ANOVA requer pelo menos dois grupos para comparação."}
+
+        weights = n / variances
+        weighted_mean = (weights * means).sum() / weights.sum()
+        between = (weights * (means - weighted_mean) ** 2).sum() / (k - 1)
+        lambda_ = ((1 - weights / weights.sum()) ** 2 / (n - 1)).sum()
+        stat = between / (1 + 2 * (k - 2) / (k ** 2 - 1) * lambda_)
+        df_between, df_within = k - 1, (k ** 2 - 1) / (3 * lambda_)
+        return {
+            "Teste": test_name,
+            "Estatística": stat,
+            "Valor-p": f_distribution.sf(stat, df_between, df_within)
+        }
@@ -0,0 +1,265 @@
+import copy
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import weakref
+from collections import OrderedDict
+
+from src.analysis.summaries import MergeableSummaries
+from src.config import Config
+from src.data.deduplication import HashDeduplicator
+
+# Raiz do pacote `src`, cujo código-fonte inteiro entra na chave dos resultados
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class AnalysisMemo:
+    """
+    Memoização dos resultados das análises, compartilhada entre o documento e os gráficos.
+
+    Cada resultado é identificado pela impressão digital do conjunto de dados (hash do conteúdo,
+    calculado uma única vez por DataFrame), pelo método, pelos argumentos (com os valores padrão
+    aplicados), por um hash do código-fonte de todo o pacote `src` e pelas configurações que
+    alteram os resultados, de modo que instâncias novas de uma mesma classe de análise sobre os
+    mesmos dados reaproveitam os resultados e qualquer alteração no código (inclusive nos módulos
+    auxiliares, como os sketches e os cubos de agregados) ou em `Config` invalida as entradas antigas.
+
+    As entradas em memória são limitadas a `max_entries`, descartando as menos usadas recentemente.
+    Com `persist`, os resultados também são gravados em disco e reaproveitados entre execuções,
+    com o mesmo limite de arquivos.
+
+    Os resultados são copiados ao serem guardados e devolvidos, então podem ser modificados pelo
+    chamador. A impressão digital reflete os dados na primeira consulta: colunas derivadas
+    acrescentadas depois não a alteram, mas os valores existentes não devem ser modificados no lugar.
+    """
+
+    _shared = None
+
+    # Configurações que não alteram os resultados das análises (as demais entram na chave)
+    NEUTRAL_SETTINGS = {
+        'RAW_DATA_PATH', 'PROCESSED_DATA_PATH', 'PARTITIONS_PATH', 'OUTPUT_PATH', 'MAX_WORKERS',
+        'CACHE_ENABLED', 'CACHE_FORMAT',
+        'MEMO_ENABLED', 'MEMO_MAX_ENTRIES', 'MEMO_PERSIST', 'MEMO_PATH',
+    }
+
+    def __init__(self, max_entries=Config.MEMO_MAX_ENTRIES, persist=Config.MEMO_PERSIST, cache_dir=Config.MEMO_PATH):
+        """
+        Inicializa uma memória vazia.
+
+        Parameters:
+            max_entries (int): Número máximo de resultados mantidos em memória (e em disco).
+            persist (bool): Se True, grava os resultados em `cache_dir` e os reaproveita entre execuções.
+            cache_dir (str): Diretório dos resultados persistidos.
+        """
+        self.max_entries = max_entries
+        self.persist = persist
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._fingerprints = {}  # id do DataFrame -> (referência fraca, impressão digital)
+        self._code_version = None
+
+    @classmethod
+    def shared(cls):
+        """
+        Memória compartilhada por todas as classes de análise.
+
+        Returns:
+            AnalysisMemo: Instância única, criada no primeiro uso.
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def fingerprint(self, df):
+        """
+        Impressão digital do conteúdo de um DataFrame, calculada uma vez por objeto.
+
+        Combina os nomes e tipos das colunas com os hashes de 64 bits de cada linha.
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+
+        Returns:
+            str: Hash hexadecimal do conteúdo.
+        """
+        entry = self._fingerprints.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+        digest.update(HashDeduplicator.row_hashes(df).tobytes())
+        fingerprint = digest.hexdigest()
+
+        self._fingerprints[id(df)] = (weakref.ref(df), fingerprint)
+        weakref.finalize(df, self._fingerprints.pop, id(df), None)
+        return fingerprint
+
+    def code_version(self):
+        """
+        Hash do código-fonte de todos os módulos do pacote `src`, calculado uma vez por instância.
+
+        Returns:
+            str: Hash hexadecimal dos caminhos e conteúdos dos arquivos .py.
+        """
+        if self._code_version is None:
+            digest = hashlib.blake2b(digest_size=8)
+            for directory, subdirectories, files in os.walk(SOURCE_ROOT):
+                subdirectories[:] = sorted(d for d in subdirectories if d != '__pycache__')
+                for name in sorted(f for f in files if f.endswith('.py')):
+                    path = os.path.join(directory, name)
+                    digest.update(os.path.relpath(path, SOURCE_ROOT).encode())
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+            self._code_version = digest.hexdigest()
+        return self._code_version
+
+    def settings(self):
+        """
+        Configurações que alteram os resultados, lidas a cada chamada.
+
+        Returns:
+            str: Representação ordenada dos valores de `Config`, exceto `NEUTRAL_SETTINGS`.
+        """
+        values = {
+            name: value for name, value in vars(Config).items()
+            if name.isupper() and name not in self.NEUTRAL_SETTINGS
+        }
+        return repr(sorted(values.items()))
+
+    def key(self, df, func, arguments):
+        """
+        Chave de um resultado.
+
+        Parameters:
+            df (pd.DataFrame): Dados da análise.
+            func (callable): Método da análise.
+            arguments (dict): Argumentos do método, com os valores padrão aplicados.
+
+        Returns:
+            str: Hash hexadecimal que identifica o resultado.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        parts = (self.fingerprint(df), func.__qualname__, self.code_version(), self.settings(),
+                 repr(sorted(arguments.items())))
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    def call(self, func, instance, args, kwargs):
+        """
+        Devolve o resultado memorizado de `func(instance, *args, **kwargs)` ou o calcula e o guarda.
+
+        Parameters:
+            func (callable): Método da análise (não decorado).
+            instance (object): Instância da classe de análise, com o atributo `df`.
+            args (tuple): Argumentos posicionais.
+            kwargs (dict): Argumentos nomeados.
+
+        Returns:
+            object: Cópia do resultado.
+        """
+        bound = inspect.signature(func).bind(instance, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])  # sem `self`
+        key = self.key(instance.df, func, arguments)
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+
+        result = self._load(key)
+        if result is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            result = (func(instance, *args, **kwargs),)
+            self._save(key, result)
+
+        self.entries[key] = copy.deepcopy(result[0])
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result[0]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load(self, key):
+        """
+        Lê um resultado persistido.
+
+        Returns:
+            tuple ou None: (resultado,) ou None se não houver entrada em disco.
+        """
+        if not self.persist or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key), 'rb') as f:
+            result = pickle.load(f)
+        os.utime(self._path(key))  # Marca o uso recente para o descarte por antiguidade
+        return result
+
+    def _save(self, key, result):
+        """
+        Grava um resultado em disco e descarta os arquivos menos usados acima do limite.
+
+        Parameters:
+            key (str): Chave do resultado.
+            result (tuple): (resultado,).
+        """
+        if not self.persist:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(key), 'wb') as f:
+            pickle.dump(result, f)
+
+        files = sorted(glob.glob(os.path.join(self.cache_dir, '*.pkl')), key=os.path.getmtime)
+        for path in files[:max(len(files) - self.max_entries, 0)]:
+            os.remove(path)
+
+    def clear(self):
+        """Remove os resultados em memória (os arquivos persistidos são mantidos)."""
+        self.entries.clear()
+
+    def stats(self):
+        """
+        Estatísticas de uso da memoização.
+
+        Returns:
+            dict: Acertos em memória, acertos em disco, faltas e número de entradas em memória.
+        """
+        return {
+            "Acertos": self.hits,
+            "Acertos em Disco": self.disk_hits,
+            "Faltas": self.misses,
+            "Entradas": len(self.entries),
+        }
+
+
+def memoized(func):
+    """
+    Decora um método de análise para que seus resultados passem por `AnalysisMemo.shared()`.
+
+    O método deve depender apenas de `self.df` e dos seus argumentos. Com `Config.MEMO_ENABLED`
+    desativado, ou quando a análise é feita sobre resumos mergeáveis (cujo `df` é apenas uma
+    amostra, que não identifica os resultados), o método é chamado diretamente.
+
+    Parameters:
+        func (callable): Método de uma classe de análise (com o atributo `df`).
+
+    Returns:
+        callable: Método decorado.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not Config.MEMO_ENABLED or isinstance(getattr(self, 'data', None), MergeableSummaries):
+            return func(self, *args, **kwargs)
+        return AnalysisMemo.shared().call(func, self, args, kwargs)
+    return wrapper
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+from src.analysis.aggregate_cube import AggregateCube
+from src.analysis.bootstrap import Bootstrap
+from src.analysis.central_moments import CentralMoments
+from src.analysis.predictive_models import PredictiveModels
+from src.analysis.rank_counts import RankCounts
+from src.analysis.summaries import MergeableSummaries
+from src.config import Config
+from src.data.schema import concat_frames
+
+
+class OutOfCoreAnalysis(MergeableSummaries):
+    """
+    Resumos mergeáveis dos dados, para conjuntos que não cabem na memória (por exemplo, a RAIS
+    nacional completa).
+
+    Os blocos pré-processados (veja `DataLoader.iter_preprocessed_chunks`) são incorporados, um a
+    um, aos mesmos resumos que as classes de análise usam em memória:
+        - cubos de agregados (`AggregateCube`) com as dimensões de `CUBES`;
+        - os momentos centrais dos salários por ano, com um sketch de quantis para a mediana (`CentralMoments`);
+        - as contagens de salários por gênero do teste de Mann-Whitney (`RankCounts`);
+        - as contagens por salário e gênero do bootstrap (`Bootstrap.salary_counts`);
+        - as equações normais do modelo de previsão (`PredictiveModels.normal_equations`);
+        - uma amostra uniforme de tamanho fixo.
+    A memória usada depende do número de grupos e de salários distintos e do tamanho da amostra,
+    e não do número de registros, e resumos de partes diferentes podem ser combinados com `merge`.
+
+    O resumo não tem métodos de análise próprios: as classes de análise (BasicStatistics,
+    GenderAnalysis, PositionAnalysis, PredictiveModels, RegionalAnalysis, EmploymentIndexes,
+    StatisticalTests e Bootstrap) aceitam o resumo no lugar do DataFrame e calculam os mesmos
+    resultados a partir dele (veja `MergeableSummaries`). Os resultados são exatos, exceto:
+        - a mediana salarial, estimada pelo sketch (veja `KLLSketch.rank_error`);
+        - os métodos que dependem de registros individuais (regressões com divisão treino/teste
+          e os gráficos de dispersão e boxplot), calculados sobre a amostra (`df`).
+    Agregações por combinações de colunas que nenhum cubo cobre (por exemplo, a matriz de
+    igualdade de gênero por município) levantam ValueError.
+    """
+
+    # Dimensões dos cubos de agregados; cada consulta usa o primeiro cubo que cobrir as suas chaves
+    CUBES = [
+        ['ano', 'sexo', 'sigla_uf', 'id_municipio'],
+        ['ano', 'cbo_2002_descricao', 'sigla_uf', 'sexo'],
+        ['cbo_2002_descricao_familia'],
+        ['grau_instrucao_apos_2005'],
+    ]
+
+    # Precisão do sketch da mediana salarial (erro de rank ~0,14%; cerca de 6.000 valores em memória)
+    MEDIAN_SKETCH_K = 2000
+
+    def __init__(self, sample_size=Config.OUT_OF_CORE_SAMPLE_SIZE, seed=0):
+        """
+        Inicializa um resumo vazio.
+
+        Parameters:
+            sample_size (int): Número de registros mantidos na amostra uniforme.
+            seed (int, optional): Semente da amostragem, para resultados reproduzíveis.
+        """
+        self.sample_size = sample_size
+        self.count = 0
+        self.cubes = None
+        self.moments = None
+        self.rank_counts = RankCounts()
+        self.salary_counts = Bootstrap.salary_counts(pd.DataFrame({'valor_remuneracao_media': []}))
+        self.normal_equations = {}
+        self.sample = None
+        self.sample_priority = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        """
+        Resume um fluxo de blocos pré-processados.
+
+        Parameters:
+            chunks (Iterable[pd.DataFrame]): Blocos de dados limpos.
+            **kwargs: Parâmetros repassados ao construtor.
+
+        Returns:
+            OutOfCoreAnalysis: Resumo de todos os blocos.
+
+        Exemplo de Uso:
+            loader = DataLoader("data/raw/microdados.csv", chunksize=500_000)
+            summaries = OutOfCoreAnalysis.from_chunks(loader.iter_preprocessed_chunks())
+            BasicStatistics(summaries).salary_distribution()
+        """
+        analysis = cls(**kwargs)
+        for chunk in chunks:
+            analysis.update(chunk)
+        return analysis
+
+    @property
+    def df(self):
+        """
+        Amostra uniforme dos registros, usada pelos métodos e gráficos que precisam de registros individuais.
+
+        Returns:
+            pd.DataFrame: Registros amostrados.
+        """
+        if self.sample is None:
+            self.sample = pd.DataFrame()
+        return self.sample
+
+    def update(self, chunk):
+        """
+        Incorpora um bloco de dados pré-processados ao resumo.
+
+        Parameters:
+            chunk (pd.DataFrame): Bloco de dados limpos.
+
+        Returns:
+            OutOfCoreAnalysis: O próprio resumo, para encadeamento.
+        """
+        if chunk.empty:
+            return self
+
+        if self.cubes is None:
+            # As dimensões e os grupos dos momentos são definidos pelas colunas do primeiro bloco
+            self.cubes = [
+                AggregateCube(dimensions=[dim for dim in dims if dim in chunk.columns])
+                for dims in self.CUBES if any(dim in chunk.columns for dim in dims)
+            ]
+            by = 'ano' if 'ano' in chunk.columns else None
+            self.moments = CentralMoments(by=by, median="sketch", sketch_k=self.MEDIAN_SKETCH_K)
+
+        self.count += len(chunk)
+        for cube in self.cubes:
+            cube.update(chunk)
+        self.moments.update(chunk)
+        if 'sexo' in chunk.columns:
+            self.rank_counts.update_frame(chunk, 'valor_remuneracao_media', 'sexo', ('Masculino', 'Feminino'))
+        self._add_salary_counts(Bootstrap.salary_counts(chunk))
+        self._add_normal_equations(PredictiveModels.normal_equations(chunk))
+        self._update_sample(chunk)
+        return self
+
+    def _add_salary_counts(self, counts):
+        """Soma contagens por salário e gênero às acumuladas."""
+        self.salary_counts = self.salary_counts.add(counts, fill_value=0).astype('int64')
+
+    def _add_normal_equations(self, equations):
+        """Soma X'X e X'y de cada gênero aos acumulados."""
+        for gender, (xtx, xty) in equations.items():
+            own_xtx, own_xty = self.normal_equations.get(gender, (0.0, 0.0))
+            self.normal_equations[gender] = (own_xtx + xtx, own_xty + xty)
+
+    def _update_sample(self, chunk):
+        """
+        Mantém uma amostra uniforme de tamanho fixo (os registros com as menores prioridades aleatórias).
+
+        Parameters:
+            chunk (pd.DataFrame): Bloco de dados limpos.
+        """
+        priority = self._rng.random(len(chunk))
+        if self.sample is not None and len(self.sample) >= self.sample_size > 0:
+            candidates = priority < self.sample_priority.max()
+            chunk, priority = chunk[candidates], priority[candidates]
+            if chunk.empty:
+                return
+        self._combine_sample(chunk.copy(), priority)
+
+    def _combine_sample(self, rows, priority):
+        """
+        Junta registros candidatos à amostra e mantém os `sample_size` de menor prioridade.
+
+        Parameters:
+            rows (pd.DataFrame): Registros candidatos.
+            priority (np.ndarray): Prioridade aleatória de cada registro.
+        """
+        if self.sample is not None:
+            rows = concat_frames([self.sample, rows])
+            priority = np.concatenate([self.sample_priority, priority])
+        keep = np.argsort(priority, kind='stable')[:self.sample_size]
+        self.sample = rows.iloc[keep].reset_index(drop=True)
+        self.sample_priority = priority[keep]
+
+    def merge(self, other):
+        """
+        Combina outro resumo a este (por exemplo, resumos de arquivos ou anos processados separadamente).
+
+        Parameters:
+            other (OutOfCoreAnalysis): Resumo a ser incorporado, com as mesmas colunas.
+
+        Returns:
+            OutOfCoreAnalysis: O próprio resumo, para encadeamento.
+        """
+        if other.cubes is None:
+            return self
+        if self.cubes is None:
+            self.cubes = [AggregateCube(dimensions=cube.dimensions) for cube in other.cubes]
+            self.moments = CentralMoments(by=other.moments.by, median="sketch", sketch_k=self.MEDIAN_SKETCH_K)
+
+        self.count += other.count
+        for cube, other_cube in zip(self.cubes, other.cubes):
+            cube.merge(other_cube)
+        self.moments.merge(other.moments)
+        self.rank_counts.merge(other.rank_counts)
+        self._add_salary_counts(other.salary_counts)
+        self._add_normal_equations(other.normal_equations)
+        if other.sample is not None:
+            self._combine_sample(other.sample.copy(), other.sample_priority)
+        return self
+
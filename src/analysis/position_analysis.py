@@ -1,3 +1,8 @@
+from src.analysis.aggregate_cube import grouped_aggregate
+from src.analysis.memoization import memoized
+from src.analysis.summaries import records
+
+
 class PositionAnalysis:
     """
     Classe para análise de cargos.
@@ -6,16 +11,22 @@ class PositionAnalysis:
     calcular suas frequências e apresentar os resultados de forma ordenada.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    REQUIRED_COLUMNS = ['cbo_2002_descricao']
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações sobre cargos,
-                               descrições e outras variáveis relevantes.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo informações sobre
+                                                     cargos, descrições e outras variáveis relevantes,
+                                                     ou resumos mergeáveis.
         """
-        self.df = df
+        self.data = df
+        self.df = records(df)
 
+    @memoized
     def analyze_unique_positions(self, sort_by="Cargo", ascending=True):
         """
         Analisa os cargos únicos no conjunto de dados e calcula suas frequências.
@@ -43,8 +54,12 @@ class PositionAnalysis:
             Para analisar os cargos únicos e ordená-los pela frequência em ordem decrescente:
                 analyze_unique_positions(sort_by="Frequência", ascending=False)
         """
-        # Conta o número de ocorrências de cada cargo
-        position_counts = self.df['cbo_2002_descricao'].value_counts().reset_index()
+        # Conta o número de ocorrências de cada cargo (pelo cubo de agregados, quando disponível)
+        position_counts = (
+            grouped_aggregate(self.data, 'cbo_2002_descricao', 'valor_remuneracao_media', 'size')
+            .sort_values(ascending=False)
+            .reset_index()
+        )
 
         # Renomeia as colunas para "Cargo" e "Frequência"
         position_counts.columns = ['Cargo', 'Frequência']
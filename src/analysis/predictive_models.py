@@ -4,7 +4,10 @@ from sklearn.metrics import mean_squared_error, accuracy_score, classification_r
 from sklearn.preprocessing import OneHotEncoder, LabelEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
+import numpy as np
 import pandas as pd
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, records
 
 class PredictiveModels:
     """
@@ -15,16 +18,50 @@ class PredictiveModels:
     respectivamente.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    REQUIRED_COLUMNS = [
+        'idade', 'tempo_emprego', 'grau_instrucao_apos_2005', 'valor_remuneracao_media',
+        'sigla_uf', 'sexo', 'vinculo_ativo_3112',
+    ]
+
+    # Mapeamento ordinal da escolaridade usado nas previsões
+    EDUCATION_MAPPING = {
+        "ANALFABETO": 0,
+        "ATE 5.A INC": 1,
+        "5.A CO FUND": 2,
+        "6. A 9. FUND": 3,
+        "FUND COMPL": 4,
+        "MEDIO INCOMP": 5,
+        "MEDIO COMPL": 6,
+        "SUP. INCOMP": 7,
+        "SUP. COMP": 8,
+        "MESTRADO": 9,
+        "DOUTORADO": 10,
+        "IGNORADO": -1
+    }
+
+    # Variáveis do modelo de previsão e perfis usados para prever os salários de 2024
+    PREDICTION_FEATURES = ['idade', 'tempo_emprego', 'grau_instrucao_num']
+    PREDICTION_PROFILES = {
+        'idade': [25, 35, 40],  # Idades médias previstas
+        'tempo_emprego': [12, 24, 36],  # Tempo de emprego médio esperado
+        'grau_instrucao_num': [8, 9, 10]  # SUP. COMP, MESTRADO, DOUTORADO
+    }
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo as variáveis independentes e dependentes
-                               para treinar e avaliar os modelos preditivos.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo as variáveis
+                                                     independentes e dependentes para treinar e avaliar
+                                                     os modelos preditivos, ou resumos mergeáveis
+                                                     (as regressões usam a amostra dos resumos).
         """
-        self.df = df
+        self.data = df
+        self.df = records(df)
 
+    @memoized
     def linear_regression_salary(self):
         """
         Executa Regressão Linear para prever salários com base em idade, tempo de emprego
@@ -77,6 +114,7 @@ class PredictiveModels:
             "Erro Quadrático Médio": mean_squared_error(y_test, model.predict(X_test))
         }
 
+    @memoized
     def logistic_regression_active_link(self):
         """
         Executa Regressão Logística para prever a probabilidade de vínculos ativos
@@ -135,56 +173,71 @@ class PredictiveModels:
             "Relatório de Classificação": classification_report(y_test, predictions, output_dict=True)
         }
 
+    @memoized
     def predict_gender_salary_2024(self):
         """
         Prevê o salário médio de homens e mulheres em 2024 com base em um modelo de regressão linear.
 
+        A regressão de cada gênero é resolvida pelas suas equações normais (veja `normal_equations`),
+        que também são acumuladas bloco a bloco no modo fora da memória.
+
         Returns:
             dict: Contém as previsões de salário médio para homens e mulheres.
+
+        Raises:
+            ValueError: Se não houver registros válidos para algum gênero.
         """
-        predictions = {}
+        if isinstance(self.data, MergeableSummaries):
+            equations = self.data.normal_equations
+        else:
+            equations = self.normal_equations(self.df)
 
-        # Definir o mapeamento de escolaridade
-        education_mapping = {
-            "ANALFABETO": 0,
-            "ATE 5.A INC": 1,
-            "5.A CO FUND": 2,
-            "6. A 9. FUND": 3,
-            "FUND COMPL": 4,
-            "MEDIO INCOMP": 5,
-            "MEDIO COMPL": 6,
-            "SUP. INCOMP": 7,
-            "SUP. COMP": 8,
-            "MESTRADO": 9,
-            "DOUTORADO": 10,
-            "IGNORADO": -1
-        }
+        # Dados futuros para previsão (ajustar conforme o contexto), com a coluna do intercepto
+        future_data = pd.DataFrame(self.PREDICTION_PROFILES)[self.PREDICTION_FEATURES]
+        X_future = np.column_stack([np.ones(len(future_data)), future_data.to_numpy(dtype='float64')])
 
+        predictions = {}
         for gender in ['Masculino', 'Feminino']:
-            # Filtrar o DataFrame para o gênero atual
-            gender_df = self.df[self.df['sexo'] == gender].copy()
-
-            # Aplicar o mapeamento na coluna grau_instrucao_apos_2005
-            gender_df['grau_instrucao_num'] = gender_df['grau_instrucao_apos_2005'].map(education_mapping)
+            xtx, xty = equations.get(gender, (0.0, 0.0))
+            if np.ndim(xtx) == 0 or xtx[0, 0] == 0:
+                raise ValueError(f"Não há registros válidos do gênero {gender} para treinar o modelo.")
+            coefficients = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+            predictions[gender] = (X_future @ coefficients).mean()  # Salário médio previsto para o gênero
 
-            # Treinar o modelo de regressão linear
-            features = ['idade', 'tempo_emprego', 'grau_instrucao_num']
-            gender_df_clean = gender_df.dropna(subset=features + ['valor_remuneracao_media'])
-            X = gender_df_clean[features]
-            y = gender_df_clean['valor_remuneracao_media']
+        return predictions
 
-            model = LinearRegression()
-            model.fit(X, y)
+    @classmethod
+    def normal_equations(cls, df):
+        """
+        X'X e X'y da regressão linear de `predict_gender_salary_2024`, por gênero.
 
-            # Criar os dados futuros para previsão (ajustar conforme o contexto)
-            future_data = pd.DataFrame({
-                'idade': [25, 35, 40],  # Idades médias previstas
-                'tempo_emprego': [12, 24, 36],  # Tempo de emprego médio esperado
-                'grau_instrucao_num': [8, 9, 10]  # SUP. COMP, MESTRADO, DOUTORADO
-            })
+        As matrizes de blocos diferentes são somadas, de modo que a regressão sobre todos os
+        registros é resolvida sem mantê-los na memória.
 
-            # Prever os salários médios
-            predicted_salaries = model.predict(future_data)
-            predictions[gender] = predicted_salaries.mean()  # Salário médio previsto para o gênero
+        Parameters:
+            df (pd.DataFrame): Dados (ou um bloco) com as colunas 'sexo', 'idade', 'tempo_emprego',
+                               'grau_instrucao_apos_2005' e 'valor_remuneracao_media'.
 
-        return predictions
+        Returns:
+            dict: Gênero -> (X'X, X'y), com a coluna do intercepto em X (vazio sem as colunas).
+        """
+        required = ['sexo', 'idade', 'tempo_emprego', 'grau_instrucao_apos_2005', 'valor_remuneracao_media']
+        if not all(col in df.columns for col in required):
+            return {}
+
+        features = pd.DataFrame({
+            'idade': df['idade'].astype('float64'),
+            'tempo_emprego': df['tempo_emprego'].astype('float64'),
+            'grau_instrucao_num': df['grau_instrucao_apos_2005'].astype(object)
+            .map(cls.EDUCATION_MAPPING).astype('float64'),
+        })[cls.PREDICTION_FEATURES]
+        salaries = df['valor_remuneracao_media'].astype('float64')
+        valid = features.notna().all(axis=1) & salaries.notna()
+
+        equations = {}
+        for gender in ['Masculino', 'Feminino']:
+            rows = (valid & (df['sexo'] == gender)).to_numpy(dtype=bool)
+            X = np.column_stack([np.ones(rows.sum()), features.to_numpy()[rows]])
+            y = salaries.to_numpy()[rows]
+            equations[gender] = (X.T @ X, X.T @ y)
+        return equations
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from src.config import Config
+
+
+class RankCounts:
+    """
+    Contagens mergeáveis de valores de duas amostras para o teste U de Mann-Whitney.
+
+    Em vez de ordenar e ranquear todos os valores, o teste guarda, para cada valor distinto, quantos
+    registros de cada amostra o possuem. Como os salários da RAIS têm muitos empates (múltiplos do
+    salário mínimo), o número de valores distintos é muito menor que o número de registros. A
+    estatística U sai de uma única soma acumulada sobre os valores ordenados, e as contagens de
+    blocos, partições ou processos diferentes são combinadas com `merge`.
+
+    Dois modos:
+        - Exato (`bin_width=None`): uma contagem por valor distinto; U é igual ao do `mannwhitneyu`.
+        - Aproximado (`bin_width` > 0): os valores são agrupados em faixas de largura fixa, e os
+          pares de uma mesma faixa contam como empates. A memória fica limitada pela amplitude dos
+          valores dividida pela largura, e o erro de U é no máximo metade do número de pares
+          (primeira, segunda amostra) que caem na mesma faixa (veja `max_error`).
+
+    O valor-p usa a aproximação normal com correção de empates e de continuidade (o mesmo que
+    `mannwhitneyu(..., method="asymptotic")`).
+    """
+
+    def __init__(self, bin_width=Config.MANN_WHITNEY_BIN_WIDTH):
+        """
+        Inicializa contagens vazias.
+
+        Parameters:
+            bin_width (float, optional): Largura das faixas do modo aproximado (None para o modo exato).
+        """
+        self.bin_width = bin_width
+        # Valor (ou faixa) -> número de registros de cada amostra, em ordem crescente
+        self.counts = pd.DataFrame({'primeira': pd.Series(dtype='int64'), 'segunda': pd.Series(dtype='int64')})
+
+    @classmethod
+    def from_frame(cls, df, column, by, groups, bin_width=Config.MANN_WHITNEY_BIN_WIDTH):
+        """
+        Conta os valores de duas amostras de um DataFrame.
+
+        Parameters:
+            df (pd.DataFrame): Dados (ou um bloco).
+            column (str): Coluna numérica comparada.
+            by (str): Coluna que identifica as amostras.
+            groups (tuple): Valores de `by` da primeira e da segunda amostra (exemplo: ("Masculino", "Feminino")).
+            bin_width (float, optional): Largura das faixas do modo aproximado (None para o modo exato).
+
+        Returns:
+            RankCounts: Contagens das duas amostras.
+        """
+        return cls(bin_width).update_frame(df, column, by, groups)
+
+    def _keys(self, values):
+        """Valores (modo exato) ou índices das faixas (modo aproximado), sem ausentes."""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if self.bin_width is None:
+            return values
+        return np.floor(values / self.bin_width)
+
+    def update(self, first, second):
+        """
+        Incorpora valores das duas amostras. Valores ausentes (NaN) são ignorados.
+
+        Parameters:
+            first (array-like): Valores da primeira amostra.
+            second (array-like): Valores da segunda amostra.
+
+        Returns:
+            RankCounts: O próprio objeto, para encadeamento.
+        """
+        parts = {}
+        for name, values in (('primeira', first), ('segunda', second)):
+            keys, counts = np.unique(self._keys(values), return_counts=True)
+            parts[name] = pd.Series(counts, index=keys)
+        return self._add(pd.DataFrame(parts).fillna(0))
+
+    def update_frame(self, chunk, column, by, groups):
+        """
+        Incorpora um bloco de dados, separando as amostras pela coluna `by`.
+
+        Returns:
+            RankCounts: O próprio objeto, para encadeamento.
+        """
+        labels = chunk[by]
+        values = chunk[column]
+        return self.update(values[labels == groups[0]], values[labels == groups[1]])
+
+    def merge(self, other):
+        """
+        Combina as contagens de outra parte dos dados (com o mesmo `bin_width`).
+
+        Parameters:
+            other (RankCounts): Contagens a serem incorporadas.
+
+        Returns:
+            RankCounts: O próprio objeto, com as contagens somadas.
+        """
+        return self._add(other.counts)
+
+    def _add(self, counts):
+        """Soma contagens, mantendo os valores em ordem crescente."""
+        self.counts = self.counts.add(counts, fill_value=0).sort_index().astype('int64')
+        return self
+
+    def sizes(self):
+        """
+        Tamanho de cada amostra.
+
+        Returns:
+            tuple: (n da primeira amostra, n da segunda amostra).
+        """
+        return int(self.counts['primeira'].sum()), int(self.counts['segunda'].sum())
+
+    def statistic(self):
+        """
+        Estatística U da primeira amostra: pares em que o valor da primeira é maior, mais metade dos empates.
+
+        Returns:
+            float: U (o mesmo `statistic` de `mannwhitneyu(first, second)` no modo exato).
+        """
+        first = self.counts['primeira'].to_numpy(dtype='float64')
+        second = self.counts['segunda'].to_numpy(dtype='float64')
+        # Valores da segunda amostra estritamente menores que cada valor distinto
+        below = np.cumsum(second) - second
+        return float((first * (below + 0.5 * second)).sum())
+
+    def max_error(self):
+        """
+        Erro máximo de U no modo aproximado (zero no modo exato).
+
+        Cada par (primeira, segunda amostra) de uma mesma faixa conta 0,5 em U, quando a contribuição
+        real é 0, 0,5 ou 1.
+
+        Returns:
+            float: Limite para |U aproximado - U exato|.
+        """
+        if self.bin_width is None:
+            return 0.0
+        return 0.5 * float((self.counts['primeira'].astype('float64') * self.counts['segunda']).sum())
+
+    def test(self):
+        """
+        Teste U de Mann-Whitney bilateral.
+
+        Returns:
+            dict: "Estatística" (U da primeira amostra), "Valor-p" e "Erro Máximo da Estatística".
+        """
+        n1, n2 = self.sizes()
+        ties = self.counts.sum(axis=1).to_numpy(dtype='float64')
+        u1 = self.statistic()
+        return {
+            "Estatística": u1,
+            "Valor-p": float(self.p_value(u1, n1, n2, (ties ** 3 - ties).sum())),
+            "Erro Máximo da Estatística": self.max_error(),
+        }
+
+    @staticmethod
+    def p_value(u1, n1, n2, tie_sum):
+        """
+        Valor-p bilateral pela aproximação normal, com correção de empates e de continuidade.
+
+        Aceita escalares ou arrays (um teste por posição).
+
+        Parameters:
+            u1: Estatística U da primeira amostra.
+            n1, n2: Tamanhos das amostras.
+            tie_sum: Soma de t³ - t sobre os grupos de valores empatados (t = registros com o mesmo valor).
+
+        Returns:
+            Valor(es)-p, NaN quando alguma amostra é vazia.
+        """
+        u1, n1, n2, tie_sum = (np.asarray(x, dtype='float64') for x in (u1, n1, n2, tie_sum))
+        n = n1 + n2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_sum / (n * (n - 1))))
+            z = (np.maximum(u1, n1 * n2 - u1) - n1 * n2 / 2 - 0.5) / sigma
+            p_values = np.minimum(2 * norm.sf(z), 1.0)
+        return np.where((n1 > 0) & (n2 > 0), p_values, np.nan)
+
+    @staticmethod
+    def grouped_test(df, column, by, groups, keys):
+        """
+        Teste de Mann-Whitney (modo exato) em cada célula definida por `keys`, sem laço por célula.
+
+        As contagens de cada valor por célula e amostra saem de uma única agregação ordenada; U é
+        a soma acumulada dentro de cada célula.
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+            column (str): Coluna numérica comparada.
+            by (str): Coluna que identifica as amostras.
+            groups (tuple): Valores de `by` da primeira e da segunda amostra.
+            keys (list): Colunas que definem as células (exemplo: ['cbo_2002_descricao', 'sigla_uf', 'ano']).
+
+        Returns:
+            pd.DataFrame: Colunas "Estatística" (U da primeira amostra) e "Valor-p", indexadas pelas células.
+        """
+        labels = df[by]
+        samples = pd.DataFrame({
+            'primeira': (labels == groups[0]).astype('int64'),
+            'segunda': (labels == groups[1]).astype('int64'),
+        }, index=df.index)
+        # Ordenadas por célula e, dentro dela, por valor (valores ausentes são descartados)
+        counts = samples.groupby([df[key] for key in keys] + [df[column]], observed=True).sum()
+        cells = list(range(len(keys)))
+
+        below = counts['segunda'].groupby(level=cells, observed=True).cumsum() - counts['segunda']
+        ties = counts['primeira'] + counts['segunda']
+        by_cell = pd.DataFrame({
+            'u': counts['primeira'] * (below + 0.5 * counts['segunda']),
+            'n1': counts['primeira'],
+            'n2': counts['segunda'],
+            'empates': ties.astype('float64') ** 3 - ties,
+        }).groupby(level=cells, observed=True).sum()
+
+        p_values = RankCounts.p_value(by_cell['u'], by_cell['n1'], by_cell['n2'], by_cell['empates'])
+        return pd.DataFrame({'Estatística': by_cell['u'], 'Valor-p': p_values}, index=by_cell.index)
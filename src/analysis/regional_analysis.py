@@ -1,3 +1,8 @@
+from src.analysis.aggregate_cube import grouped_aggregate
+from src.analysis.memoization import memoized
+from src.analysis.summaries import records
+
+
 class RegionalAnalysis:
     """
     Classe para análise de métricas regionais relacionadas ao mercado de trabalho.
@@ -6,16 +11,31 @@ class RegionalAnalysis:
     em diferentes estados ou municípios, permitindo identificar disparidades regionais.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    # 'vinculo_ativo_3112' dá origem ao indicador 'quantidade_vinculos_ativos' (veja `active_links`)
+    REQUIRED_COLUMNS = ['sigla_uf', 'id_municipio', 'valor_remuneracao_media', 'vinculo_ativo_3112']
+
+    # Cidades mais populosas do Paraná e seus códigos de município (IBGE)
+    TOP_CITIES_PR = {
+        'Curitiba': 4106902,
+        'Londrina': 4113700,
+        'Maringá': 4115200,
+        'Ponta Grossa': 4119905,
+        'Cascavel': 4104808
+    }
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações sobre regiões,
-                               salários e empregos.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo informações sobre
+                                                     regiões, salários e empregos, ou resumos mergeáveis.
         """
-        self.df = df
+        self.data = df
+        self.df = records(df)
 
+    @memoized
     def regional_analysis(self):
         """
         Calcula o número total de empregados e o salário médio por estado.
@@ -29,11 +49,12 @@ class RegionalAnalysis:
         Exemplo de Uso:
             Use este método para obter uma visão geral do mercado de trabalho por estado.
         """
-        return self.df.groupby('sigla_uf')['valor_remuneracao_media'].agg(['mean', 'count']).rename(columns={
+        return grouped_aggregate(self.data, 'sigla_uf', 'valor_remuneracao_media', ['mean', 'count']).rename(columns={
             'mean': 'Salário Médio',
             'count': 'Total Empregados'
         }).reset_index()
 
+    @memoized
     def concentration_of_jobs(self, level="estado"):
         """
         Calcula a concentração de empregos em tecnologia por estado ou município.
@@ -66,10 +87,11 @@ class RegionalAnalysis:
         else:
             raise ValueError("O nível deve ser 'estado' ou 'municipio'.")
 
-        concentration = self.df.groupby(group_col)['quantidade_vinculos_ativos'].sum().reset_index()
+        concentration = grouped_aggregate(self.data, group_col, 'quantidade_vinculos_ativos', 'sum').reset_index()
         concentration.columns = [label, 'Total Empregados']
         return concentration
 
+    @memoized
     def average_salary_by_region(self, level="estado"):
         """
         Calcula o salário médio por estado ou município.
@@ -102,10 +124,11 @@ class RegionalAnalysis:
         else:
             raise ValueError("O nível deve ser 'estado' ou 'municipio'.")
 
-        average_salary = self.df.groupby(group_col)['valor_remuneracao_media'].mean().reset_index()
+        average_salary = grouped_aggregate(self.data, group_col, 'valor_remuneracao_media', 'mean').reset_index()
         average_salary.columns = [label, 'Salário Médio']
         return average_salary
 
+    @memoized
     def average_salary_top_5_cities(self):
         """
         Calcula a média salarial nas 5 cidades mais populosas do Paraná (PR).
@@ -121,21 +144,14 @@ class RegionalAnalysis:
             dict: Um dicionário com as cidades como chaves e suas respectivas médias salariais.
         """
         # Define as cidades mais populosas do Paraná
-        top_cities = {
-            'Curitiba': 4106902,
-            'Londrina': 4113700,
-            'Maringá': 4115200,
-            'Ponta Grossa': 4119905,
-            'Cascavel': 4104808
-        }
-
-        # Filtrar os dados para o estado do Paraná (PR) e as cidades selecionadas
-        df_pr = self.df[(self.df['sigla_uf'] == 'PR') & (self.df['id_municipio'].isin(top_cities.values()))]
+        top_cities = self.TOP_CITIES_PR
 
-        # Agrupar por município e calcular a média salarial
-        city_salary = df_pr.groupby('id_municipio')['valor_remuneracao_media'].mean()
+        # Média salarial por estado e município (pelo cubo de agregados, quando disponível)
+        city_salary = grouped_aggregate(self.data, ['sigla_uf', 'id_municipio'], 'valor_remuneracao_media', 'mean')
 
-        # Mapear IDs de municípios para nomes de cidades
-        city_salary_named = {city: city_salary.get(municipio_id, None) for city, municipio_id in top_cities.items()}
+        # Mapear IDs de municípios do Paraná (PR) para nomes de cidades
+        city_salary_named = {
+            city: city_salary.get(('PR', municipio_id), None) for city, municipio_id in top_cities.items()
+        }
 
         return city_salary_named
@@ -0,0 +1,63 @@
+from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.employment_indexes import EmploymentIndexes
+from src.analysis.gender_analysis import GenderAnalysis
+from src.analysis.position_analysis import PositionAnalysis
+from src.analysis.predictive_models import PredictiveModels
+from src.analysis.regional_analysis import RegionalAnalysis
+from src.analysis.statistical_tests import StatisticalTests
+
+
+# Seções do relatório e as classes de análise que as produzem, na ordem do documento
+ANALYSIS_SECTIONS = {
+    'basic_statistics': BasicStatistics,
+    'gender_analysis': GenderAnalysis,
+    'position_analysis': PositionAnalysis,
+    'predictive_models': PredictiveModels,
+    'regional_analysis': RegionalAnalysis,
+    'employment_indexes': EmploymentIndexes,
+    'statistical_tests': StatisticalTests,
+}
+
+
+def resolve_sections(sections=None):
+    """
+    Valida a lista de seções solicitadas.
+
+    Parameters:
+        sections (list, optional): Nomes das seções (chaves de ANALYSIS_SECTIONS).
+                                   Se None, considera todas as seções.
+
+    Returns:
+        list: Nomes das seções, na ordem do documento.
+
+    Raises:
+        ValueError: Se alguma seção não existir.
+    """
+    if sections is None:
+        return list(ANALYSIS_SECTIONS)
+
+    unknown = [section for section in sections if section not in ANALYSIS_SECTIONS]
+    if unknown:
+        raise ValueError(f"Seções desconhecidas: {unknown}. Opções: {list(ANALYSIS_SECTIONS)}.")
+    return [section for section in ANALYSIS_SECTIONS if section in sections]
+
+
+def required_columns(sections=None):
+    """
+    Calcula a união das colunas lidas pelas seções solicitadas.
+
+    Parameters:
+        sections (list, optional): Nomes das seções. Se None, considera todas as seções.
+
+    Returns:
+        list: Colunas necessárias, sem repetições e em ordem de declaração.
+
+    Exemplo de Uso:
+        required_columns(["regional_analysis", "gender_analysis"])
+    """
+    columns = []
+    for section in resolve_sections(sections):
+        for col in ANALYSIS_SECTIONS[section].REQUIRED_COLUMNS:
+            if col not in columns:
+                columns.append(col)
+    return columns
@@ -1,4 +1,11 @@
-from scipy.stats import ttest_ind, mannwhitneyu, f_oneway
+import numpy as np
+import pandas as pd
+from scipy.stats import ttest_ind_from_stats
+from src.analysis.aggregate_cube import grouped_aggregate
+from src.analysis.group_moments import GroupMoments
+from src.analysis.rank_counts import RankCounts
+from src.analysis.memoization import memoized
+from src.analysis.summaries import MergeableSummaries, records
 
 class StatisticalTests:
     """
@@ -7,17 +14,36 @@ class StatisticalTests:
     Esta classe fornece métodos para realizar:
     - Teste t de Student ou Mann-Whitney U Test: Para comparar salários entre homens e mulheres.
     - Análise de Variância (ANOVA): Para comparar salários entre diferentes regiões ou setores.
+    - Testes em lote da diferença salarial entre gêneros em cada célula (cargo, UF e ano), com
+      correção para comparações múltiplas.
     """
 
+    # Colunas lidas pelos métodos desta classe (usadas na projeção de colunas do DataLoader)
+    REQUIRED_COLUMNS = [
+        'sexo', 'valor_remuneracao_media', 'sigla_uf', 'cbo_2002_descricao_familia', 'cbo_2002_descricao', 'ano',
+    ]
+
+    # Nomes das colunas das células nas tabelas de resultados
+    CELL_LABELS = {
+        'cbo_2002_descricao': 'Cargo',
+        'cbo_2002': 'CBO',
+        'sigla_uf': 'Estado',
+        'id_municipio': 'Município',
+        'ano': 'Ano',
+    }
+
     def __init__(self, df):
         """
         Inicializa a instância da classe com um DataFrame.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo as variáveis para os testes estatísticos.
+            df (pd.DataFrame ou MergeableSummaries): O conjunto de dados contendo as variáveis para
+                                                     os testes estatísticos, ou resumos mergeáveis.
         """
-        self.df = df
+        self.data = df
+        self.df = records(df)
 
+    @memoized
     def compare_gender_salaries(self, test="t-test"):
         """
         Compara salários entre homens e mulheres usando o Teste t de Student ou o Mann-Whitney U Test.
@@ -28,7 +54,10 @@ class StatisticalTests:
                         - "mann-whitney": Mann-Whitney U Test.
 
         Returns:
-            dict: Resultado do teste estatístico, incluindo o valor-p (p-value).
+            dict: Resultado do teste estatístico, incluindo o valor-p (p-value). O teste t de Welch é
+                  calculado a partir das médias e variâncias de cada gênero (veja `GroupMoments`). O
+                  Mann-Whitney é calculado por `RankCounts` e inclui o erro máximo da estatística
+                  (zero no modo exato, veja `Config.MANN_WHITNEY_BIN_WIDTH`).
 
         Raises:
             ValueError: Se o teste especificado não for suportado.
@@ -36,17 +65,25 @@ class StatisticalTests:
         Exemplo de Uso:
             compare_gender_salaries(test="t-test")
         """
-        # Filtra os salários por gênero
-        male_salaries = self.df[self.df['sexo'] == 'Masculino']['valor_remuneracao_media'].dropna()
-        female_salaries = self.df[self.df['sexo'] == 'Feminino']['valor_remuneracao_media'].dropna()
-
         # Verifica qual teste aplicar
         if test == "t-test":
-            stat, p_value = ttest_ind(male_salaries, female_salaries, equal_var=False)
+            # Contagens, médias e variâncias dos salários por gênero (pelo cubo de agregados, quando disponível)
+            moments = GroupMoments.of(self.data, 'sexo')
+            counts, means = moments.table['n'], moments.means()
+            stds = np.sqrt(moments.variances())
+            stat, p_value = ttest_ind_from_stats(
+                means['Masculino'], stds['Masculino'], counts['Masculino'],
+                means['Feminino'], stds['Feminino'], counts['Feminino'],
+                equal_var=False
+            )
             test_name = "Teste t de Student"
         elif test == "mann-whitney":
-            stat, p_value = mannwhitneyu(male_salaries, female_salaries, alternative='two-sided')
-            test_name = "Mann-Whitney U Test"
+            # U a partir das contagens de cada salário por gênero, sem ranquear todos os registros
+            if isinstance(self.data, MergeableSummaries):
+                counts = self.data.rank_counts
+            else:
+                counts = RankCounts.from_frame(self.df, 'valor_remuneracao_media', 'sexo', ('Masculino', 'Feminino'))
+            return {"Teste": "Mann-Whitney U Test", **counts.test()}
         else:
             raise ValueError("Teste não suportado. Escolha 't-test' ou 'mann-whitney'.")
 
@@ -56,52 +93,176 @@ class StatisticalTests:
             "Valor-p": p_value
         }
 
-    def anova_salary_by_region(self):
+    @memoized
+    def gender_salary_means(self):
+        """
+        Calcula os salários médios de homens e mulheres comparados em `compare_gender_salaries`.
+
+        Returns:
+            tuple: (salário médio masculino, salário médio feminino).
+        """
+        salaries = grouped_aggregate(self.data, 'sexo', 'valor_remuneracao_media', 'mean')
+        return salaries.get('Masculino', np.nan), salaries.get('Feminino', np.nan)
+
+    @memoized
+    def anova_salary_by_region(self, welch=False):
         """
         Compara salários entre diferentes regiões (estados) usando ANOVA.
 
+        A ANOVA é calculada a partir da contagem, média e soma dos quadrados dos desvios dos
+        salários de cada estado (veja `GroupMoments`), obtidas em uma única agregação.
+
+        Parameters:
+            welch (bool): Se True, usa a ANOVA de Welch, que não supõe variâncias iguais.
+
         Returns:
             dict: Resultado do teste ANOVA, incluindo o valor-p (p-value).
 
         Exemplo de Uso:
             anova_salary_by_region()
         """
-        # Agrupa salários por estado
-        grouped_salaries = self.df.groupby('sigla_uf')['valor_remuneracao_media'].apply(list)
-
-        # Aplica ANOVA apenas se houver mais de um grupo
-        if len(grouped_salaries) < 2:
-            return {"Erro": "ANOVA requer pelo menos dois grupos para comparação."}
+        # Estatísticas suficientes dos salários por estado
+        moments = GroupMoments.of(self.data, 'sigla_uf')
 
-        stat, p_value = f_oneway(*grouped_salaries)
+        if welch:
+            return moments.welch_anova("ANOVA de Welch")
+        return moments.anova("ANOVA")
 
-        return {
-            "Teste": "ANOVA",
-            "Estatística": stat,
-            "Valor-p": p_value
-        }
-
-    def anova_salary_by_sector(self):
+    @memoized
+    def anova_salary_by_sector(self, welch=False):
         """
         Compara salários entre diferentes setores usando ANOVA.
 
+        Parameters:
+            welch (bool): Se True, usa a ANOVA de Welch, que não supõe variâncias iguais.
+
         Returns:
             dict: Resultado do teste ANOVA, incluindo o valor-p (p-value).
 
         Exemplo de Uso:
             anova_salary_by_sector()
         """
-        # Agrupa salários por setor (coluna 'cbo_2002')
-        grouped_salaries = self.df.groupby('cbo_2002_descricao_familia')['valor_remuneracao_media'].apply(list)
+        # Estatísticas suficientes dos salários por setor (família CBO)
+        moments = GroupMoments.of(self.data, 'cbo_2002_descricao_familia')
 
-        # Aplica ANOVA apenas se houver mais de um grupo
-        if len(grouped_salaries) < 2:
-            return {"Erro": "ANOVA requer pelo menos dois grupos para comparação."}
+        if welch:
+            return moments.welch_anova("ANOVA de Welch por Setor")
+        return moments.anova("ANOVA por Setor")
 
-        stat, p_value = f_oneway(*grouped_salaries)
+    @memoized
+    def gender_gap_tests(self, by=('cbo_2002_descricao', 'sigla_uf', 'ano'), correction="fdr_bh", alpha=0.05,
+                         rank_test=False):
+        """
+        Testa a diferença salarial entre homens e mulheres em cada célula (por exemplo, cargo × UF × ano).
 
-        return {
-            "Teste": "ANOVA por Setor",
-            "Estatística": stat,
-            "Valor-p": p_value
-        }
+        As médias e variâncias de cada célula e gênero são calculadas uma única vez (veja
+        `GroupMoments`, respondido pelo cubo de agregados quando disponível), e os testes t de
+        Welch de todas as células são feitos em uma única chamada vetorizada. Os valores-p são
+        corrigidos para comparações múltiplas.
+
+        Parameters:
+            by (tuple): Colunas que definem as células.
+            correction (str): Correção dos valores-p: "fdr_bh" (Benjamini-Hochberg), "holm" ou None.
+            alpha (float): Nível de significância aplicado aos valores-p corrigidos.
+            rank_test (bool): Se True, também executa o Mann-Whitney em cada célula (veja `RankCounts`).
+
+        Returns:
+            pd.DataFrame: Uma linha por célula, com as colunas das células (renomeadas por
+                          `CELL_LABELS`), "Homens", "Mulheres", "Salário Médio Masculino",
+                          "Salário Médio Feminino", "Diferença Salarial", "Estatística t", "Valor-p",
+                          "Valor-p Ajustado" e "Significativo" (e, com `rank_test`, "Estatística U",
+                          "Valor-p (Mann-Whitney)" e "Valor-p Ajustado (Mann-Whitney)"). Células sem
+                          pelo menos dois salários de cada gênero têm valor-p NaN e não entram na correção.
+
+        Raises:
+            ValueError: Se a correção especificada não for suportada, ou, com resumos mergeáveis,
+                        se nenhum cubo cobrir as células ou se `rank_test` for True (os resumos não
+                        guardam as contagens de salários por célula).
+
+        Exemplo de Uso:
+            Células com diferença significativa, pela correção de Holm:
+                results = gender_gap_tests(correction="holm")
+                results[results["Significativo"]]
+        """
+        if rank_test and isinstance(self.data, MergeableSummaries):
+            raise ValueError("O Mann-Whitney por célula não é suportado no modo fora da memória.")
+
+        keys = list(by)
+        moments = GroupMoments.of(self.data, keys + ['sexo'])
+        genders = ['Masculino', 'Feminino']
+        counts = moments.table['n'].unstack('sexo').reindex(columns=genders).fillna(0).astype('int64')
+        means = moments.means().unstack('sexo').reindex(columns=genders)
+        # Variâncias negativas por arredondamento descartariam a célula (desvio padrão NaN)
+        variances = moments.variances().clip(lower=0).unstack('sexo').reindex(columns=genders)
+
+        # Teste t de Welch de todas as células com pelo menos dois salários de cada gênero
+        valid = ((counts >= 2).all(axis=1) & ((variances / counts).sum(axis=1) > 0)).to_numpy()
+        stat, p_value = np.full(len(counts), np.nan), np.full(len(counts), np.nan)
+        stat[valid], p_value[valid] = ttest_ind_from_stats(
+            means['Masculino'].to_numpy()[valid], np.sqrt(variances['Masculino'].to_numpy()[valid]),
+            counts['Masculino'].to_numpy()[valid],
+            means['Feminino'].to_numpy()[valid], np.sqrt(variances['Feminino'].to_numpy()[valid]),
+            counts['Feminino'].to_numpy()[valid],
+            equal_var=False
+        )
+
+        results = pd.DataFrame({
+            'Homens': counts['Masculino'],
+            'Mulheres': counts['Feminino'],
+            'Salário Médio Masculino': means['Masculino'],
+            'Salário Médio Feminino': means['Feminino'],
+            'Diferença Salarial': means['Masculino'] - means['Feminino'],
+            'Estatística t': stat,
+            'Valor-p': p_value,
+        }, index=counts.index)
+        results['Valor-p Ajustado'] = adjust_p_values(results['Valor-p'], correction)
+        results['Significativo'] = results['Valor-p Ajustado'] < alpha
+
+        if rank_test:
+            ranks = RankCounts.grouped_test(
+                self.df, 'valor_remuneracao_media', 'sexo', tuple(genders), keys
+            ).reindex(results.index)
+            results['Estatística U'] = ranks['Estatística']
+            results['Valor-p (Mann-Whitney)'] = ranks['Valor-p']
+            results['Valor-p Ajustado (Mann-Whitney)'] = adjust_p_values(ranks['Valor-p'], correction)
+
+        return results.reset_index().rename(columns=self.CELL_LABELS)
+
+
+def adjust_p_values(p_values, method="fdr_bh"):
+    """
+    Corrige valores-p para comparações múltiplas.
+
+    Parameters:
+        p_values (pd.Series): Valores-p; valores ausentes (NaN) são mantidos e não contam como testes.
+        method (str): "fdr_bh" (Benjamini-Hochberg, controla a taxa de falsas descobertas),
+                      "holm" (Holm-Bonferroni, controla a taxa de erro por família) ou None (sem correção).
+
+    Returns:
+        pd.Series: Valores-p corrigidos, com o mesmo índice.
+
+    Raises:
+        ValueError: Se o método especificado não for suportado.
+    """
+    if method not in ("fdr_bh", "holm", None):
+        raise ValueError("Correção não suportada. Escolha 'fdr_bh', 'holm' ou None.")
+
+    values = p_values.to_numpy(dtype='float64')
+    if method is None:
+        return pd.Series(values, index=p_values.index)
+
+    # Posições dos testes válidos, do menor para o maior valor-p
+    positions = np.flatnonzero(~np.isnan(values))
+    positions = positions[np.argsort(values[positions], kind='stable')]
+    sorted_p = values[positions]
+    m = len(sorted_p)
+    ranks = np.arange(1, m + 1)
+
+    if method == "fdr_bh":
+        adjusted = np.minimum.accumulate((sorted_p * m / ranks)[::-1])[::-1]
+    else:
+        adjusted = np.maximum.accumulate(sorted_p * (m - ranks + 1))
+
+    result = np.full(len(values), np.nan)
+    result[positions] = np.minimum(adjusted, 1.0)
+    return pd.Series(result, index=p_values.index)
@@ -0,0 +1,45 @@
+class MergeableSummaries:
+    """
+    Interface dos resumos mergeáveis que substituem os registros nas classes de análise.
+
+    Uma classe de análise criada com um objeto desta interface, em vez de um DataFrame, calcula
+    os seus resultados a partir dos mesmos resumos usados em memória (cubos de agregados, momentos
+    centrais, contagens de salários e equações normais), acumulados bloco a bloco; apenas os
+    métodos que dependem de registros individuais usam a amostra `df`. A implementação é
+    `OutOfCoreAnalysis`.
+
+    Atributos esperados:
+        df (pd.DataFrame): Amostra dos registros.
+        count (int): Número de registros resumidos.
+        cubes (list): Cubos de agregados (`AggregateCube`); cada consulta usa o primeiro que cobrir as chaves.
+        moments (CentralMoments): Momentos dos salários (por ano), com a mediana estimada pelo sketch.
+        rank_counts (RankCounts): Contagens de salários masculinos e femininos (Mann-Whitney).
+        salary_counts (pd.DataFrame): Contagens por salário e gênero (veja `Bootstrap.salary_counts`).
+        normal_equations (dict): X'X e X'y do modelo de previsão, por gênero.
+    """
+
+
+def records(data):
+    """
+    Registros dos dados de uma classe de análise.
+
+    Parameters:
+        data (pd.DataFrame ou MergeableSummaries): Dados ou resumos.
+
+    Returns:
+        pd.DataFrame: O próprio DataFrame, ou a amostra dos resumos.
+    """
+    return data.df if isinstance(data, MergeableSummaries) else data
+
+
+def record_count(data):
+    """
+    Número de registros dos dados de uma classe de análise.
+
+    Parameters:
+        data (pd.DataFrame ou MergeableSummaries): Dados ou resumos.
+
+    Returns:
+        int: Número de linhas do DataFrame, ou de registros resumidos.
+    """
+    return data.count if isinstance(data, MergeableSummaries) else len(data)
@@ -1,5 +1,76 @@
 class Config:
     RAW_DATA_PATH = 'data/raw/'
     PROCESSED_DATA_PATH = 'data/processed/'
+    PARTITIONS_PATH = PROCESSED_DATA_PATH + 'partitions/'
     OUTPUT_PATH = 'output/'
     DEFAULT_YEAR = 2023
+
+    # Carregamento dos dados
+    USE_SCHEMA = True       # Aplica o esquema tipado (categorias e inteiros pequenos) na leitura
+    FLOAT32_SALARIES = False  # Carrega salários e tempo de emprego como float32
+    CHUNK_SIZE = None       # Linhas por bloco no pré-processamento em blocos (None lê o arquivo inteiro)
+    CSV_ENGINE = 'c'        # Leitor de CSV: 'c' (Pandas, uma thread) ou 'pyarrow' (Arrow, várias threads)
+    # Filtros aplicados a cada bloco durante a leitura, antes do pré-processamento (None para nenhum).
+    # Exemplo equivalente ao WHERE da consulta do README, para um extrato nacional:
+    # {'cbo': ['2123', '2124', '1236', '1425', '3172', '3171'], 'age': (18, 64), 'state': 'PR'}
+    ROW_FILTERS = None
+    MAX_WORKERS = None      # Processos usados para ler vários arquivos e gerar réplicas de bootstrap (None usa o número de CPUs)
+
+    # Remoção de outliers: 'exact' (quantis exatos) ou 'sketch' (sketch de quantis KLL, mergeável)
+    OUTLIER_METHOD = 'exact'
+    SKETCH_K = 200          # Precisão do sketch KLL (erro de rank ~1,3% com k=200)
+
+    # Mediana salarial de BasicStatistics: 'exact' (contagem de cada salário distinto) ou 'sketch'
+    # (sketch KLL com SKETCH_K); os demais momentos são sempre exatos (veja src/analysis/central_moments.py)
+    MEDIAN_METHOD = 'exact'
+
+    # Teste de Mann-Whitney por contagem de valores (veja src/analysis/rank_counts.py): None conta
+    # cada salário distinto (exato); uma largura (em R$) agrupa os salários em faixas (aproximado)
+    MANN_WHITNEY_BIN_WIDTH = None
+
+    # Intervalos de confiança por bootstrap (veja src/analysis/bootstrap.py) das médias e medianas
+    # salariais, da diferença salarial e do IDS no documento (0 desativa). As réplicas são geradas em
+    # lotes de até BOOTSTRAP_MEMORY_MB por processo; BOOTSTRAP_METHOD é 'poisson' ou 'multinomial'.
+    BOOTSTRAP_REPLICATES = 1000
+    BOOTSTRAP_METHOD = 'poisson'
+    BOOTSTRAP_MEMORY_MB = 256
+
+    # Remoção de duplicatas por hash de 64 bits: memória máxima dos hashes em fluxos de blocos
+    # e número de partições gravadas em disco quando esse limite é atingido
+    DEDUP_MEMORY_MB = 256
+    DEDUP_PARTITIONS = 64
+
+    # Modo fora da memória: o CSV é processado em blocos de OUT_OF_CORE_CHUNK_SIZE linhas e o
+    # relatório é gerado a partir de agregados parciais, sem carregar o conjunto completo
+    OUT_OF_CORE = False
+    OUT_OF_CORE_CHUNK_SIZE = 500_000
+    OUT_OF_CORE_SAMPLE_SIZE = 200_000  # Registros da amostra usada nos gráficos de dispersão e boxplot
+
+    # Responde às médias, somas e contagens das análises de resumo a partir de um cubo de agregados
+    # construído em uma única passada sobre os registros (veja src/analysis/aggregate_cube.py)
+    USE_AGGREGATE_CUBE = True
+
+    # Chave de agrupamento: o conjunto pré-processado é ordenado uma vez por essas colunas e as
+    # análises por UF, município, sexo e ano usam reduções por segmento (None mantém a ordem do arquivo).
+    # Exemplo: ['ano', 'sigla_uf', 'id_municipio', 'cbo_2002', 'sexo']
+    CLUSTER_KEY = None
+
+    # Lê os dados do armazenamento particionado por ano (alimentado por ingest.py) em vez do CSV
+    USE_PARTITIONS = False
+
+    # Cache dos dados pré-processados em PROCESSED_DATA_PATH
+    CACHE_ENABLED = True
+    CACHE_FORMAT = 'parquet'  # 'parquet' ou 'feather'
+
+    # Memoização dos resultados das análises por impressão digital dos dados, compartilhada entre
+    # o documento e os gráficos (veja src/analysis/memoization.py). Com MEMO_PERSIST, os resultados
+    # também são gravados em MEMO_PATH e reaproveitados entre execuções.
+    MEMO_ENABLED = True
+    MEMO_MAX_ENTRIES = 256
+    MEMO_PERSIST = False
+    MEMO_PATH = PROCESSED_DATA_PATH + 'memo/'
+
+    # Seções do relatório a serem executadas (None para todas). Apenas as colunas
+    # lidas por essas seções são mantidas nos dados pré-processados (o CSV continua
+    # sendo lido por completo, para a remoção de duplicatas pela linha inteira).
+    ANALYSIS_SECTIONS = None
@@ -0,0 +1,156 @@
+import glob
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+from src.config import Config
+
+
+class ProcessedDataCache:
+    """
+    Cache em disco, em formato colunar (Parquet ou Feather), dos dados pré-processados.
+
+    Cada entrada é identificada por uma chave que combina a impressão digital do arquivo
+    bruto com os parâmetros de pré-processamento. Qualquer alteração no arquivo de entrada
+    ou nas regras gera uma nova chave, invalidando automaticamente a entrada anterior.
+    """
+
+    FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+
+    def __init__(self, cache_dir=Config.PROCESSED_DATA_PATH, file_format=Config.CACHE_FORMAT):
+        """
+        Inicializa o cache.
+
+        Parameters:
+            cache_dir (str): Diretório onde as entradas do cache são gravadas.
+            file_format (str): Formato dos arquivos: "parquet" ou "feather".
+
+        Raises:
+            ValueError: Se o formato não for suportado.
+        """
+        if file_format not in self.FORMATS:
+            raise ValueError("O formato do cache deve ser 'parquet' ou 'feather'.")
+        self.cache_dir = cache_dir
+        self.file_format = file_format
+
+    @staticmethod
+    def file_fingerprint(file_path, sample_bytes=1024 ** 2):
+        """
+        Calcula a impressão digital de um arquivo sem precisar lê-lo por inteiro.
+
+        Combina o tamanho, a data de modificação e o hash do primeiro e do último
+        bloco de `sample_bytes` bytes do arquivo.
+
+        Parameters:
+            file_path (str): Caminho do arquivo.
+            sample_bytes (int): Tamanho dos blocos amostrados no início e no fim do arquivo.
+
+        Returns:
+            str: Hash hexadecimal que identifica o conteúdo do arquivo.
+        """
+        stat = os.stat(file_path)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(sample_bytes))
+            if stat.st_size > sample_bytes:
+                f.seek(max(stat.st_size - sample_bytes, sample_bytes))
+                digest.update(f.read(sample_bytes))
+        return digest.hexdigest()
+
+    def key(self, file_paths, params):
+        """
+        Gera a chave de uma entrada a partir do(s) arquivo(s) bruto(s) e dos parâmetros de pré-processamento.
+
+        Parameters:
+            file_paths (str ou list): Caminho do arquivo bruto ou lista de arquivos.
+            params (dict): Parâmetros de pré-processamento (serializáveis em JSON).
+
+        Returns:
+            str: Chave da entrada.
+        """
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        payload = json.dumps(
+            {'arquivo': [self.file_fingerprint(path) for path in file_paths], 'parametros': params},
+            sort_keys=True, default=str
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def path(self, file_path, key):
+        """
+        Retorna o caminho do arquivo de cache para um arquivo bruto e uma chave.
+
+        Parameters:
+            file_path (str): Caminho do arquivo bruto.
+            key (str): Chave da entrada.
+
+        Returns:
+            str: Caminho do arquivo no diretório de cache.
+        """
+        return os.path.join(self.cache_dir, f"{self._stem(file_path)}-{key}{self.FORMATS[self.file_format]}")
+
+    @staticmethod
+    def _stem(file_path):
+        """
+        Nome-base das entradas de um arquivo, diretório ou padrão glob.
+
+        Parameters:
+            file_path (str): Caminho do arquivo bruto, diretório ou padrão glob.
+
+        Returns:
+            str: Nome-base sem extensão e sem caracteres especiais.
+        """
+        name = os.path.basename(os.path.normpath(file_path)).split('.')[0]
+        return re.sub(r'[^\w-]', '_', name) or 'dados'
+
+    def load(self, file_path, key):
+        """
+        Carrega uma entrada do cache.
+
+        Parameters:
+            file_path (str): Caminho do arquivo bruto.
+            key (str): Chave da entrada.
+
+        Returns:
+            pd.DataFrame ou None: Dados pré-processados, ou None se a entrada não existir.
+        """
+        path = self.path(file_path, key)
+        if not os.path.exists(path):
+            return None
+        if self.file_format == 'parquet':
+            return pd.read_parquet(path)
+        return pd.read_feather(path)
+
+    def save(self, file_path, key, df):
+        """
+        Grava uma entrada no cache, removendo entradas antigas do mesmo arquivo bruto.
+
+        Parameters:
+            file_path (str): Caminho do arquivo bruto.
+            key (str): Chave da entrada.
+            df (pd.DataFrame): Dados pré-processados.
+
+        Returns:
+            str: Caminho do arquivo gravado.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(file_path, key)
+
+        # Entradas anteriores do mesmo arquivo foram invalidadas pela nova chave
+        pattern = f"{glob.escape(self._stem(file_path))}-{'[0-9a-f]' * 32}{self.FORMATS[self.file_format]}"
+        for old_path in glob.glob(os.path.join(self.cache_dir, pattern)):
+            if old_path != path:
+                os.remove(old_path)
+
+        # Grava em um arquivo temporário para não deixar entradas incompletas
+        tmp_path = path + '.tmp'
+        if self.file_format == 'parquet':
+            df.to_parquet(tmp_path)
+        else:
+            # O Feather exige um índice padrão
+            df.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, path)
+        return path
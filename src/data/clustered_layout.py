@@ -0,0 +1,248 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+
+class ClusteredLayout:
+    """
+    Disposição física do conjunto pré-processado ordenado por uma chave de agrupamento.
+
+    Com os registros ordenados por uma chave (por exemplo, ano, sigla_uf, id_municipio e cbo_2002),
+    as linhas de cada grupo de um prefixo da chave formam um trecho contíguo. Os limites dos
+    trechos são calculados uma única vez por nível, comparando linhas vizinhas (sem hash), e
+    permitem:
+
+    - Reduções por segmento (`segment_groupby`): somas e contagens de cada trecho com
+      `np.add.reduceat`, agrupando depois apenas os poucos trechos pelo rótulo, em vez de um
+      `groupby` por hash sobre todas as linhas.
+    - Filtros por faixa na chave (`locate`): busca binária no trecho já ordenado, devolvendo
+      uma fatia contígua sem percorrer o DataFrame.
+
+    As disposições são registradas por objeto (`register`), de modo que apenas o DataFrame
+    ordenado pelo `DataLoader` é tratado como agrupado; cópias reordenadas ou filtradas voltam
+    ao `groupby` comum.
+    """
+
+    # DataFrames agrupados: id -> disposição (que guarda uma referência fraca ao DataFrame)
+    _registry = {}
+
+    # Agregações atendidas por segmentos
+    AGGREGATIONS = ('mean', 'sum', 'count')
+
+    def __init__(self, df, key):
+        """
+        Parameters:
+            df (pd.DataFrame): Dados já ordenados pela chave.
+            key (list): Colunas da chave de agrupamento, da mais externa para a mais interna.
+        """
+        self._df = weakref.ref(df)
+        self.key = list(key)
+        self._starts = {}  # nível -> início de cada trecho
+
+    @property
+    def df(self):
+        return self._df()
+
+    @classmethod
+    def cluster(cls, df, key):
+        """
+        Ordena os dados pela chave de agrupamento e registra a disposição.
+
+        Colunas da chave ausentes no DataFrame (por causa da projeção de colunas) são ignoradas.
+        As categorias das colunas categóricas da chave são ordenadas antes, para que a ordem dos
+        códigos coincida com a dos valores (necessário nas buscas por faixa de `locate`).
+
+        Parameters:
+            df (pd.DataFrame): Dados pré-processados.
+            key (list): Colunas da chave de agrupamento.
+
+        Returns:
+            pd.DataFrame: Dados ordenados (estável), com índice reiniciado.
+        """
+        key = [col for col in key if col in df.columns]
+        if not key:
+            return df
+        unsorted = {
+            col: df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+            for col in key
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and not df[col].cat.categories.is_monotonic_increasing
+        }
+        if unsorted:
+            df = df.assign(**unsorted)
+        df = df.sort_values(key, kind='stable', na_position='last', ignore_index=True)
+        cls.register(df, key)
+        return df
+
+    @classmethod
+    def register(cls, df, key):
+        """
+        Registra um DataFrame já ordenado pela chave (por exemplo, lido do cache).
+
+        Returns:
+            ClusteredLayout: Disposição registrada.
+        """
+        key = [col for col in key if col in df.columns]
+        layout = cls(df, key)
+        cls._registry[id(df)] = layout
+        weakref.finalize(df, cls._registry.pop, id(df), None)
+        return layout
+
+    @classmethod
+    def of(cls, df):
+        """
+        Disposição registrada para o DataFrame.
+
+        Returns:
+            ClusteredLayout ou None: A disposição, ou None se o DataFrame não estiver agrupado.
+        """
+        layout = cls._registry.get(id(df))
+        return layout if layout is not None and layout.df is df else None
+
+    @staticmethod
+    def _sort_codes(series):
+        """
+        Valores da coluna em um array NumPy ordenável, com ausentes no fim.
+
+        Returns:
+            np.ndarray: Códigos das categorias (ausentes viram o maior código) ou os próprios valores.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            return np.where(codes < 0, len(series.cat.categories), codes)
+        if pd.api.types.is_numeric_dtype(series):
+            return series.to_numpy(dtype='float64', na_value=np.nan)
+        return series.to_numpy()
+
+    def starts(self, level):
+        """
+        Início de cada trecho do prefixo `key[:level + 1]`, calculado uma vez por nível.
+
+        Parameters:
+            level (int): Nível na chave (0 para a coluna mais externa).
+
+        Returns:
+            np.ndarray: Posições em que algum dos valores do prefixo muda.
+        """
+        if level not in self._starts:
+            df = self.df
+            change = np.zeros(len(df), dtype=bool)
+            if len(df):
+                change[0] = True
+            for col in self.key[:level + 1]:
+                values = self._sort_codes(df[col])
+                differs = values[1:] != values[:-1]
+                if values.dtype.kind in 'fO':
+                    # NaN != NaN: ausentes vizinhos pertencem ao mesmo trecho
+                    missing = pd.isna(values)
+                    differs &= ~(missing[1:] & missing[:-1])
+                change[1:] |= differs
+            self._starts[level] = np.flatnonzero(change)
+        return self._starts[level]
+
+    def segment_aggregate(self, by, column):
+        """
+        Contagem e soma de `column` por valor de `by`, a partir dos trechos da chave.
+
+        Parameters:
+            by (str): Coluna da chave de agrupamento.
+            column (str): Coluna numérica a ser reduzida.
+
+        Returns:
+            pd.DataFrame: Colunas "count" (valores não ausentes) e "sum", indexadas por `by`.
+        """
+        df = self.df
+        starts = self.starts(self.key.index(by))
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series) and not series.hasnans:
+            values = series.to_numpy(dtype='int64')
+            counts = np.diff(np.append(starts, len(df)))
+            sums = np.add.reduceat(values, starts) if len(starts) else values[:0]
+        else:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            valid = ~np.isnan(values)
+            counts = np.add.reduceat(valid.astype('int64'), starts) if len(starts) else np.zeros(0, 'int64')
+            sums = np.add.reduceat(np.where(valid, values, 0.0), starts) if len(starts) else values[:0]
+
+        # Um mesmo rótulo pode ocupar vários trechos (níveis internos); só os trechos são agrupados
+        segments = pd.DataFrame({'count': counts, 'sum': sums})
+        labels = df[by].iloc[starts].reset_index(drop=True)
+        return segments.groupby(labels, observed=True, sort=True).sum()
+
+    def locate(self, **conditions):
+        """
+        Seleciona, por busca binária, a fatia contígua que atende às condições sobre a chave.
+
+        As condições devem seguir a ordem da chave a partir da coluna mais externa (por exemplo,
+        ano e depois sigla_uf); a busca para na primeira coluna da chave sem condição.
+
+        Parameters:
+            **conditions: Coluna da chave -> valor (igualdade) ou tupla (mínimo, máximo), inclusiva.
+                          Exemplo: locate(ano=(2021, 2023)) ou locate(ano=2023, sigla_uf="PR").
+
+        Returns:
+            tuple: (início, fim) da fatia em posições, e a lista de condições não usadas na busca.
+        """
+        df = self.df
+        start, stop = 0, len(df)
+        used = []
+        for col in self.key:
+            if col not in conditions:
+                break
+            value = conditions[col]
+            low, high = value if isinstance(value, tuple) else (value, value)
+            series = df[col].iloc[start:stop]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categories = series.cat.categories
+                if not isinstance(value, tuple):
+                    # Código exato do valor (-1, e uma fatia vazia, se ele não estiver no dicionário)
+                    low = high = categories.get_indexer([value])[0]
+                elif categories.is_monotonic_increasing:
+                    low = categories.searchsorted(low, side='left')
+                    high = categories.searchsorted(high, side='right') - 1
+                else:
+                    # Faixa sobre categorias fora de ordem: a condição fica para o filtro comum
+                    break
+            values = self._sort_codes(series)
+            offset = start
+            start = offset + int(np.searchsorted(values, low, side='left'))
+            stop = offset + int(np.searchsorted(values, high, side='right'))
+            stop = max(start, stop)
+            used.append(col)
+            if isinstance(value, tuple):
+                # Depois de uma faixa, as colunas internas não estão mais ordenadas na fatia
+                break
+        return (start, stop), [col for col in conditions if col not in used]
+
+
+def segment_groupby(df, by, column, agg):
+    """
+    Equivalente a `df.groupby(by, observed=True)[column].agg(agg)`, por segmentos quando possível.
+
+    Se o DataFrame estiver registrado em um `ClusteredLayout` com `by` na chave, a agregação usa
+    as reduções por segmento; caso contrário, usa o `groupby` do Pandas.
+
+    Parameters:
+        df (pd.DataFrame): Dados.
+        by (str): Coluna de agrupamento.
+        column (str): Coluna agregada.
+        agg (str ou list): "mean", "sum", "count" ou uma lista delas.
+
+    Returns:
+        pd.Series ou pd.DataFrame: Série (para uma agregação) ou DataFrame (para uma lista), indexados por `by`.
+    """
+    layout = ClusteredLayout.of(df)
+    names = [agg] if isinstance(agg, str) else list(agg)
+    if layout is None or by not in layout.key or not set(names) <= set(ClusteredLayout.AGGREGATIONS):
+        return df.groupby(by, observed=True)[column].agg(agg)
+
+    parts = layout.segment_aggregate(by, column)
+    counts = parts['count']
+    results = {
+        'count': counts,
+        'sum': parts['sum'],
+        'mean': parts['sum'] / counts.where(counts > 0),
+    }
+    if isinstance(agg, str):
+        return results[agg].rename(column)
+    return pd.DataFrame({name: results[name] for name in names})
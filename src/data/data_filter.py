@@ -1,16 +1,436 @@
+import numpy as np
+import pandas as pd
+from src.data.clustered_layout import ClusteredLayout
+from src.data.filter_index import FilterIndex
+
+
 class DataFilter:
-    def __init__(self, df):
+    # Predicados aceitos em `filters` (veja `normalize_filters`), equivalentes ao WHERE da consulta do README:
+    # - "cbo": prefixos de códigos CBO (exemplo: ["2123", "2124"])
+    # - "age": faixa etária inclusiva (mínimo, máximo)
+    # - "state": sigla de uma UF ou lista de siglas
+    PREDICATES = ('cbo', 'age', 'state')
+
+    def __init__(self, df, index=None):
+        """
+        Parameters:
+            df (pd.DataFrame): Dados a serem filtrados.
+            index (FilterIndex, optional): Índice pré-construído de `df`. Quando informado, os filtros
+                                           são resolvidos pelo índice em vez de percorrer as colunas.
+        """
         self.df = df
+        self.index = index
+
+    def build_index(self):
+        """Constrói o índice dos dados (veja `FilterIndex`) e o usa nos filtros seguintes."""
+        self.index = FilterIndex(self.df)
+        return self
 
     def filter_by_cbo(self, cbo_list):
         """Filtra os dados com base nos códigos CBO."""
-        return self.df[self.df['cbo_2002'].astype(str).str.startswith(tuple(cbo_list))]
+        return self.cbo(cbo_list).collect()
 
     def filter_by_age(self, min_age, max_age):
         """Filtra os dados com base na faixa etária."""
-        return self.df[(self.df['idade'] >= min_age) & (self.df['idade'] <= max_age)]
+        return self.age(min_age, max_age).collect()
 
     def filter_by_state(self, state_code):
         """Filtra os dados por estado."""
-        return self.df[self.df['sigla_uf'] == state_code]
+        return self.state(state_code).collect()
+
+    def select(self, **predicates):
+        """
+        Filtra combinando predicados: E entre dimensões e OU entre os valores de uma mesma dimensão.
+
+        Com índice, os predicados são resolvidos por operações de conjunto sobre as listas de
+        posições (veja `FilterIndex.select`); sem índice, por uma única máscara combinada.
+
+        Parameters:
+            **predicates: Dimensões de `FilterIndex.COLUMNS` ("state", "municipality", "sex", "year",
+                          "age", "cbo" e "occupation") e seus valores.
+                          Exemplo: select(cbo=["2123", "2124"], age=(18, 30), state="PR", sex="Feminino").
+
+        Returns:
+            pd.DataFrame: Registros que atendem a todos os predicados.
+        """
+        return self.where(**predicates).collect()
+
+    def where(self, **predicates):
+        """
+        Inicia uma expressão de filtro preguiçosa (veja `FilterExpression`).
+
+        Parameters:
+            **predicates: Predicados iniciais, como em `select`.
+
+        Returns:
+            FilterExpression: Plano com os predicados, ainda não avaliado.
+        """
+        return FilterExpression(self, tuple(predicates.items()))
+
+    def cbo(self, cbo_list):
+        """Inicia uma expressão preguiçosa filtrando por prefixos CBO."""
+        return self.where().cbo(cbo_list)
+
+    def age(self, min_age, max_age):
+        """Inicia uma expressão preguiçosa filtrando pela faixa etária."""
+        return self.where().age(min_age, max_age)
+
+    def state(self, state_code):
+        """Inicia uma expressão preguiçosa filtrando por UF."""
+        return self.where().state(state_code)
+
+    def municipality(self, municipality_id):
+        """Inicia uma expressão preguiçosa filtrando por município."""
+        return self.where().municipality(municipality_id)
+
+    def sex(self, sex):
+        """Inicia uma expressão preguiçosa filtrando por sexo."""
+        return self.where().sex(sex)
+
+    def year(self, year):
+        """Inicia uma expressão preguiçosa filtrando por ano."""
+        return self.where().year(year)
+
+    def occupation(self, occupation):
+        """Inicia uma expressão preguiçosa filtrando pela descrição da ocupação (CBO)."""
+        return self.where().occupation(occupation)
+
+    @classmethod
+    def predicate_mask(cls, df, name, value):
+        """
+        Máscara de um predicado sobre uma dimensão de `FilterIndex.COLUMNS`.
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+            name (str): Dimensão ("state", "municipality", "sex", "year", "age", "cbo" ou "occupation").
+            value: Valor do predicado ("cbo": prefixos; "age": (mínimo, máximo); demais: valor ou lista).
+
+        Returns:
+            np.ndarray: Máscara booleana.
+
+        Raises:
+            ValueError: Se a dimensão não for conhecida.
+        """
+        if name not in FilterIndex.COLUMNS:
+            raise ValueError(f"Dimensão desconhecida: {name}. Use: {list(FilterIndex.COLUMNS)}.")
+        series = df[FilterIndex.COLUMNS[name]]
+        if name == 'cbo':
+            return cls.cbo_mask(series, value)
+        if name == 'age':
+            return cls.age_mask(series, *value)
+        return cls.value_mask(series, value)
+
+    @staticmethod
+    def cbo_mask(series, cbo_list):
+        """
+        Máscara dos registros cujo código CBO começa com algum dos prefixos.
+
+        Em colunas categóricas, o prefixo é testado apenas uma vez por categoria.
+
+        Parameters:
+            series (pd.Series): Coluna `cbo_2002`.
+            cbo_list (list): Prefixos de códigos CBO.
+
+        Returns:
+            np.ndarray: Máscara booleana.
+        """
+        prefixes = tuple(str(cbo) for cbo in cbo_list)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            matches = series.cat.categories.astype(str).str.startswith(prefixes)
+            # O código -1 (valor ausente) aponta para o último elemento, que é False
+            return np.append(matches, False)[series.cat.codes.to_numpy()]
+        return series.astype(str).str.startswith(prefixes).to_numpy(dtype=bool)
+
+    @staticmethod
+    def age_mask(series, min_age, max_age):
+        """
+        Máscara dos registros com idade na faixa inclusiva [min_age, max_age].
+
+        Parameters:
+            series (pd.Series): Coluna `idade`.
+            min_age (int): Idade mínima.
+            max_age (int): Idade máxima.
+
+        Returns:
+            np.ndarray: Máscara booleana (idades ausentes ficam fora da faixa).
+        """
+        return ((series >= min_age) & (series <= max_age)).fillna(False).to_numpy(dtype=bool)
+
+    @staticmethod
+    def value_mask(series, values):
+        """
+        Máscara dos registros com um valor ou com qualquer valor de uma lista.
+
+        Parameters:
+            series (pd.Series): Coluna a ser comparada.
+            values: Um valor ou uma lista de valores.
+
+        Returns:
+            np.ndarray: Máscara booleana.
+        """
+        if isinstance(values, str) or not np.iterable(values):
+            return (series == values).fillna(False).to_numpy(dtype=bool)
+        return series.isin(values).to_numpy(dtype=bool)
+
+    @classmethod
+    def state_mask(cls, series, state_code):
+        """
+        Máscara dos registros de uma UF ou de uma lista de UFs.
+
+        Parameters:
+            series (pd.Series): Coluna `sigla_uf`.
+            state_code (str ou list): Sigla da UF ou lista de siglas.
+
+        Returns:
+            np.ndarray: Máscara booleana.
+        """
+        return cls.value_mask(series, state_code)
+
+    @classmethod
+    def normalize_filters(cls, filters):
+        """
+        Valida e normaliza uma especificação de filtros.
+
+        A forma normalizada é serializável em JSON e não depende da ordem em que os
+        prefixos ou as UFs foram informados, de modo que pode compor chaves de cache.
+
+        Parameters:
+            filters (dict ou None): Mapeamento predicado -> valor (veja `PREDICATES`).
+                                    Exemplo: {"cbo": ["2123", "2124"], "age": (18, 64), "state": "PR"}.
+
+        Returns:
+            dict ou None: Filtros normalizados, ou None quando não há filtros.
+
+        Raises:
+            ValueError: Se houver um predicado desconhecido ou uma faixa etária inválida.
+        """
+        if not filters:
+            return None
+        unknown = set(filters) - set(cls.PREDICATES)
+        if unknown:
+            raise ValueError(f"Filtros desconhecidos: {sorted(unknown)}. Use: {list(cls.PREDICATES)}.")
+
+        normalized = {}
+        if filters.get('cbo') is not None:
+            normalized['cbo'] = sorted({str(cbo) for cbo in filters['cbo']})
+        if filters.get('age') is not None:
+            min_age, max_age = filters['age']
+            if min_age > max_age:
+                raise ValueError("A idade mínima deve ser menor ou igual à idade máxima.")
+            normalized['age'] = [int(min_age), int(max_age)]
+        if filters.get('state') is not None:
+            state = filters['state']
+            normalized['state'] = [state] if isinstance(state, str) else sorted(set(state))
+        return normalized or None
+
+    @classmethod
+    def build_mask(cls, df, filters):
+        """
+        Combina os predicados de uma especificação de filtros em uma única máscara.
+
+        Usado pelo `DataLoader` para aplicar os filtros a cada bloco durante a leitura,
+        antes de os registros descartados serem copiados.
+
+        Parameters:
+            df (pd.DataFrame): Dados (o arquivo inteiro ou um bloco dele).
+            filters (dict): Filtros normalizados por `normalize_filters`.
+
+        Returns:
+            np.ndarray: Máscara booleana dos registros que atendem a todos os predicados.
+        """
+        mask = np.ones(len(df), dtype=bool)
+        if 'cbo' in filters:
+            mask &= cls.cbo_mask(df['cbo_2002'], filters['cbo'])
+        if 'age' in filters:
+            mask &= cls.age_mask(df['idade'], *filters['age'])
+        if 'state' in filters:
+            mask &= cls.state_mask(df['sigla_uf'], filters['state'])
+        return mask
+
+
+class FilterExpression:
+    """
+    Expressão de filtro preguiçosa e componível sobre um `DataFilter`.
+
+    Cada método acrescenta um predicado ao plano e devolve uma nova expressão, sem avaliar nada:
+
+        DataFilter(df).cbo(["2123", "2124"]).age(18, 30).state("PR")
+
+    A avaliação acontece uma única vez, em `mask`, `rows` ou `collect`: sem índice, todos os
+    predicados são combinados em uma única máscara (sem cópias intermediárias do DataFrame); com
+    índice (`DataFilter.build_index`), por operações de conjunto sobre as listas de posições.
+    Em dados agrupados (`ClusteredLayout`), os predicados sobre a chave de agrupamento viram uma
+    busca binária e os demais são avaliados apenas na fatia encontrada.
+    Predicados encadeados são combinados com E; listas de valores em um mesmo predicado, com OU.
+    """
+
+    # Tamanho da amostra usada em `explain` para estimar a seletividade quando não há índice
+    SAMPLE_SIZE = 10_000
+
+    def __init__(self, source, predicates=()):
+        """
+        Parameters:
+            source (DataFilter): Dados (e índice, se houver) sobre os quais o plano é avaliado.
+            predicates (tuple): Pares (dimensão, valor) já incluídos no plano.
+        """
+        self.source = source
+        self.predicates = tuple(predicates)
+
+    def _add(self, name, value):
+        """Nova expressão com um predicado a mais."""
+        return FilterExpression(self.source, self.predicates + ((name, value),))
+
+    def cbo(self, cbo_list):
+        """Acrescenta um filtro por prefixos CBO (2, 4 ou 6 dígitos)."""
+        return self._add('cbo', tuple(str(cbo) for cbo in cbo_list))
+
+    def age(self, min_age, max_age):
+        """Acrescenta um filtro pela faixa etária inclusiva [min_age, max_age]."""
+        return self._add('age', (min_age, max_age))
+
+    def state(self, state_code):
+        """Acrescenta um filtro por UF (sigla ou lista de siglas)."""
+        return self._add('state', state_code)
+
+    def municipality(self, municipality_id):
+        """Acrescenta um filtro por município (código ou lista de códigos)."""
+        return self._add('municipality', municipality_id)
+
+    def sex(self, sex):
+        """Acrescenta um filtro por sexo."""
+        return self._add('sex', sex)
+
+    def year(self, year):
+        """Acrescenta um filtro por ano (um ano ou lista de anos)."""
+        return self._add('year', year)
+
+    def occupation(self, occupation):
+        """Acrescenta um filtro pela descrição da ocupação (uma descrição ou lista de descrições)."""
+        return self._add('occupation', occupation)
+
+    def mask(self):
+        """
+        Avalia o plano como uma única máscara booleana.
+
+        Returns:
+            np.ndarray: Máscara dos registros que atendem a todos os predicados.
+        """
+        df = self.source.df
+        if self.source.index is not None:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[self.rows()] = True
+            return mask
+
+        (start, stop), predicates = self._clustered_range()
+        mask = np.zeros(len(df), dtype=bool)
+        subset = df.iloc[start:stop]
+        selected = np.ones(stop - start, dtype=bool)
+        for name, value in predicates:
+            selected &= DataFilter.predicate_mask(subset, name, value)
+        mask[start:stop] = selected
+        return mask
+
+    def _clustered_range(self):
+        """
+        Resolve por busca binária os predicados sobre a chave de agrupamento, quando houver.
+
+        Apenas igualdades simples e a faixa etária são usadas na busca; listas de valores e
+        prefixos CBO são avaliados normalmente na fatia.
+
+        Returns:
+            tuple: ((início, fim) da fatia, predicados restantes).
+        """
+        df = self.source.df
+        layout = ClusteredLayout.of(df)
+        if layout is None:
+            return (0, len(df)), list(self.predicates)
+
+        names = [name for name, _ in self.predicates]
+        conditions = {}
+        for name, value in self.predicates:
+            if name == 'cbo' or names.count(name) > 1:
+                continue
+            if name == 'age':
+                conditions[FilterIndex.COLUMNS[name]] = tuple(value)
+            elif isinstance(value, str) or not np.iterable(value):
+                conditions[FilterIndex.COLUMNS.get(name, name)] = value
+        (start, stop), unused = layout.locate(**conditions)
+        resolved = set(conditions) - set(unused)
+        predicates = [(name, value) for name, value in self.predicates
+                      if not (name != 'cbo' and FilterIndex.COLUMNS.get(name) in resolved)]
+        return (start, stop), predicates
+
+    def rows(self):
+        """
+        Avalia o plano como posições de linhas, sem materializar os registros.
+
+        Returns:
+            np.ndarray: Posições (para `df.iloc`) dos registros selecionados, em ordem crescente.
+        """
+        index = self.source.index
+        if index is None:
+            return np.flatnonzero(self.mask())
+        parts = [self._index_rows(name, value) for name, value in self.predicates]
+        return FilterIndex.intersect(*parts) if parts else np.arange(index.size)
+
+    def _index_rows(self, name, value):
+        """Posições de um predicado resolvidas pelo índice."""
+        return self.source.index.select(**{name: value})
+
+    def collect(self):
+        """
+        Materializa os registros selecionados.
+
+        Cada chamada devolve um novo DataFrame, que pode ser modificado sem afetar a origem
+        nem as chamadas seguintes.
+
+        Returns:
+            pd.DataFrame: Registros que atendem a todos os predicados.
+        """
+        df = self.source.df
+        if self.source.index is not None:
+            return df.iloc[self.rows()]
+        return df[self.mask()]
+
+    def count(self):
+        """Número de registros selecionados."""
+        return len(self.rows())
+
+    def selectivity(self):
+        """
+        Seletividade de cada predicado: exata com índice, estimada em uma amostra sem índice.
+
+        Returns:
+            list: Frações (0 a 1) de registros que atendem a cada predicado, na ordem do plano.
+        """
+        df = self.source.df
+        if not len(df):
+            return [0.0 for _ in self.predicates]
+        if self.source.index is not None:
+            return [len(self._index_rows(name, value)) / len(df) for name, value in self.predicates]
+
+        size = min(len(df), self.SAMPLE_SIZE)
+        positions = np.sort(np.random.default_rng(0).choice(len(df), size=size, replace=False))
+        sample = df.iloc[positions]
+        return [DataFilter.predicate_mask(sample, name, value).mean() for name, value in self.predicates]
+
+    def explain(self):
+        """
+        Descreve o plano com a seletividade de cada predicado e o total estimado.
+
+        O total combina as seletividades supondo predicados independentes.
+
+        Returns:
+            str: Descrição do plano, uma linha por predicado.
+        """
+        total_rows = len(self.source.df)
+        exact = self.source.index is not None
+        origin = "exata (índice)" if exact else f"estimada (amostra de até {self.SAMPLE_SIZE} registros)"
+        lines = [f"FilterExpression sobre {total_rows} registros; seletividade {origin}"]
 
+        combined = 1.0
+        for (name, value), fraction in zip(self.predicates, self.selectivity()):
+            combined *= fraction
+            lines.append(f"  E {name} = {value!r}: {fraction:.2%} (~{round(fraction * total_rows)} registros)")
+        lines.append(f"  Total estimado: {combined:.2%} (~{round(combined * total_rows)} registros)")
+        return "\n".join(lines)
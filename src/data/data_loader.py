@@ -1,28 +1,463 @@
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from src.config import Config
+from src.data.cache import ProcessedDataCache
+from src.data.clustered_layout import ClusteredLayout
+from src.data.data_filter import DataFilter
+from src.data.deduplication import HashDeduplicator
+from src.data.quantile_sketch import KLLSketch
+from src.data.schema import (
+    build_dtypes, build_arrow_types, fill_missing, title_case, remove_unused_categories,
+    sort_categories, concat_frames, memory_usage_report
+)
+
+# Pacote dos módulos do pré-processamento, cujo código-fonte compõe a chave do cache de dados processados
+DATA_PACKAGE = os.path.dirname(os.path.abspath(__file__))
 
 
 class DataLoader:
     """
     Classe responsável por carregar, limpar e pré-processar os dados de um arquivo CSV.
+
+    Também aceita um diretório ou um padrão glob com vários extratos (por exemplo, um arquivo
+    por UF e ano), que são lidos e pré-processados em paralelo.
     """
 
-    def __init__(self, file_path):
+    # Extensões consideradas quando `file_path` é um diretório
+    FILE_PATTERNS = ['*.csv', '*.csv.gz', '*.csv.zst']
+
+    # Compressões descompactadas em fluxo durante a leitura
+    COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+    # Leitores de CSV: "c" (leitor padrão do Pandas) ou "pyarrow" (leitor multithread do Arrow)
+    ENGINES = ['c', 'pyarrow']
+
+    # Colunas sem as quais um registro é descartado no pré-processamento
+    PREPROCESSING_COLUMNS = ['cbo_2002', 'valor_remuneracao_media', 'idade', 'sigla_uf']
+
+    # Colunas convertidas para numéricas e faixa etária válida
+    NUMERIC_COLUMNS = ['valor_remuneracao_media', 'idade', 'tempo_emprego']
+    AGE_RANGE = (18, 64)
+
+    # Linhas por bloco quando há filtros ou projeção de colunas e `chunksize` não foi informado, para
+    # que os registros descartados e as colunas não pedidas nunca sejam materializados juntos
+    FILTER_CHUNK_SIZE = 500_000
+
+    def __init__(self, file_path, use_schema=Config.USE_SCHEMA, float32=Config.FLOAT32_SALARIES, columns=None,
+                 chunksize=Config.CHUNK_SIZE, outlier_method=Config.OUTLIER_METHOD, max_workers=Config.MAX_WORKERS,
+                 engine=Config.CSV_ENGINE, filters=Config.ROW_FILTERS, cluster_key=Config.CLUSTER_KEY):
         """
         Inicializa a instância da classe com o caminho do arquivo.
 
         Parameters:
-            file_path (str): Caminho para o arquivo CSV.
+            file_path (str): Caminho para o arquivo CSV (opcionalmente compactado como .csv.gz ou
+                             .csv.zst), para um diretório com arquivos CSV ou um padrão glob
+                             (exemplo: "data/raw/rais_*_2023.csv").
+            use_schema (bool): Se True, aplica o esquema tipado da RAIS na leitura
+                               (categorias para textos de baixa cardinalidade e inteiros pequenos
+                               para códigos). Se False, mantém a inferência padrão do Pandas.
+            float32 (bool): Se True, carrega salários e tempo de emprego como float32.
+            columns (list, optional): Colunas mantidas nos dados (exemplo: o resultado de
+                                      `src.analysis.sections.required_columns`). As colunas exigidas
+                                      pelo pré-processamento são sempre incluídas. Se None, mantém todas.
+                                      `load_data` lê apenas essas colunas. No pré-processamento, cada
+                                      bloco é lido com todas as colunas e projetado depois das regras por
+                                      registro, para que as duplicatas sejam comparadas pela linha completa:
+                                      a projeção reduz a memória do resultado, mas não o tempo de leitura.
+            chunksize (int, optional): Se informado, `load_preprocessed_data` lê e pré-processa o CSV
+                                       em blocos com esse número de linhas (veja `preprocess_in_chunks`).
+            outlier_method (str): Cálculo dos quartis na remoção de outliers: "exact" ou "sketch"
+                                  (veja `outlier_bounds`).
+            max_workers (int, optional): Número de processos usados com vários arquivos.
+                                         Se None, usa o número de CPUs.
+            engine (str): Leitor de CSV: "c" (padrão do Pandas, uma thread) ou "pyarrow"
+                          (leitor do Arrow, que usa várias threads).
+            filters (dict, optional): Filtros aplicados a cada bloco durante a leitura, antes das demais
+                                      regras (veja `DataFilter.normalize_filters`). Exemplo, equivalente
+                                      ao WHERE da consulta do README:
+                                      {"cbo": ["2123", "2124"], "age": (18, 64), "state": "PR"}.
+            cluster_key (list, optional): Chave de agrupamento pela qual `load_preprocessed_data` ordena
+                                          o resultado (veja `ClusteredLayout`). Se None, mantém a ordem do arquivo.
+
+        Raises:
+            FileNotFoundError: Se o diretório ou o padrão glob não contiver nenhum arquivo.
+            ValueError: Se o leitor não for "c" ou "pyarrow" ou se os filtros forem inválidos.
         """
+        if engine not in self.ENGINES:
+            raise ValueError("O leitor de CSV deve ser 'c' ou 'pyarrow'.")
         self.file_path = file_path
+        self.use_schema = use_schema
+        self.float32 = float32
+        self.columns = columns
+        self.chunksize = chunksize
+        self.outlier_method = outlier_method
+        self.max_workers = max_workers
+        self.engine = engine
+        self.filters = DataFilter.normalize_filters(filters)
+        self.cluster_key = list(cluster_key) if cluster_key else None
+        self.duplicates_removed = None  # Preenchido pelo pré-processamento
+        self.file_paths = self.resolve_files(file_path)
+
+    @classmethod
+    def resolve_files(cls, file_path):
+        """
+        Expande um diretório ou padrão glob na lista de arquivos a serem lidos.
+
+        Parameters:
+            file_path (str): Caminho de um arquivo, de um diretório ou padrão glob.
+
+        Returns:
+            list: Caminhos dos arquivos, em ordem alfabética.
+
+        Raises:
+            FileNotFoundError: Se o diretório ou o padrão não contiver nenhum arquivo.
+        """
+        if os.path.isdir(file_path):
+            files = [path for pattern in cls.FILE_PATTERNS for path in glob.glob(os.path.join(file_path, pattern))]
+        elif glob.has_magic(file_path):
+            files = glob.glob(file_path)
+        else:
+            return [file_path]
+
+        if not files:
+            raise FileNotFoundError(f"Nenhum arquivo encontrado em: {file_path}")
+        return sorted(files)
+
+    def _options(self):
+        """
+        Opções da instância, usadas para recriar o carregador de cada arquivo nos processos paralelos.
+
+        Returns:
+            dict: Parâmetros do construtor, exceto o caminho.
+        """
+        return {
+            'use_schema': self.use_schema,
+            'float32': self.float32,
+            'columns': self.columns,
+            'chunksize': self.chunksize,
+            'outlier_method': self.outlier_method,
+            'engine': self.engine,
+            'filters': self.filters,
+        }
+
+    def _map_files(self, func):
+        """
+        Aplica uma função a cada arquivo em um pool de processos.
+
+        Parameters:
+            func (callable): Função de nível de módulo que recebe (caminho, opções).
+
+        Returns:
+            list: Resultados na ordem dos arquivos.
+        """
+        options = self._options()
+        workers = min(self.max_workers or os.cpu_count() or 1, len(self.file_paths))
+        if workers <= 1:
+            return [func(path, options) for path in self.file_paths]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, self.file_paths, [options] * len(self.file_paths)))
+
+    @classmethod
+    def _open(cls, file_path):
+        """
+        Abre um arquivo para leitura em fluxo, descompactando .gz e .zst durante a leitura.
+
+        Parameters:
+            file_path (str): Caminho do arquivo.
+
+        Returns:
+            pa.NativeFile: Fluxo de leitura do conteúdo descompactado.
+        """
+        compression = cls.COMPRESSIONS.get(os.path.splitext(file_path)[1])
+        return pa.input_stream(file_path, compression=compression)
+
+    def _selected_columns(self):
+        """
+        Colunas a serem lidas do CSV.
+
+        Returns:
+            set ou None: Colunas da projeção mais as do pré-processamento, ou None para todas.
+        """
+        if self.columns is None:
+            return None
+        return set(self.columns) | set(self.PREPROCESSING_COLUMNS)
+
+    def _read_csv(self, typed=True, chunksize=None, file_path=None, project=True):
+        """
+        Lê um CSV aplicando a projeção de colunas e, opcionalmente, o esquema tipado.
+
+        Parameters:
+            typed (bool): Se True, aplica o esquema tipado da RAIS.
+            chunksize (int, optional): Se informado, retorna um iterador de blocos com esse número de linhas.
+            file_path (str, optional): Arquivo a ser lido. Se None, usa o primeiro arquivo da instância.
+            project (bool): Se False, lê todas as colunas mesmo com `columns` (usado no pré-processamento).
+
+        Returns:
+            pd.DataFrame ou Iterator[pd.DataFrame]: Dados lidos do arquivo.
+        """
+        file_path = file_path or self.file_paths[0]
+        if self.engine == 'pyarrow':
+            if chunksize:
+                return self._iter_csv_arrow(file_path, typed, chunksize, project)
+            return self._read_csv_arrow(file_path, typed, project)
+
+        kwargs = {'low_memory': False}
+        if typed:
+            kwargs['dtype'] = build_dtypes(self.float32)
+        selected = self._selected_columns() if project else None
+        if selected is not None:
+            # Colunas ausentes no arquivo são ignoradas em vez de gerar erro
+            kwargs['usecols'] = lambda col: col in selected
+
+        if os.path.splitext(file_path)[1] not in self.COMPRESSIONS:
+            return pd.read_csv(file_path, chunksize=chunksize, **kwargs)
+        if chunksize:
+            return self._iter_compressed_csv(file_path, chunksize, kwargs)
+        with self._open(file_path) as source:
+            return pd.read_csv(source, **kwargs)
+
+    def _iter_compressed_csv(self, file_path, chunksize, kwargs):
+        """
+        Lê um CSV compactado em blocos com o leitor do Pandas, mantendo o arquivo aberto durante a iteração.
+
+        Parameters:
+            file_path (str): Caminho do arquivo compactado.
+            chunksize (int): Número de linhas por bloco.
+            kwargs (dict): Parâmetros de `pd.read_csv`.
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos de dados.
+        """
+        with self._open(file_path) as source:
+            yield from pd.read_csv(source, chunksize=chunksize, **kwargs)
+
+    def _arrow_options(self, file_path, typed, block_size=None, project=True):
+        """
+        Monta as opções do leitor de CSV do Arrow (projeção de colunas e tipos do esquema).
+
+        Parameters:
+            file_path (str): Caminho do arquivo (o cabeçalho é lido para aplicar a projeção).
+            typed (bool): Se True, aplica os tipos do esquema.
+            block_size (int, optional): Tamanho, em bytes, dos blocos lidos pelo Arrow.
+            project (bool): Se False, lê todas as colunas.
+
+        Returns:
+            tuple: (pa_csv.ReadOptions, pa_csv.ConvertOptions).
+        """
+        read_options = pa_csv.ReadOptions(use_threads=True, **({'block_size': block_size} if block_size else {}))
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+
+        selected = self._selected_columns() if project else None
+        if selected is not None:
+            with self._open(file_path) as source:
+                names = pa_csv.open_csv(source).schema.names
+            convert_options.include_columns = [col for col in names if col in selected]
+        if typed:
+            convert_options.column_types = build_arrow_types(self.float32)
+        return read_options, convert_options
+
+    def _arrow_to_pandas(self, table, typed, start=0):
+        """
+        Converte uma tabela Arrow para DataFrame com os mesmos tipos do leitor do Pandas.
+
+        Parameters:
+            table (pa.Table): Dados lidos pelo Arrow.
+            typed (bool): Se True, converte os códigos para os inteiros anuláveis do esquema e ordena as categorias.
+            start (int): Posição inicial do índice (para blocos consecutivos).
+
+        Returns:
+            pd.DataFrame: Dados convertidos.
+        """
+        if not typed:
+            df = table.to_pandas()
+        else:
+            df = sort_categories(table.unify_dictionaries().to_pandas())
+            dtypes = build_dtypes(self.float32)
+            for col in df.columns:
+                if dtypes.get(col, '').startswith('Int'):
+                    df[col] = df[col].astype(dtypes[col])
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    def _read_csv_arrow(self, file_path, typed, project=True):
+        """
+        Lê um CSV inteiro com o leitor multithread do Arrow.
+
+        Parameters:
+            file_path (str): Caminho do arquivo.
+            typed (bool): Se True, aplica os tipos do esquema.
+            project (bool): Se False, lê todas as colunas.
+
+        Returns:
+            pd.DataFrame: Dados lidos do arquivo.
+        """
+        read_options, convert_options = self._arrow_options(file_path, typed, project=project)
+        with self._open(file_path) as source:
+            table = pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+        return self._arrow_to_pandas(table, typed)
+
+    def _iter_csv_arrow(self, file_path, typed, chunksize, project=True):
+        """
+        Lê um CSV em blocos de `chunksize` linhas com o leitor em fluxo do Arrow.
+
+        Parameters:
+            file_path (str): Caminho do arquivo.
+            typed (bool): Se True, aplica os tipos do esquema.
+            chunksize (int): Número de linhas por bloco.
+            project (bool): Se False, lê todas as colunas.
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos de dados, com índice contínuo entre os blocos.
+        """
+        read_options, convert_options = self._arrow_options(file_path, typed, block_size=1 << 22, project=project)
+        with self._open(file_path) as source:
+            reader = pa_csv.open_csv(source, read_options=read_options, convert_options=convert_options)
+            batches, rows, start = [], 0, 0
+            for batch in reader:
+                batches.append(batch)
+                rows += batch.num_rows
+                while rows >= chunksize:
+                    table = pa.Table.from_batches(batches, schema=reader.schema)
+                    yield self._arrow_to_pandas(table.slice(0, chunksize), typed, start)
+                    start += chunksize
+                    remainder = table.slice(chunksize)
+                    batches, rows = remainder.to_batches(), remainder.num_rows
+            if rows:
+                yield self._arrow_to_pandas(pa.Table.from_batches(batches, schema=reader.schema), typed, start)
 
     def load_data(self):
         """
         Carrega os dados do arquivo CSV e retorna um DataFrame.
 
+        Com vários arquivos, cada um é lido em um processo e os resultados são concatenados
+        com dicionários categóricos unificados.
+
         Returns:
             pd.DataFrame: Dados carregados em um DataFrame do Pandas.
         """
-        return pd.read_csv(self.file_path, low_memory=False)
+        if len(self.file_paths) > 1:
+            return concat_frames(self._map_files(_load_file), ignore_index=True)
+        return self._read_csv(typed=self.use_schema)
+
+    def memory_report(self, df=None):
+        """
+        Compara o uso de memória do carregamento tipado com o carregamento sem esquema.
+
+        Parameters:
+            df (pd.DataFrame, optional): Dados já carregados com o esquema. Se None,
+                                         o arquivo é carregado novamente com o esquema.
+
+        Returns:
+            pd.DataFrame: Tipos e memória (MB) por coluna nos dois carregamentos, com a redução percentual.
+
+        Exemplo de Uso:
+            loader = DataLoader("data/raw/microdados.csv", float32=True)
+            print(loader.memory_report().to_string(index=False))
+        """
+        if df is None:
+            df = self._read_csv(typed=True)
+        return memory_usage_report(self._read_csv(typed=False), df)
+
+    def preprocessing_params(self):
+        """
+        Retorna os parâmetros que determinam o resultado do pré-processamento.
+
+        Inclui as opções de carregamento e um hash do código-fonte de todos os módulos do pacote
+        `src.data` usados pelo pré-processamento (o carregador, o esquema, a deduplicação, os filtros,
+        o sketch de quantis e a disposição agrupada), de modo que qualquer alteração nas regras
+        invalide o cache.
+
+        Returns:
+            dict: Parâmetros serializáveis em JSON.
+        """
+        rules = hashlib.blake2b(digest_size=16)
+        for directory, subdirectories, files in os.walk(DATA_PACKAGE):
+            subdirectories[:] = sorted(d for d in subdirectories if d != '__pycache__')
+            for name in sorted(f for f in files if f.endswith('.py')):
+                path = os.path.join(directory, name)
+                rules.update(os.path.relpath(path, DATA_PACKAGE).encode())
+                with open(path, 'rb') as f:
+                    rules.update(f.read())
+        return {
+            'use_schema': self.use_schema,
+            'float32': self.float32,
+            'colunas': sorted(self.columns) if self.columns is not None else None,
+            'outliers': self.outlier_method,
+            'sketch_k': Config.SKETCH_K,
+            'filtros': self.filters,
+            'agrupamento': self.cluster_key,
+            'regras': rules.hexdigest(),
+        }
+
+    def load_preprocessed_data(self, use_cache=Config.CACHE_ENABLED):
+        """
+        Carrega os dados já pré-processados, usando o cache em disco quando disponível.
+
+        Na primeira execução o CSV é lido e pré-processado, e o resultado é gravado em
+        `Config.PROCESSED_DATA_PATH`. Nas execuções seguintes, enquanto o arquivo bruto e as
+        regras de pré-processamento não mudarem, os dados são lidos diretamente do cache.
+
+        Com `cluster_key`, o resultado é ordenado uma única vez pela chave antes de ser gravado
+        e a disposição é registrada em `ClusteredLayout` (também ao ler do cache).
+
+        Parameters:
+            use_cache (bool): Se False, ignora o cache e sempre processa o CSV.
+
+        Returns:
+            pd.DataFrame: Dados limpos e pré-processados.
+        """
+        if not use_cache:
+            return self._cluster(self._preprocess())
+
+        cache = ProcessedDataCache()
+        key = cache.key(self.file_paths, self.preprocessing_params())
+        df = cache.load(self.file_path, key)
+        if df is not None:
+            print(f"Dados pré-processados carregados do cache: {cache.path(self.file_path, key)}")
+            if self.cluster_key:
+                # Gravado já ordenado (a chave de agrupamento faz parte da chave do cache)
+                ClusteredLayout.register(df, self.cluster_key)
+            return df
+
+        df = self._cluster(self._preprocess())
+        path = cache.save(self.file_path, key, df)
+        print(f"Dados pré-processados salvos no cache: {path}")
+        return df
+
+    def _cluster(self, df):
+        """
+        Ordena os dados pela chave de agrupamento da instância, quando definida.
+
+        Parameters:
+            df (pd.DataFrame): Dados pré-processados.
+
+        Returns:
+            pd.DataFrame: Dados ordenados e registrados em `ClusteredLayout`, ou os mesmos dados.
+        """
+        if not self.cluster_key:
+            return df
+        return ClusteredLayout.cluster(df, self.cluster_key)
+
+    def _preprocess(self):
+        """
+        Lê e pré-processa o CSV, em paralelo quando houver vários arquivos e em blocos
+        quando `chunksize`, `filters` ou `columns` estiverem definidos.
+
+        Returns:
+            pd.DataFrame: Dados limpos e pré-processados.
+        """
+        if len(self.file_paths) > 1:
+            return self.preprocess_files()
+        if self.chunksize or self.filters or self.columns is not None:
+            return self.preprocess_in_chunks()
+        return self.preprocess_data(self.load_data())
 
     def preprocess_data(self, df):
         """
@@ -34,59 +469,354 @@ class DataLoader:
         - Remoção de outliers na média salarial.
         - Padronização de colunas.
 
+        As regras por registro são aplicadas em uma única passada (`apply_row_rules`) e as
+        regras que dependem do conjunto completo em seguida (`apply_global_rules`).
+
         Parameters:
             df (pd.DataFrame): O DataFrame carregado com os dados brutos.
 
         Returns:
             pd.DataFrame: Dados limpos e pré-processados.
         """
-        # 1. Substituir valores nulos em colunas categóricas
-        df['tipo_salario'] = df['tipo_salario'].fillna("Desconhecido").astype(str)
-        df['sigla_uf_nome'] = df['sigla_uf_nome'].fillna("Desconhecido")
-        df['tipo_vinculo'] = df['tipo_vinculo'].fillna("Não Informado")
+        return self.apply_global_rules(self.apply_row_rules(df))
+
+    def apply_row_rules(self, df):
+        """
+        Aplica, em uma única passada, as regras de pré-processamento que dependem apenas de cada registro.
+
+        As conversões e os filtros (incluindo os filtros da instância, `filters`) são combinados
+        em uma única máscara, de modo que apenas uma cópia dos registros válidos é criada; os preenchimentos e a padronização são feitos
+        depois do filtro, sobre menos linhas. Por não depender dos demais registros, pode ser
+        aplicado bloco a bloco (veja `iter_chunks`).
 
-        # 2. Remover linhas com valores críticos ausentes
-        required_columns = ['cbo_2002', 'valor_remuneracao_media', 'idade', 'sigla_uf']
-        df = df.dropna(subset=required_columns)
+        Parameters:
+            df (pd.DataFrame): Dados brutos (o arquivo inteiro ou um bloco dele).
 
-        # 3. Converter colunas numéricas para os tipos corretos
-        numeric_columns = ['valor_remuneracao_media', 'idade', 'tempo_emprego']
-        for col in numeric_columns:
-            if col in df.columns:
+        Returns:
+            pd.DataFrame: Registros válidos, com tipos convertidos e colunas padronizadas.
+        """
+        # 1. Converter colunas numéricas para os tipos corretos (sem cópia se já forem numéricas)
+        for col in self.NUMERIC_COLUMNS:
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
+        # 2. Remover linhas com valores críticos ausentes e fora da faixa etária válida
+        min_age, max_age = self.AGE_RANGE
+        age_in_range = ((df['idade'] >= min_age) & (df['idade'] <= max_age)).fillna(False)
+        mask = df[self.PREPROCESSING_COLUMNS].notna().all(axis=1) & age_in_range
+        if self.filters:
+            mask &= DataFilter.build_mask(df, self.filters)
+        df = df.loc[mask.to_numpy(dtype=bool)].copy()
+
+        # 3. Substituir valores nulos em colunas categóricas (quando lidas do arquivo)
+        if 'tipo_salario' in df.columns:
+            df['tipo_salario'] = fill_missing(df['tipo_salario'], "Desconhecido")
+            if not isinstance(df['tipo_salario'].dtype, pd.CategoricalDtype):
+                df['tipo_salario'] = df['tipo_salario'].astype(str)
+        if 'sigla_uf_nome' in df.columns:
+            df['sigla_uf_nome'] = fill_missing(df['sigla_uf_nome'], "Desconhecido")
+        if 'tipo_vinculo' in df.columns:
+            df['tipo_vinculo'] = fill_missing(df['tipo_vinculo'], "Não Informado")
+
         # 4. Padronizar colunas categóricas
         if 'sexo' in df.columns:
-            df['sexo'] = df['sexo'].str.title()  # Exemplo: "masculino" -> "Masculino"
+            df['sexo'] = title_case(df['sexo'])  # Exemplo: "masculino" -> "Masculino"
 
-        # 5. Filtrar registros com valores fora dos limites aceitáveis
-        df = df[(df['idade'] >= 18) & (df['idade'] <= 64)]  # Faixa etária válida
+        # 5. Projetar as colunas pedidas, guardando o hash da linha completa para a remoção de
+        # duplicatas (que assim não depende das colunas selecionadas)
+        selected = self._selected_columns()
+        if selected is not None:
+            hashes = HashDeduplicator.row_hashes(df)
+            df = df[[col for col in df.columns if col in selected]].assign(**{HashDeduplicator.HASH_COLUMN: hashes})
 
-        # 6. Remover outliers na média salarial usando IQR
-        df = self.remove_outliers(df, 'valor_remuneracao_media')
+        return df
 
-        # 7. Garantir que não haja valores duplicados desnecessários
-        df = df.drop_duplicates()
+    def apply_global_rules(self, df, sketch=None):
+        """
+        Aplica as regras de pré-processamento que dependem do conjunto completo de registros.
 
-        return df
+        Parameters:
+            df (pd.DataFrame): Registros já tratados por `apply_row_rules`.
+            sketch (KLLSketch, optional): Sketch dos salários construído durante a leitura em blocos,
+                                          usado quando `outlier_method` é "sketch".
+
+        Returns:
+            pd.DataFrame: Dados limpos e pré-processados.
+        """
+        # 5. Remover outliers na média salarial usando IQR
+        df = self.remove_outliers(df, 'valor_remuneracao_media', method=self.outlier_method, sketch=sketch)
+
+        # 6. Garantir que não haja valores duplicados desnecessários, comparando hashes de 64 bits
+        # por linha (com projeção de colunas, os hashes das linhas completas calculados no passo 5)
+        deduplicator = HashDeduplicator()
+        df = deduplicator.drop_duplicates(df)
+        self.duplicates_removed = deduplicator.removed
+        print(f"Registros duplicados removidos: {deduplicator.removed}")
+
+        # 7. Descartar categorias que deixaram de aparecer após os filtros
+        return remove_unused_categories(df)
+
+    def iter_chunks(self, chunksize=None, project=True):
+        """
+        Lê o CSV em blocos de tamanho limitado (arquivo a arquivo, quando houver vários).
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+            project (bool): Se False, lê todas as colunas (a projeção fica para `apply_row_rules`).
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos de dados brutos, com a projeção de colunas e o esquema aplicados.
+        """
+        for file_path in self.file_paths:
+            yield from self._read_csv(typed=self.use_schema, chunksize=chunksize or self.chunksize,
+                                      file_path=file_path, project=project)
+
+    def _row_pass(self, chunksize=None):
+        """
+        Aplica as regras por registro aos dados da instância, em blocos quando houver `chunksize`.
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+
+        Returns:
+            tuple: (registros válidos, sketch dos salários ou None). O sketch só é construído
+                   quando `outlier_method` é "sketch".
+        """
+        # No método "sketch", os quartis dos salários são acumulados durante a própria leitura
+        sketch = KLLSketch() if self.outlier_method == "sketch" else None
+
+        # Com filtros ou projeção de colunas, o arquivo é sempre lido em blocos e apenas os registros
+        # selecionados (e as colunas pedidas) são mantidos
+        projected = self.filters or self.columns is not None
+        chunksize = chunksize or self.chunksize or (self.FILTER_CHUNK_SIZE if projected else None)
+        if chunksize:
+            blocks = self.iter_chunks(chunksize, project=False)
+        else:
+            blocks = [self._read_csv(typed=self.use_schema, file_path=path, project=False) for path in self.file_paths]
+
+        parts = []
+        for block in blocks:
+            part = self.apply_row_rules(block)
+            if sketch is not None:
+                sketch.update(part['valor_remuneracao_media'])
+            parts.append(part)
+        return concat_frames(parts), sketch
+
+    def preprocess_in_chunks(self, chunksize=None):
+        """
+        Pré-processa o CSV em blocos, sem materializar o arquivo bruto inteiro.
+
+        Cada bloco passa pelas regras por registro em uma única passada e apenas os registros
+        válidos são mantidos, de modo que o pico de memória da leitura depende do tamanho do bloco,
+        e não do tamanho do arquivo. As regras globais (limites de outliers e duplicatas) são
+        aplicadas em uma segunda passada sobre os registros já filtrados.
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+
+        Returns:
+            pd.DataFrame: Dados limpos e pré-processados, equivalentes a `preprocess_data(load_data())`.
+        """
+        df, sketch = self._row_pass(chunksize or self.chunksize)
+        return self.apply_global_rules(df, sketch=sketch)
+
+    def preprocess_files(self):
+        """
+        Lê e pré-processa vários arquivos em paralelo, um processo por arquivo.
+
+        Cada processo aplica as regras por registro ao seu arquivo (em blocos, se houver
+        `chunksize`). Os resultados são concatenados com dicionários categóricos unificados e
+        as regras globais (outliers e duplicatas) são aplicadas uma única vez sobre o conjunto.
+        Os sketches de salários de cada arquivo, quando usados, são combinados com `merge`.
+
+        Returns:
+            pd.DataFrame: Dados limpos e pré-processados de todos os arquivos.
+        """
+        results = self._map_files(_row_pass_file)
+
+        sketch = None
+        for _, file_sketch in results:
+            if file_sketch is not None:
+                sketch = file_sketch if sketch is None else sketch.merge(file_sketch)
+
+        df = concat_frames([frame for frame, _ in results], ignore_index=True)
+        return self.apply_global_rules(df, sketch=sketch)
+
+    def iter_row_chunks(self, chunksize=None):
+        """
+        Lê o CSV em blocos e aplica as regras por registro a cada bloco.
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos com os registros válidos.
+        """
+        for chunk in self.iter_chunks(chunksize, project=False):
+            yield self.apply_row_rules(chunk)
+
+    def stream_outlier_bounds(self, chunksize=None):
+        """
+        Calcula os limites de outliers dos salários lendo o CSV em blocos, com memória limitada.
+
+        Uma primeira passada constrói um `KLLSketch` dos salários. No método "sketch", os limites
+        vêm diretamente dele. No método "exact", uma segunda passada guarda apenas os salários
+        próximos de cada quartil (numa faixa de alguns erros de rank em torno da estimativa do
+        sketch) e conta os valores abaixo da faixa, o que basta para obter os quartis exatos com
+        a mesma interpolação linear de `pd.Series.quantile`.
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+
+        Returns:
+            tuple: (limite inferior, limite superior), iguais aos de `outlier_bounds` sobre a coluna completa.
+
+        Raises:
+            ValueError: Se o método não for "exact" ou "sketch".
+        """
+        if self.outlier_method not in ("exact", "sketch"):
+            raise ValueError("O método deve ser 'exact' ou 'sketch'.")
+
+        sketch = KLLSketch()
+        for chunk in self.iter_row_chunks(chunksize):
+            sketch.update(chunk['valor_remuneracao_media'])
+        if self.outlier_method == "sketch":
+            return self.outlier_bounds(None, method="sketch", sketch=sketch)
+
+        # Faixas de valores que contêm as posições dos quartis (com folga de 3 erros de rank)
+        quantiles = (0.25, 0.75)
+        margin = 3 * sketch.rank_error()
+        bands = [tuple(sketch.quantile([max(q - margin, 0), min(q + margin, 1)])) for q in quantiles]
+        below = [0] * len(quantiles)
+        inside = [[] for _ in quantiles]
+
+        for chunk in self.iter_row_chunks(chunksize):
+            values = chunk['valor_remuneracao_media'].dropna().to_numpy(dtype='float64')
+            for i, (low, high) in enumerate(bands):
+                below[i] += int((values < low).sum())
+                inside[i].append(values[(values >= low) & (values <= high)])
+
+        n = sketch.count
+        quartiles = []
+        for q, (low, high), count_below, band in zip(quantiles, bands, below, inside):
+            band = np.sort(np.concatenate(band))
+            position = (n - 1) * q
+            lower, upper = int(np.floor(position)) - count_below, int(np.ceil(position)) - count_below
+            if lower < 0 or upper >= len(band):
+                # Muito improvável: o quartil ficou fora da faixa; usa a estimativa do sketch
+                print(f"Aviso: quartil {q} fora da faixa de refinamento; usando a estimativa do sketch.")
+                quartiles.append(sketch.quantile(q))
+                continue
+            quartiles.append(band[lower] + (position - np.floor(position)) * (band[upper] - band[lower]))
+
+        Q1, Q3 = quartiles
+        IQR = Q3 - Q1
+        return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+
+    def iter_preprocessed_chunks(self, chunksize=None):
+        """
+        Pré-processa o CSV inteiro em blocos, sem nunca materializar o conjunto completo.
+
+        Equivale a `preprocess_data(load_data())` entregue em blocos: os limites de outliers são
+        calculados em passadas prévias (veja `stream_outlier_bounds`) e as duplicatas são removidas
+        com `HashDeduplicator.iter_unique`, que mantém os hashes já vistos dentro de um limite de
+        memória e grava partições em disco acima dele. Usado no modo fora da memória
+        (`Config.OUT_OF_CORE`), em que o CSV é lido duas ou três vezes.
+
+        Parameters:
+            chunksize (int, optional): Número de linhas por bloco. Se None, usa o valor da instância.
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos de dados limpos e pré-processados.
+        """
+        lower_bound, upper_bound = self.stream_outlier_bounds(chunksize)
+
+        def filtered_chunks():
+            for chunk in self.iter_row_chunks(chunksize):
+                salaries = chunk['valor_remuneracao_media']
+                yield chunk[(salaries >= lower_bound) & (salaries <= upper_bound)]
+
+        deduplicator = HashDeduplicator()
+        yield from deduplicator.iter_unique(filtered_chunks())
+        self.duplicates_removed = deduplicator.removed
+        print(f"Registros duplicados removidos: {deduplicator.removed}")
 
     @staticmethod
-    def remove_outliers(df, column):
+    def outlier_bounds(values, method="exact", sketch=None):
+        """
+        Calcula os limites inferior e superior do intervalo interquartil (IQR) para remoção de outliers.
+
+        Parameters:
+            values (pd.Series ou None): Valores da coluna. Pode ser None quando `sketch` é informado.
+            method (str): Método de cálculo dos quartis:
+                          - "exact": Quantis exatos sobre a coluna materializada.
+                          - "sketch": Quantis aproximados por um `KLLSketch`, com erro de rank
+                                      dado por `KLLSketch.rank_error()` (~1,3% com k=200).
+            sketch (KLLSketch, optional): Sketch já construído (por exemplo, a partir de blocos
+                                          ou partições). Usado apenas no método "sketch".
+
+        Returns:
+            tuple: (limite inferior, limite superior).
+
+        Raises:
+            ValueError: Se o método não for "exact" ou "sketch".
+        """
+        if method == "exact":
+            Q1 = values.quantile(0.25)
+            Q3 = values.quantile(0.75)
+        elif method == "sketch":
+            if sketch is None:
+                sketch = KLLSketch.from_values(values)
+            Q1, Q3 = sketch.quantile([0.25, 0.75])
+        else:
+            raise ValueError("O método deve ser 'exact' ou 'sketch'.")
+
+        IQR = Q3 - Q1
+        return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+
+    @staticmethod
+    def remove_outliers(df, column, method="exact", sketch=None):
         """
         Remove outliers de uma coluna numérica usando o método do intervalo interquartil (IQR).
 
         Parameters:
             df (pd.DataFrame): O DataFrame original.
             column (str): Nome da coluna onde os outliers serão removidos.
+            method (str): "exact" (padrão) ou "sketch"; veja `outlier_bounds`.
+            sketch (KLLSketch, optional): Sketch já construído para a coluna (método "sketch").
 
         Returns:
             pd.DataFrame: DataFrame sem os outliers na coluna especificada.
         """
-        Q1 = df[column].quantile(0.25)
-        Q3 = df[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        lower_bound, upper_bound = DataLoader.outlier_bounds(df[column], method=method, sketch=sketch)
 
         # Filtrar valores dentro do intervalo interquartil
         return df[(df[column] >= lower_bound) & (df[column] <= upper_bound)]
+
+
+def _load_file(file_path, options):
+    """
+    Carrega um arquivo em um processo do pool (veja `DataLoader.load_data`).
+
+    Parameters:
+        file_path (str): Caminho do arquivo.
+        options (dict): Opções do `DataLoader`.
+
+    Returns:
+        pd.DataFrame: Dados brutos do arquivo.
+    """
+    return DataLoader(file_path, **options).load_data()
+
+
+def _row_pass_file(file_path, options):
+    """
+    Aplica as regras por registro a um arquivo em um processo do pool (veja `DataLoader.preprocess_files`).
+
+    Parameters:
+        file_path (str): Caminho do arquivo.
+        options (dict): Opções do `DataLoader`.
+
+    Returns:
+        tuple: (registros válidos, sketch dos salários ou None).
+    """
+    return DataLoader(file_path, **options)._row_pass()
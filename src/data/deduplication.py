@@ -0,0 +1,266 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from src.config import Config
+from src.data.schema import concat_frames
+
+
+class HashDeduplicator:
+    """
+    Remoção de registros duplicados baseada em hashes de 64 bits por linha.
+
+    Cada linha é representada por um único hash `uint64` calculado sobre os valores das
+    colunas (em colunas categóricas, sobre o dicionário e os códigos, sem percorrer os textos
+    linha a linha). A comparação entre linhas usa apenas esses hashes, que ocupam 8 bytes por
+    registro, independentemente do tamanho das descrições.
+
+    Em fluxos de blocos (`iter_unique`), os hashes já vistos ficam em memória (em um
+    `SortedHashRuns`, com consultas por busca binária) até o limite `memory_mb`; acima dele, os blocos restantes são distribuídos em partições de hash gravadas
+    em disco e deduplicados partição a partição.
+
+    Observação: a probabilidade de dois registros distintos terem o mesmo hash é da ordem de
+    n² / 2^65 (cerca de 3 em 10.000 para 100 milhões de registros).
+    """
+
+    # Coluna com hashes já calculados (por exemplo, das linhas completas antes de uma projeção de
+    # colunas); quando presente, é usada no lugar dos valores das demais colunas e removida do resultado
+    HASH_COLUMN = '_hash_linha'
+
+    def __init__(self, memory_mb=Config.DEDUP_MEMORY_MB, partitions=Config.DEDUP_PARTITIONS, spill_dir=None):
+        """
+        Inicializa o deduplicador.
+
+        Parameters:
+            memory_mb (float): Memória máxima, em MB, ocupada pelos hashes já vistos em `iter_unique`.
+            partitions (int): Número de partições de hash usadas ao gravar em disco.
+            spill_dir (str, optional): Diretório das partições temporárias. Se None, usa o
+                                       diretório temporário do sistema.
+        """
+        self.memory_mb = memory_mb
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.removed = 0
+
+    @staticmethod
+    def row_hashes(df):
+        """
+        Calcula o hash de 64 bits de cada linha (ou lê os hashes da coluna `HASH_COLUMN`).
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+
+        Returns:
+            np.ndarray: Hashes `uint64`, um por linha.
+        """
+        if HashDeduplicator.HASH_COLUMN in df.columns:
+            return df[HashDeduplicator.HASH_COLUMN].to_numpy(dtype=np.uint64)
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    @staticmethod
+    def _select(df, rows):
+        """Linhas selecionadas (máscara booleana ou None para todas), sem a coluna `HASH_COLUMN`."""
+        if HashDeduplicator.HASH_COLUMN in df.columns:
+            df = df.drop(columns=HashDeduplicator.HASH_COLUMN)
+        return df if rows is None else df[rows]
+
+    def drop_duplicates(self, df):
+        """
+        Remove linhas duplicadas, mantendo a primeira ocorrência (como `df.drop_duplicates()`).
+
+        Parameters:
+            df (pd.DataFrame): Dados.
+
+        Returns:
+            pd.DataFrame: Dados sem duplicatas. O número de linhas removidas é somado a `removed`.
+        """
+        duplicated = pd.Series(self.row_hashes(df)).duplicated().to_numpy()
+        self.removed += int(duplicated.sum())
+        return self._select(df, ~duplicated)
+
+    def iter_unique(self, chunks):
+        """
+        Remove duplicatas de um fluxo de blocos com memória limitada.
+
+        Enquanto os hashes já vistos couberem em `memory_mb`, cada bloco é devolvido sem suas
+        duplicatas, na ordem original. Ao atingir o limite, os hashes vistos e os blocos restantes
+        são gravados em partições de hash no disco; ao final do fluxo, cada partição é carregada
+        e deduplicada separadamente, de modo que a memória usada é de uma partição por vez.
+        Nesse caso, a ordem dos registros gravados em disco não é preservada.
+
+        Parameters:
+            chunks (Iterable[pd.DataFrame]): Blocos com as mesmas colunas.
+
+        Returns:
+            Iterator[pd.DataFrame]: Blocos sem registros duplicados. O número de linhas removidas
+                                    é somado a `removed`.
+        """
+        max_hashes = int(self.memory_mb * 1024 ** 2 / 8)
+        seen = SortedHashRuns()
+        spill_dir = None
+
+        try:
+            for chunk in chunks:
+                hashes = self.row_hashes(chunk)
+                # Primeira ocorrência dentro do bloco que ainda não foi vista em blocos anteriores
+                keep = ~pd.Series(hashes).duplicated().to_numpy() & ~seen.contains(hashes)
+                self.removed += int(len(chunk) - keep.sum())
+                chunk, hashes = chunk[keep], hashes[keep]
+
+                if spill_dir is None and len(seen) + len(hashes) <= max_hashes:
+                    seen.add(hashes)
+                    yield self._select(chunk, None)
+                    continue
+
+                if spill_dir is None:
+                    spill_dir = tempfile.mkdtemp(prefix='dedup-', dir=self.spill_dir)
+                    seen = seen.to_array()
+                    self._spill(spill_dir, 'vistos', pd.DataFrame({'hash': seen}), seen)
+                    seen = SortedHashRuns()
+                self._spill(spill_dir, 'registros', chunk, hashes)
+
+            if spill_dir is not None:
+                for partition in range(self.partitions):
+                    chunk = self._unique_partition(spill_dir, partition)
+                    if chunk is not None:
+                        yield chunk
+        finally:
+            if spill_dir is not None:
+                shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def _partition_of(self, hashes):
+        """
+        Partição de cada hash (resto da divisão pelo número de partições).
+
+        Parameters:
+            hashes (np.ndarray): Hashes `uint64`.
+
+        Returns:
+            np.ndarray: Índice da partição de cada hash.
+        """
+        return (hashes % np.uint64(self.partitions)).astype(np.int64)
+
+    def _spill(self, spill_dir, kind, df, hashes):
+        """
+        Acrescenta as linhas de um bloco aos arquivos das partições correspondentes aos seus hashes.
+
+        Parameters:
+            spill_dir (str): Diretório das partições.
+            kind (str): "vistos" (hashes já devolvidos) ou "registros" (linhas pendentes).
+            df (pd.DataFrame): Linhas a serem gravadas.
+            hashes (np.ndarray): Hash de cada linha.
+        """
+        partition_ids = self._partition_of(hashes)
+        for partition in np.unique(partition_ids):
+            rows = partition_ids == partition
+            path = os.path.join(spill_dir, f"{kind}-{partition:04d}.pkl")
+            with open(path, 'ab') as f:
+                pickle.dump((df[rows], hashes[rows]), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _read_spill(path):
+        """
+        Lê todos os blocos gravados em um arquivo de partição.
+
+        Parameters:
+            path (str): Caminho do arquivo.
+
+        Returns:
+            list: Pares (linhas, hashes) na ordem de gravação.
+        """
+        if not os.path.exists(path):
+            return []
+        parts = []
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    parts.append(pickle.load(f))
+                except EOFError:
+                    return parts
+
+    def _unique_partition(self, spill_dir, partition):
+        """
+        Deduplica as linhas pendentes de uma partição contra os hashes já vistos.
+
+        Parameters:
+            spill_dir (str): Diretório das partições.
+            partition (int): Índice da partição.
+
+        Returns:
+            pd.DataFrame ou None: Linhas únicas da partição, ou None se ela estiver vazia.
+        """
+        pending = self._read_spill(os.path.join(spill_dir, f"registros-{partition:04d}.pkl"))
+        if not pending:
+            return None
+
+        seen = [hashes for _, hashes in self._read_spill(os.path.join(spill_dir, f"vistos-{partition:04d}.pkl"))]
+        seen = np.concatenate(seen) if seen else np.empty(0, dtype=np.uint64)
+        df = concat_frames([rows for rows, _ in pending])
+        hashes = np.concatenate([hashes for _, hashes in pending])
+
+        keep = ~pd.Series(hashes).duplicated().to_numpy() & ~np.isin(hashes, seen)
+        self.removed += int(len(df) - keep.sum())
+        return self._select(df, keep)
+
+
+class SortedHashRuns:
+    """
+    Conjunto de hashes `uint64` distintos guardado em sequências ordenadas (runs), como em uma LSM-tree.
+
+    Cada inserção cria uma sequência ordenada, e sequências de tamanho semelhante são intercaladas,
+    de modo que há no máximo O(log n) sequências e cada hash é copiado O(log n) vezes no total.
+    As consultas fazem uma busca binária (`np.searchsorted`) em cada sequência, e o custo de um
+    bloco não cresce com o número de hashes já vistos, como ocorreria ao intercalar tudo a cada bloco.
+    """
+
+    def __init__(self):
+        """Inicializa um conjunto vazio."""
+        self.runs = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def contains(self, hashes):
+        """
+        Indica quais hashes pertencem ao conjunto.
+
+        Parameters:
+            hashes (np.ndarray): Hashes `uint64` consultados.
+
+        Returns:
+            np.ndarray: Máscara booleana, uma posição por hash.
+        """
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        """
+        Acrescenta hashes distintos entre si e ausentes do conjunto.
+
+        Parameters:
+            hashes (np.ndarray): Hashes `uint64` novos.
+        """
+        if not len(hashes):
+            return
+        run = np.sort(hashes)
+        while self.runs and len(self.runs[-1]) <= len(run):
+            # A ordenação estável reconhece as duas sequências já ordenadas e as intercala em tempo linear
+            run = np.sort(np.concatenate([self.runs.pop(), run]), kind='stable')
+        self.runs.append(run)
+        self.size += len(hashes)
+
+    def to_array(self):
+        """
+        Todos os hashes do conjunto.
+
+        Returns:
+            np.ndarray: Hashes `uint64`, sem ordem definida.
+        """
+        return np.concatenate(self.runs) if self.runs else np.empty(0, dtype=np.uint64)
@@ -0,0 +1,288 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+from src.config import Config
+from src.data.cache import ProcessedDataCache
+from src.data.data_loader import DataLoader
+from src.data.schema import concat_frames, remove_unused_categories
+
+
+class PartitionedStore:
+    """
+    Armazenamento dos dados pré-processados particionado por ano (`ano`).
+
+    Cada ano é gravado em sua própria partição Parquet (`ano=AAAA/dados.parquet`), de modo
+    que a inclusão de um novo ano da RAIS pré-processa apenas o extrato desse ano. Agregados
+    calculados por ano também são guardados por partição e recalculados apenas para os anos
+    que mudaram.
+
+    Observação: os limites de outliers (IQR) são calculados sobre o extrato ingerido, e não
+    sobre o painel completo.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, base_dir=Config.PARTITIONS_PATH):
+        """
+        Inicializa o armazenamento.
+
+        Parameters:
+            base_dir (str): Diretório raiz das partições, agregados e do manifesto.
+        """
+        self.base_dir = base_dir
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        """
+        Lê o manifesto com os anos e arquivos já ingeridos.
+
+        Returns:
+            dict: Manifesto com as chaves "anos" e "arquivos".
+        """
+        path = os.path.join(self.base_dir, self.MANIFEST)
+        if not os.path.exists(path):
+            return {'anos': {}, 'arquivos': {}}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        """
+        Grava o manifesto de forma atômica.
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = os.path.join(self.base_dir, self.MANIFEST)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def partition_path(self, year):
+        """
+        Retorna o caminho do arquivo de dados de um ano.
+
+        Parameters:
+            year (int): Ano da partição.
+
+        Returns:
+            str: Caminho do arquivo Parquet da partição.
+        """
+        return os.path.join(self.base_dir, f"ano={int(year)}", "dados.parquet")
+
+    def aggregate_path(self, name, year):
+        """
+        Retorna o caminho do agregado `name` calculado para um ano.
+
+        Parameters:
+            name (str): Nome do agregado.
+            year (int): Ano da partição.
+
+        Returns:
+            str: Caminho do arquivo Parquet do agregado.
+        """
+        return os.path.join(self.base_dir, "agregados", name, f"ano={int(year)}.parquet")
+
+    def years(self):
+        """
+        Lista os anos disponíveis.
+
+        Returns:
+            list: Anos ingeridos, em ordem crescente.
+        """
+        return sorted(int(year) for year in self.manifest['anos'])
+
+    def ingest(self, file_path, year=None, **loader_kwargs):
+        """
+        Ingere o extrato de um ano como partição própria, pré-processando apenas esse extrato.
+
+        Se o mesmo arquivo já foi ingerido com as mesmas regras, nada é feito. Se o ano já
+        existir (vindo de outro arquivo ou de uma versão anterior), a partição é substituída e
+        os agregados desse ano são descartados; o ano deixa de constar no manifesto do arquivo
+        anterior. Sem `year`, os anos que o arquivo gravou antes e que não estão mais nele têm
+        suas partições removidas.
+
+        Parameters:
+            file_path (str): Caminho do CSV com o extrato (ou diretório/padrão glob com vários arquivos).
+            year (int, optional): Ano a ser ingerido. Se None, todos os anos presentes no
+                                  arquivo são ingeridos, cada um em sua partição.
+            **loader_kwargs: Parâmetros repassados ao `DataLoader` (exemplo: chunksize).
+
+        Returns:
+            list: Anos gravados (vazia se o arquivo já estava atualizado).
+
+        Raises:
+            ValueError: Se o ano informado não existir no arquivo.
+        """
+        loader = DataLoader(file_path, **loader_kwargs)
+        key = ProcessedDataCache().key(loader.file_paths, {**loader.preprocessing_params(), 'ano': year})
+        file_id = os.path.abspath(file_path)
+
+        previous = self.manifest['arquivos'].get(file_id)
+        if previous is not None and previous['chave'] == key:
+            print(f"Arquivo já ingerido, nenhuma partição atualizada: {file_path}")
+            return []
+
+        df = loader.load_preprocessed_data(use_cache=False)
+        if year is not None:
+            df = df[df['ano'] == year]
+            if df.empty:
+                raise ValueError(f"O arquivo {file_path} não contém registros do ano {year}.")
+
+        written = []
+        for partition_year, partition in df.groupby('ano', observed=True):
+            partition_year = int(partition_year)
+            path = self.partition_path(partition_year)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            remove_unused_categories(partition.copy()).to_parquet(path + '.tmp')
+            os.replace(path + '.tmp', path)
+
+            self._discard_aggregates(partition_year)
+            self._release_year(partition_year, file_id)
+            self.manifest['anos'][str(partition_year)] = {
+                'arquivo': file_id,
+                'chave': key,
+                'linhas': len(partition),
+            }
+            written.append(partition_year)
+
+        # Anos gravados antes por este arquivo: removidos se sumiram dele, ou mantidos se a ingestão foi de um único ano
+        owned = []
+        for previous_year in (previous or {}).get('anos', []):
+            if previous_year in written or self._owner(previous_year) != file_id:
+                continue
+            if year is None:
+                self._remove_partition(previous_year)
+            else:
+                owned.append(previous_year)
+
+        self.manifest['arquivos'][file_id] = {'chave': key, 'anos': sorted(owned + written)}
+        self._write_manifest()
+        print(f"Partições gravadas em {self.base_dir}: {written}")
+        return written
+
+    def _owner(self, year):
+        """
+        Arquivo que gravou a partição de um ano.
+
+        Parameters:
+            year (int): Ano da partição.
+
+        Returns:
+            str ou None: Identificador do arquivo no manifesto, ou None se o ano não existir.
+        """
+        entry = self.manifest['anos'].get(str(year))
+        return entry['arquivo'] if entry is not None else None
+
+    def _release_year(self, year, file_id):
+        """
+        Retira um ano do manifesto do arquivo que o gravou, quando outro arquivo assume a partição.
+
+        O arquivo anterior que fica sem anos é removido do manifesto, para que uma nova ingestão
+        dele volte a gravar as suas partições.
+
+        Parameters:
+            year (int): Ano da partição.
+            file_id (str): Arquivo que passa a ser o dono da partição.
+        """
+        owner = self._owner(year)
+        if owner is None or owner == file_id or owner not in self.manifest['arquivos']:
+            return
+        years = [other for other in self.manifest['arquivos'][owner]['anos'] if other != year]
+        if years:
+            self.manifest['arquivos'][owner]['anos'] = years
+        else:
+            del self.manifest['arquivos'][owner]
+
+    def _remove_partition(self, year):
+        """
+        Remove a partição de um ano, os seus agregados e a sua entrada no manifesto.
+
+        Parameters:
+            year (int): Ano da partição.
+        """
+        shutil.rmtree(os.path.dirname(self.partition_path(year)), ignore_errors=True)
+        self._discard_aggregates(year)
+        self.manifest['anos'].pop(str(year), None)
+
+    def _discard_aggregates(self, year):
+        """
+        Remove os agregados calculados para um ano, que ficaram desatualizados.
+
+        Parameters:
+            year (int): Ano cujos agregados serão removidos.
+        """
+        aggregates_dir = os.path.join(self.base_dir, "agregados")
+        if not os.path.isdir(aggregates_dir):
+            return
+        for name in os.listdir(aggregates_dir):
+            path = self.aggregate_path(name, year)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def load(self, years=None, columns=None):
+        """
+        Carrega as partições como um único DataFrame.
+
+        Parameters:
+            years (list, optional): Anos a serem carregados. Se None, carrega todos.
+            columns (list, optional): Colunas a serem lidas. Se None, lê todas.
+
+        Returns:
+            pd.DataFrame: Dados pré-processados dos anos solicitados.
+
+        Raises:
+            ValueError: Se não houver partições para os anos solicitados.
+        """
+        years = self.years() if years is None else sorted(years)
+        missing = [year for year in years if str(year) not in self.manifest['anos']]
+        if missing or not years:
+            raise ValueError(f"Anos não ingeridos: {missing or 'nenhuma partição disponível'}.")
+
+        frames = [pd.read_parquet(self.partition_path(year), columns=columns) for year in years]
+        return concat_frames(frames)
+
+    def yearly_aggregate(self, name, func, years=None):
+        """
+        Retorna um agregado calculado ano a ano, recalculando apenas os anos sem resultado guardado.
+
+        A função é aplicada separadamente aos dados de cada ano, portanto deve produzir um
+        resultado que dependa apenas dos registros daquele ano (exemplo: a média salarial por ano).
+
+        Parameters:
+            name (str): Nome do agregado (usado como diretório).
+            func (callable): Função que recebe o DataFrame de um ano e retorna um DataFrame.
+            years (list, optional): Anos a serem considerados. Se None, considera todos.
+
+        Returns:
+            pd.DataFrame: Resultados de todos os anos concatenados.
+
+        Exemplo de Uso:
+            store.yearly_aggregate(
+                "media_salarial_por_ano",
+                lambda df: BasicStatistics(df).calculate_average_salary_by_year()
+            )
+        """
+        years = self.years() if years is None else sorted(years)
+        results = []
+        for year in years:
+            path = self.aggregate_path(name, year)
+            if os.path.exists(path):
+                results.append(pd.read_parquet(path))
+                continue
+
+            result = func(self.load(years=[year]))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            result.to_parquet(path)
+            results.append(result)
+
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, ignore_index=True)
+
+    def clear(self):
+        """
+        Remove todas as partições, agregados e o manifesto.
+        """
+        if os.path.isdir(self.base_dir):
+            shutil.rmtree(self.base_dir)
+        self.manifest = {'anos': {}, 'arquivos': {}}
@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+# Esquema declarado das colunas dos microdados da RAIS (basedosdados.br_me_rais.microdados_vinculos).
+# Códigos numéricos usam inteiros pequenos anuláveis, textos de baixa cardinalidade usam
+# categorias (dicionário) e as medidas contínuas usam ponto flutuante.
+RAIS_SCHEMA = {
+    # Códigos numéricos
+    'ano': 'Int16',
+    'id_municipio': 'Int32',
+    'idade': 'Int8',
+    'quantidade_horas_contratadas': 'Int16',
+    'indicador_portador_deficiencia': 'Int8',
+
+    # Textos de baixa cardinalidade
+    'sigla_uf': 'category',
+    'sigla_uf_nome': 'category',
+    'id_municipio_nome': 'category',
+    'cbo_2002': 'category',
+    'cbo_2002_descricao': 'category',
+    'cbo_2002_descricao_familia': 'category',
+    'cnae_2': 'category',
+    'cnae_2_descricao': 'category',
+    'sexo': 'category',
+    'raca_cor': 'category',
+    'tipo_vinculo': 'category',
+    'tipo_salario': 'category',
+    'vinculo_ativo_3112': 'category',
+    'grau_instrucao_apos_2005': 'category',
+
+    # Medidas contínuas
+    'valor_remuneracao_media': 'float64',
+    'tempo_emprego': 'float64',
+}
+
+# Colunas que podem ser reduzidas para float32 quando a opção for solicitada
+FLOAT32_COLUMNS = ['valor_remuneracao_media', 'tempo_emprego']
+
+
+def build_dtypes(float32=False):
+    """
+    Monta o dicionário de tipos a ser passado ao leitor de CSV.
+
+    Parameters:
+        float32 (bool): Se True, as medidas contínuas (salário e tempo de emprego)
+                        são carregadas como float32.
+
+    Returns:
+        dict: Mapeamento coluna -> tipo.
+    """
+    dtypes = dict(RAIS_SCHEMA)
+    if float32:
+        dtypes.update({col: 'float32' for col in FLOAT32_COLUMNS})
+    return dtypes
+
+
+# Tipos Arrow usados pelo leitor de CSV do Arrow. Os códigos inteiros são lidos como
+# float64 (o extrato traz valores como "39.0") e convertidos depois para os inteiros
+# anuláveis do esquema, como faz o leitor do Pandas.
+ARROW_TYPES = {
+    'Int8': pa.float64(),
+    'Int16': pa.float64(),
+    'Int32': pa.float64(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+    'float64': pa.float64(),
+    'float32': pa.float32(),
+}
+
+
+def build_arrow_types(float32=False):
+    """
+    Monta o dicionário de tipos a ser passado ao leitor de CSV do Arrow.
+
+    Parameters:
+        float32 (bool): Se True, as medidas contínuas são carregadas como float32.
+
+    Returns:
+        dict: Mapeamento coluna -> tipo Arrow.
+    """
+    return {col: ARROW_TYPES[dtype] for col, dtype in build_dtypes(float32).items()}
+
+
+def sort_categories(df):
+    """
+    Ordena os dicionários das colunas categóricas.
+
+    O leitor do Arrow cria as categorias na ordem em que aparecem no arquivo, enquanto o
+    leitor do Pandas as ordena; com dicionários ordenados, agrupamentos e ordenações por
+    categoria produzem o mesmo resultado com os dois leitores.
+
+    Parameters:
+        df (pd.DataFrame): Dados com colunas categóricas.
+
+    Returns:
+        pd.DataFrame: O mesmo DataFrame, com categorias em ordem crescente.
+    """
+    for col in df.select_dtypes(include='category').columns:
+        categories = df[col].cat.categories
+        if not categories.is_monotonic_increasing:
+            df[col] = df[col].cat.reorder_categories(categories.sort_values())
+    return df
+
+
+def fill_missing(series, value):
+    """
+    Preenche valores ausentes, incluindo o valor nas categorias quando a coluna é categórica.
+
+    Parameters:
+        series (pd.Series): Coluna a ser preenchida.
+        value (str): Valor usado no preenchimento.
+
+    Returns:
+        pd.Series: Coluna sem valores ausentes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def title_case(series):
+    """
+    Padroniza textos com a primeira letra maiúscula (exemplo: "masculino" -> "Masculino").
+
+    Em colunas categóricas apenas o dicionário é convertido, e categorias que passam a
+    coincidir (exemplo: "masculino" e "Masculino") são unificadas.
+
+    Parameters:
+        series (pd.Series): Coluna textual ou categórica.
+
+    Returns:
+        pd.Series: Coluna padronizada, preservando o tipo categórico.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.str.title()
+
+    titled = series.cat.categories.str.title()
+    categories = titled.unique()
+    # O código -1 (ausente) é mapeado para a última posição, que continua -1
+    mapping = np.append(categories.get_indexer(titled), -1)
+    codes = mapping[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+
+def remove_unused_categories(df):
+    """
+    Remove, de todas as colunas categóricas, as categorias que não aparecem mais nos dados.
+
+    Parameters:
+        df (pd.DataFrame): Dados com colunas categóricas.
+
+    Returns:
+        pd.DataFrame: O mesmo DataFrame, com dicionários compactados.
+    """
+    for col in df.select_dtypes(include='category').columns:
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+
+def concat_frames(frames, ignore_index=False):
+    """
+    Concatena DataFrames unificando os dicionários das colunas categóricas.
+
+    Blocos ou arquivos lidos separadamente inferem categorias diferentes; sem a unificação,
+    o `pd.concat` converteria essas colunas de volta para texto.
+
+    Parameters:
+        frames (list): DataFrames com as mesmas colunas.
+        ignore_index (bool): Se True, renumera o índice (útil ao juntar arquivos diferentes,
+                             cujos índices se repetem).
+
+    Returns:
+        pd.DataFrame: Dados concatenados, com as colunas categóricas preservadas.
+    """
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True) if ignore_index else frames[0]
+
+    categorical = frames[0].select_dtypes(include='category').columns
+    for col in categorical:
+        categories = frames[0][col].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[col].cat.categories)
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=ignore_index)
+
+
+def memory_usage_report(df_before, df_after):
+    """
+    Compara o uso de memória e os tipos de cada coluna entre dois carregamentos.
+
+    Parameters:
+        df_before (pd.DataFrame): Dados carregados sem esquema.
+        df_after (pd.DataFrame): Dados carregados com o esquema declarado.
+
+    Returns:
+        pd.DataFrame: Uma linha por coluna e uma linha "Total", com as colunas
+                      "Coluna", "Tipo Original", "Memória Original (MB)", "Tipo Otimizado",
+                      "Memória Otimizada (MB)" e "Redução (%)".
+    """
+    mb = 1024 ** 2
+    before = df_before.memory_usage(deep=True, index=False) / mb
+    after = df_after.memory_usage(deep=True, index=False).reindex(before.index) / mb
+
+    report = pd.DataFrame({
+        'Coluna': before.index,
+        'Tipo Original': df_before.dtypes.astype(str).values,
+        'Memória Original (MB)': before.values,
+        'Tipo Otimizado': df_after.dtypes.reindex(before.index).astype(str).values,
+        'Memória Otimizada (MB)': after.values,
+    })
+    total = pd.DataFrame([{
+        'Coluna': 'Total',
+        'Tipo Original': '',
+        'Memória Original (MB)': before.sum(),
+        'Tipo Otimizado': '',
+        'Memória Otimizada (MB)': after.sum(),
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    report['Redução (%)'] = (1 - report['Memória Otimizada (MB)'] / report['Memória Original (MB)']) * 100
+    return report
@@ -2,12 +2,15 @@ from docx import Document
 from docx.shared import Pt
 import os
 from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.bootstrap import Bootstrap
 from src.analysis.employment_indexes import EmploymentIndexes
 from src.analysis.gender_analysis import GenderAnalysis
 from src.analysis.position_analysis import PositionAnalysis
 from src.analysis.regional_analysis import RegionalAnalysis
 from src.analysis.predictive_models import PredictiveModels
 from src.analysis.statistical_tests import StatisticalTests
+from src.analysis.sections import resolve_sections
+from src.config import Config
 
 
 class AnalysisToDocument:
@@ -20,12 +23,14 @@ class AnalysisToDocument:
         Inicializa a classe com os dados e o caminho de saída.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados para análise.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados para análise, ou o resumo
+                                                    do modo fora da memória.
             output_path (str): O caminho do arquivo Word onde os resultados serão salvos.
         """
         self.df = df
         self.output_path = output_path
         self.document = Document()
+        self._intervals = None  # Intervalos por bootstrap, calculados uma vez para todas as seções
 
     def add_section(self, title):
         """
@@ -96,6 +101,29 @@ class AnalysisToDocument:
             for j, value in enumerate(row):
                 table.cell(i + 1, j).text = str(value)
 
+    def add_confidence_intervals(self, metrics, level=0.95):
+        """
+        Adiciona uma tabela com os intervalos de confiança por bootstrap das métricas
+        (nada é adicionado com `Config.BOOTSTRAP_REPLICATES` igual a 0).
+
+        Parameters:
+            metrics (list): Métricas de `Bootstrap.METRICS` (exemplo: ["Salário Médio", "Salário Mediano"]).
+            level (float): Nível de confiança dos intervalos.
+        """
+        if not Config.BOOTSTRAP_REPLICATES:
+            return
+        if self._intervals is None:
+            self._intervals = Bootstrap(self.df).confidence_intervals(level=level)
+
+        rows = [
+            [metric] + [f"{value:,.2f}" for value in self._intervals.loc[metric]]
+            for metric in metrics
+        ]
+        percent = f"{level * 100:g}%"
+        self.add_table(rows, column_names=[
+            "Métrica", "Estimativa", f"Limite Inferior ({percent})", f"Limite Superior ({percent})"
+        ])
+
     def save_to_word(self, file_name="data_analysis.docx"):
         """
         Salva o documento no arquivo especificado.
@@ -113,30 +141,29 @@ class AnalysisToDocument:
         self.document.save(full_path)
         print(f"Documento salvo com sucesso em: {full_path}")
 
-    def run_analysis(self):
+    def run_analysis(self, sections=None):
         """
         Executa os métodos de análise e salva os resultados no arquivo Word.
-        """
-        self.add_section("Estatísticas Básicas")
-        self.add_basic_statistics()
 
-        self.add_section("Análise de Gênero")
-        self.add_gender_analysis()
-
-        self.add_section("Análise de Cargos")
-        self.add_position_analysis()
-
-        self.add_section("Previsões de Salário Médio para 2024")
-        self.add_salary_predictions()
-
-        self.add_section("Análise Regional")
-        self.add_regional_analysis()
-
-        self.add_section("Índices de Emprego")
-        self.add_employment_indexes()
-
-        self.add_section("Análise Estatística")
-        self.add_statistical_tests()
+        Parameters:
+            sections (list, optional): Seções a serem incluídas (chaves de
+                                       `src.analysis.sections.ANALYSIS_SECTIONS`).
+                                       Se None, inclui todas as seções.
+        """
+        section_writers = {
+            'basic_statistics': ("Estatísticas Básicas", self.add_basic_statistics),
+            'gender_analysis': ("Análise de Gênero", self.add_gender_analysis),
+            'position_analysis': ("Análise de Cargos", self.add_position_analysis),
+            'predictive_models': ("Previsões de Salário Médio para 2024", self.add_salary_predictions),
+            'regional_analysis': ("Análise Regional", self.add_regional_analysis),
+            'employment_indexes': ("Índices de Emprego", self.add_employment_indexes),
+            'statistical_tests': ("Análise Estatística", self.add_statistical_tests),
+        }
+
+        for section in resolve_sections(sections):
+            title, writer = section_writers[section]
+            self.add_section(title)
+            writer()
 
         # Salvar o arquivo Word
         self.save_to_word()
@@ -158,10 +185,16 @@ class AnalysisToDocument:
             ["Média Salarial", f"{salary_dist['Média Salarial']:,.2f}"],
             ["Mediana Salarial", f"{salary_dist['Mediana Salarial']:,.2f}"],
             ["Desvio Padrão", f"{salary_dist['Desvio Padrão']:,.2f}"],
-            ["Coeficiente de Variação (%)", f"{salary_dist['Coeficiente de Variação (%)']:,.2f}"]
+            ["Coeficiente de Variação (%)", f"{salary_dist['Coeficiente de Variação (%)']:,.2f}"],
+            ["Assimetria", f"{salary_dist['Assimetria']:,.2f}"],
+            ["Curtose", f"{salary_dist['Curtose']:,.2f}"]
         ]
         self.add_table(salary_dist_table, column_names=["Métrica", "Valor"])
 
+        if Config.BOOTSTRAP_REPLICATES:
+            self.add_subsection("Intervalos de Confiança (Bootstrap)")
+            self.add_confidence_intervals(["Salário Médio", "Salário Mediano"])
+
     def add_gender_analysis(self):
         """Adiciona a análise de gênero ao relatório."""
         gender_analysis = GenderAnalysis(self.df)
@@ -170,6 +203,7 @@ class AnalysisToDocument:
         salary_gap = gender_analysis.gender_salary_gap()
         for key, value in salary_gap.items():
             self.add_key_value_pair(key, f"{value:,.2f}")
+        self.add_confidence_intervals(["Diferença Salarial"])
 
         self.add_subsection("Métricas de Igualdade de Gênero")
         gender_equality = gender_analysis.gender_equality_metrics()
@@ -232,6 +266,7 @@ class AnalysisToDocument:
         employment_indexes = EmploymentIndexes(self.df)
         self.add_key_value_pair("Índice de Disparidade Salarial (IDS)",
                                 f"{employment_indexes.salary_disparity_index():,.2f}")
+        self.add_confidence_intervals(["IDS (%)"])
         self.add_key_value_pair("Índice de Escolaridade", f"{employment_indexes.education_index():,.2f}")
 
     def add_statistical_tests(self):
@@ -15,11 +15,12 @@ class BasicStatisticsVisualizer(BaseVisualizer):
         Inicializa a instância com um DataFrame e herda a funcionalidade de salvar gráficos.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações de empregados.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados contendo informações de empregados.
             output_dir (str): Diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)  # Chama o construtor da classe base
-        self.df = df
+        self.stats = BasicStatistics(df)
+        self.df = self.stats.df
 
     def save_plot(self, filename):
         """
@@ -39,8 +40,7 @@ class BasicStatisticsVisualizer(BaseVisualizer):
         """
         Gera um gráfico de linha mostrando a média salarial por ano e salva o gráfico.
         """
-        stats = BasicStatistics(self.df)
-        salary_by_year = stats.calculate_average_salary_by_year()
+        salary_by_year = self.stats.calculate_average_salary_by_year()
 
         plt.figure(figsize=(12, 6))
         sns.lineplot(data=salary_by_year, x='Ano', y='Média Salarial', marker='o', color='blue')
@@ -64,7 +64,7 @@ class BasicStatisticsVisualizer(BaseVisualizer):
         """
         Gera um histograma para visualizar a distribuição salarial e salva o gráfico.
         """
-        stats = BasicStatistics(self.df).salary_distribution()
+        stats = self.stats.salary_distribution()
         mean_salary = stats['Média Salarial']
         median_salary = stats['Mediana Salarial']
 
@@ -95,7 +95,7 @@ class BasicStatisticsVisualizer(BaseVisualizer):
         Gera um gráfico de barras para comparar as métricas calculadas e salva o gráfico.
         """
         # Obter as métricas
-        stats = BasicStatistics(self.df).salary_distribution()
+        stats = self.stats.salary_distribution()
 
         # Reestruturar os dados em um DataFrame, removendo o "Coeficiente de Variação (%)"
         metrics_data = pd.DataFrame({
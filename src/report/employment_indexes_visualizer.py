@@ -15,18 +15,19 @@ class EmploymentIndexesVisualizer(BaseVisualizer):
         Inicializa a instância com um DataFrame e herda a funcionalidade de salvar gráficos.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações de salários, região e escolaridade.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados contendo informações de salários, região e escolaridade.
             output_dir (str): Diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)  # Chama o construtor da classe base
-        self.df = df
+        self.indexes = EmploymentIndexes(df)
+        self.df = self.indexes.df
 
     def plot_salary_disparity(self):
         """
         Gera um gráfico de barras para mostrar a disparidade salarial entre gêneros.
         """
         # Obter as médias salariais por gênero
-        salaries = self.df.groupby('sexo')['valor_remuneracao_media'].mean().reset_index()
+        salaries = self.indexes.average_salary_by_gender().reset_index()
 
         # Renomear as colunas para facilitar a interpretação
         salaries.columns = ['Gênero', 'Salário Médio']
@@ -58,13 +59,11 @@ class EmploymentIndexesVisualizer(BaseVisualizer):
         """
         Gera um gráfico de barras mostrando a concentração regional de empregos tecnológicos.
         """
-        indexes = EmploymentIndexes(self.df)
-        states = self.df['sigla_uf'].unique()
-
-        icr_values = {state: indexes.regional_concentration_index(state) for state in states}
+        # ICR de todos os estados em uma única redução agrupada
+        icr_values = self.indexes.regional_concentration_indexes(level="estado")
 
         plt.figure(figsize=(12, 8))
-        sns.barplot(x=list(icr_values.keys()), y=list(icr_values.values()), palette="Greens")
+        sns.barplot(x=icr_values['Estado'].astype(str), y=icr_values['ICR (%)'], palette="Greens")
         plt.title("Índice de Concentração Regional")
         plt.ylabel("Proporção de Empregos (%)")
         plt.xlabel("Estado")
@@ -76,7 +75,7 @@ class EmploymentIndexesVisualizer(BaseVisualizer):
         """
         Gera um gráfico de pizza mostrando a proporção de empregados com ensino superior completo ou mais.
         """
-        indexes = EmploymentIndexes(self.df)
+        indexes = self.indexes
         education_index = indexes.education_index()
         non_education_index = 100 - education_index
 
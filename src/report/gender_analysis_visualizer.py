@@ -15,7 +15,7 @@ class GenderAnalysisVisualizer(BaseVisualizer):
         Inicializa a instância com um DataFrame e o diretório de saída para salvar os gráficos.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo informações de gênero, salários e ocupações.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados contendo informações de gênero, salários e ocupações.
             output_dir (str): O diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)  # Herda o construtor da classe BaseVisualizer
@@ -78,8 +78,8 @@ class GenderAnalysisVisualizer(BaseVisualizer):
 
         # Dados para o gráfico
         labels = ['Masculino', 'Feminino']
-        males = self.analysis.df[self.analysis.df['sexo'] == 'Masculino'].shape[0]
-        females = self.analysis.df[self.analysis.df['sexo'] == 'Feminino'].shape[0]
+        counts = self.analysis.gender_counts()
+        males, females = counts['Masculino'], counts['Feminino']
         sizes = [males, females]
 
         plt.figure(figsize=(8, 8))
@@ -112,8 +112,8 @@ class GenderAnalysisVisualizer(BaseVisualizer):
         })
 
         # Calcular proporção de gêneros
-        males = self.analysis.df[self.analysis.df['sexo'] == 'Masculino'].shape[0]
-        females = self.analysis.df[self.analysis.df['sexo'] == 'Feminino'].shape[0]
+        counts = self.analysis.gender_counts()
+        males, females = counts['Masculino'], counts['Feminino']
         gender_sizes = [males, females]
 
         # Configurar o layout para gráficos lado a lado
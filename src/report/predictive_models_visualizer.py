@@ -17,7 +17,7 @@ class PredictiveModelsVisualizer(BaseVisualizer):
         Inicializa a instância com um DataFrame e o diretório de saída para salvar os gráficos.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo as variáveis independentes e dependentes.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados contendo as variáveis independentes e dependentes.
             output_dir (str): O diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)  # Herda o construtor da classe BaseVisualizer
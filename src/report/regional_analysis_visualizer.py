@@ -15,7 +15,7 @@ class RegionalAnalysisVisualizer(BaseVisualizer):
         Inicializa a instância com o DataFrame e o diretório de saída.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados a ser analisado.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados a ser analisado.
             output_dir (str): O diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)
@@ -1,4 +1,5 @@
 import os
+from src.analysis.sections import resolve_sections
 
 class ReportGenerator:
     """
@@ -13,7 +14,8 @@ class ReportGenerator:
         Inicializa a instância com o DataFrame e o diretório de saída.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados a ser analisado.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados a ser analisado, ou o resumo
+                                                    do modo fora da memória.
             output_dir (str): O diretório onde os gráficos serão salvos.
         """
         self.df = df
@@ -94,16 +96,28 @@ class ReportGenerator:
         visualizer.plot_anova_by_region()
         visualizer.plot_anova_by_sector()
 
-    def generate_all_reports(self):
+    def generate_all_reports(self, sections=None):
         """
         Gera todos os gráficos das análises realizadas pelas classes de visualização.
-        """
+
+        Parameters:
+            sections (list, optional): Seções cujos gráficos serão gerados (chaves de
+                                       `src.analysis.sections.ANALYSIS_SECTIONS`).
+                                       Se None, gera os gráficos de todas as seções.
+        """
+        report_generators = {
+            'basic_statistics': self.generate_basic_statistics_reports,
+            'employment_indexes': self.generate_employment_indexes_reports,
+            'gender_analysis': self.generate_gender_analysis_reports,
+            'position_analysis': self.generate_position_analysis_reports,
+            'regional_analysis': self.generate_regional_analysis_reports,
+            'predictive_models': self.generate_predictive_models_reports,
+            'statistical_tests': self.generate_statistical_tests_reports,
+        }
+        selected = resolve_sections(sections)
+
         print("Gerando relatórios...")
-        self.generate_basic_statistics_reports()
-        self.generate_employment_indexes_reports()
-        self.generate_gender_analysis_reports()
-        self.generate_position_analysis_reports()
-        self.generate_regional_analysis_reports()
-        self.generate_predictive_models_reports()
-        self.generate_statistical_tests_reports()
+        for section, generate in report_generators.items():
+            if section in selected:
+                generate()
         print("Relatórios completos gerados e salvos em:", self.output_dir)
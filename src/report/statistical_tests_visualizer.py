@@ -14,7 +14,7 @@ class StatisticalTestsVisualizer(BaseVisualizer):
         Inicializa a instância com um DataFrame e o diretório de saída para salvar os gráficos.
 
         Parameters:
-            df (pd.DataFrame): O conjunto de dados contendo as variáveis para os testes estatísticos.
+            df (pd.DataFrame ou OutOfCoreAnalysis): O conjunto de dados contendo as variáveis para os testes estatísticos.
             output_dir (str): O diretório onde os gráficos serão salvos.
         """
         super().__init__(output_dir)  # Herda o construtor da classe BaseVisualizer
@@ -33,8 +33,7 @@ class StatisticalTestsVisualizer(BaseVisualizer):
         result = self.tests.compare_gender_salaries(test=test)
 
         # Calcula os salários médios por gênero
-        male_salary = self.tests.df[self.tests.df['sexo'] == 'Masculino']['valor_remuneracao_media'].mean()
-        female_salary = self.tests.df[self.tests.df['sexo'] == 'Feminino']['valor_remuneracao_media'].mean()
+        male_salary, female_salary = self.tests.gender_salary_means()
 
         # Dados para o gráfico
         genders = ['Masculino', 'Feminino']
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import DataLoader
+
+
+def make_rais_frame(n=2000, seed=0):
+    """
+    Gera um extrato sintético com as colunas da RAIS.
+
+    Os salários são múltiplos de R$ 50 (com muitos empates, como na RAIS), e cerca de 5% das
+    linhas são cópias exatas de outras. Várias linhas distintas coincidem nas colunas mais usadas
+    pelas análises e diferem apenas em colunas secundárias (raça/cor, CNAE, horas contratadas).
+
+    Parameters:
+        n (int): Número de linhas.
+        seed (int): Semente dos sorteios.
+
+    Returns:
+        pd.DataFrame: Dados brutos, como lidos do CSV sem esquema.
+    """
+    rng = np.random.default_rng(seed)
+    cbo = {
+        '212305': ('Administrador de banco de dados', 'Administradores de tecnologia da informação'),
+        '212405': ('Analista de desenvolvimento de sistemas', 'Analistas de tecnologia da informação'),
+        '317110': ('Programador de sistemas de informação', 'Técnicos em programação'),
+        '142505': ('Gerente de projetos de tecnologia da informação', 'Gerentes de tecnologia da informação'),
+    }
+    municipios = {
+        'PR': [(4106902, 'Curitiba'), (4113700, 'Londrina'), (4115200, 'Maringá')],
+        'SP': [(3550308, 'São Paulo'), (3509502, 'Campinas')],
+        'SC': [(4205407, 'Florianópolis')],
+    }
+    states = rng.choice(list(municipios), size=n, p=[0.6, 0.3, 0.1])
+    cities = [municipios[state][rng.integers(len(municipios[state]))] for state in states]
+    codes = rng.choice(list(cbo), size=n)
+
+    df = pd.DataFrame({
+        'ano': rng.choice([2021, 2022, 2023], size=n),
+        'sigla_uf': states,
+        'sigla_uf_nome': [{'PR': 'Paraná', 'SP': 'São Paulo', 'SC': 'Santa Catarina'}[s] for s in states],
+        'id_municipio': [city[0] for city in cities],
+        'id_municipio_nome': [city[1] for city in cities],
+        'cbo_2002': codes,
+        'cbo_2002_descricao': [cbo[code][0] for code in codes],
+        'cbo_2002_descricao_familia': [cbo[code][1] for code in codes],
+        'cnae_2': rng.choice(['6201501', '6202300', '6204000'], size=n),
+        'cnae_2_descricao': 'Desenvolvimento de software',
+        'sexo': rng.choice(['masculino', 'FEMININO', 'Masculino', 'feminino'], size=n),
+        'raca_cor': rng.choice(['Branca', 'Parda', 'Preta', 'Amarela'], size=n),
+        'idade': rng.integers(16, 70, size=n),
+        'tipo_vinculo': rng.choice(['CLT U/PJ Ind', 'CLT R/PJ Ind', None], size=n),
+        'tipo_salario': rng.choice(['Mensal', 'Horista', None], size=n),
+        'vinculo_ativo_3112': rng.choice(['Sim', 'Não'], size=n, p=[0.8, 0.2]),
+        'grau_instrucao_apos_2005': rng.choice(['Médio Completo', 'Superior Completo', 'Mestrado'], size=n),
+        'quantidade_horas_contratadas': rng.choice([20, 30, 40, 44], size=n),
+        'indicador_portador_deficiencia': rng.choice([0, 1], size=n, p=[0.95, 0.05]),
+        'valor_remuneracao_media': np.round(rng.lognormal(8.2, 0.5, size=n) / 50) * 50,
+        'tempo_emprego': np.round(rng.exponential(40, size=n), 1),
+    })
+    # Alguns valores ausentes e outliers, tratados pelo pré-processamento
+    df.loc[rng.choice(n, size=n // 100, replace=False), 'valor_remuneracao_media'] = np.nan
+    df.loc[rng.choice(n, size=n // 200, replace=False), 'valor_remuneracao_media'] = 500_000.0
+
+    # Duplicatas exatas de linhas sorteadas
+    copies = df.iloc[rng.choice(n, size=n // 20, replace=False)]
+    return pd.concat([df, copies], ignore_index=True)
+
+
+@pytest.fixture
+def rais_frame():
+    return make_rais_frame()
+
+
+@pytest.fixture
+def rais_csv(tmp_path, rais_frame):
+    path = tmp_path / "microdados.csv"
+    rais_frame.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def rais_data(rais_csv):
+    return DataLoader(rais_csv).load_preprocessed_data(use_cache=False)
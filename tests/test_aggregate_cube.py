@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.aggregate_cube import AggregateCube, active_links
+from src.analysis.central_moments import CentralMoments
+
+KEYS = [
+    ['sexo'],
+    ['ano'],
+    ['sigla_uf', 'id_municipio'],
+    ['cbo_2002_descricao', 'sigla_uf', 'sexo'],
+    ['ano', 'sexo', 'sigla_uf', 'id_municipio'],
+]
+
+
+@pytest.fixture
+def frame(rais_data):
+    df = rais_data.copy()
+    # Valores ausentes nas dimensões e nos salários
+    df.loc[df.index[::29], 'sigla_uf'] = np.nan
+    df.loc[df.index[::31], 'valor_remuneracao_media'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("keys", KEYS)
+def test_salary_aggregates_match_groupby(frame, keys):
+    cube = AggregateCube(frame)
+    expected = frame.groupby(keys, observed=True)['valor_remuneracao_media'].agg(['mean', 'sum', 'count', 'size'])
+    actual = cube.aggregate(keys, 'valor_remuneracao_media', ['mean', 'sum', 'count', 'size'])
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_index_type=False)
+
+
+@pytest.mark.parametrize("keys", KEYS)
+def test_active_links_match_groupby(frame, keys):
+    cube = AggregateCube(frame)
+    links = active_links(frame)
+    expected = links.groupby([frame[key] for key in keys], observed=True).agg(['sum', 'mean'])
+    actual = cube.aggregate(keys, 'quantidade_vinculos_ativos', ['sum', 'mean'])
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_index_type=False)
+
+
+@pytest.mark.parametrize("keys", KEYS)
+def test_variances_match_groupby(frame, keys):
+    table = AggregateCube(frame).table(keys)
+    variances = CentralMoments.statistics(table.assign(m3=0.0, m4=0.0))['Variância']
+    expected = frame.groupby(keys, observed=True)['valor_remuneracao_media'].var()
+
+    np.testing.assert_allclose(variances.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_totals_and_chunked_cube_match_records(frame):
+    chunked = AggregateCube(dimensions=AggregateCube.DIMENSIONS)
+    for start in range(0, len(frame), 250):
+        chunked.update(frame.iloc[start:start + 250])
+    merged = AggregateCube(frame.iloc[:700]).merge(AggregateCube(frame.iloc[700:]))
+    salaries = frame['valor_remuneracao_media']
+
+    for cube in (AggregateCube(frame), chunked, merged):
+        totals = cube.totals()
+        assert totals['linhas'] == len(frame)
+        assert totals['n'] == salaries.count()
+        assert totals['media'] == pytest.approx(salaries.mean(), rel=1e-12)
+        assert totals['m2'] / (totals['n'] - 1) == pytest.approx(salaries.var(), rel=1e-9)
+        assert totals['ativos'] == active_links(frame).sum()
+        expected = frame.groupby(['cbo_2002_descricao', 'sexo'], observed=True)['valor_remuneracao_media'].mean()
+        actual = cube.aggregate(['cbo_2002_descricao', 'sexo'], 'valor_remuneracao_media', 'mean')
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_supports_only_cube_dimensions_and_measures(frame):
+    cube = AggregateCube(frame)
+
+    assert cube.supports(['sigla_uf', 'sexo'], 'valor_remuneracao_media')
+    assert not cube.supports(['cbo_2002_descricao_familia'], 'valor_remuneracao_media')
+    assert not cube.supports(['sexo'], 'idade')
+    assert AggregateCube.of(frame) is AggregateCube.of(frame)
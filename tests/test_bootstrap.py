@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.bootstrap import Bootstrap, bootstrap_intervals
+from src.config import Config
+
+
+@pytest.mark.parametrize("method", ["poisson", "multinomial"])
+def test_intervals_do_not_depend_on_workers_or_batches(rais_data, monkeypatch, method):
+    values, counts = Bootstrap(rais_data).compressed()
+    expected = bootstrap_intervals(values, counts, 200, method=method, seed=7, max_workers=1)
+
+    pd.testing.assert_frame_equal(bootstrap_intervals(values, counts, 200, method=method, seed=7, max_workers=3),
+                                  expected)
+    # Lotes de uma única réplica
+    monkeypatch.setattr(Config, 'BOOTSTRAP_MEMORY_MB', counts.nbytes / 1024 ** 2)
+    pd.testing.assert_frame_equal(bootstrap_intervals(values, counts, 200, method=method, seed=7, max_workers=1),
+                                  expected)
+
+
+def test_intervals_contain_estimates(rais_data):
+    intervals = Bootstrap(rais_data).confidence_intervals(n_replicates=200)
+
+    assert (intervals['Limite Inferior'] <= intervals['Estimativa']).all()
+    assert (intervals['Estimativa'] <= intervals['Limite Superior']).all()
+    assert intervals.loc['Salário Médio', 'Estimativa'] == pytest.approx(rais_data['valor_remuneracao_media'].mean())
+    assert intervals.loc['Salário Mediano', 'Estimativa'] == np.median(rais_data['valor_remuneracao_media'])
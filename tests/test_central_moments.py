@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.central_moments import CentralMoments
+
+
+def reference(values):
+    return {
+        "Registros": values.count(),
+        "Média": values.mean(),
+        "Variância": values.var(),
+        "Desvio Padrão": values.std(),
+        "Assimetria": values.skew(),
+        "Curtose": values.kurt(),
+        "Mediana": values.median(),
+    }
+
+
+@pytest.mark.parametrize("shift", [0.0, 1e6])
+def test_summary_matches_pandas(rais_data, shift):
+    df = rais_data.assign(valor_remuneracao_media=rais_data['valor_remuneracao_media'] + shift)
+    summary = CentralMoments.from_frame(df, median="exact").summary()
+
+    assert summary == pytest.approx(reference(df['valor_remuneracao_media']), rel=1e-9)
+
+
+def test_grouped_statistics_match_pandas(rais_data):
+    moments = CentralMoments.from_frame(rais_data, by=['ano', 'sexo'], median=None)
+    statistics = CentralMoments.statistics(moments.table)
+    grouped = rais_data.groupby(['ano', 'sexo'], observed=True)['valor_remuneracao_media']
+
+    np.testing.assert_allclose(statistics['Média'], grouped.mean(), rtol=1e-12)
+    np.testing.assert_allclose(statistics['Variância'], grouped.var(), rtol=1e-9)
+    np.testing.assert_allclose(statistics['Assimetria'], grouped.skew(), rtol=1e-9)
+    np.testing.assert_allclose(statistics['Curtose'], grouped.apply(pd.Series.kurt), rtol=1e-9)
+
+
+def test_merge_after_chunking_matches_a_single_pass(rais_data):
+    whole = CentralMoments.from_frame(rais_data, by='ano', median="exact")
+    chunks = [rais_data.iloc[start:start + 173] for start in range(0, len(rais_data), 173)]
+    streamed = CentralMoments.from_chunks(chunks, by='ano', median="exact")
+    merged = CentralMoments(by='ano', median="exact")
+    for chunk in chunks:
+        merged.merge(CentralMoments.from_frame(chunk, by='ano', median="exact"))
+
+    for moments in (streamed, merged):
+        pd.testing.assert_frame_equal(moments.table, whole.table, rtol=1e-9)
+        assert moments.summary() == pytest.approx(whole.summary(), rel=1e-9)
+
+
+def test_small_and_constant_samples():
+    constant = CentralMoments.from_frame(pd.DataFrame({'valor_remuneracao_media': [5.0] * 6}), median="exact")
+    single = CentralMoments.from_frame(pd.DataFrame({'valor_remuneracao_media': [5.0, np.nan]}), median="exact")
+    empty = CentralMoments(median="sketch")
+
+    assert constant.summary() == pytest.approx(reference(pd.Series([5.0] * 6)))
+    assert single.summary() == pytest.approx(reference(pd.Series([5.0])), nan_ok=True)
+    assert empty.summary()["Registros"] == 0 and np.isnan(empty.summary()["Mediana"])
+
+
+def test_missing_group_keys_stay_in_the_total(rais_data):
+    df = rais_data.copy()
+    df.loc[df.index[::7], 'ano'] = pd.NA
+    moments = CentralMoments.from_frame(df, by='ano', median="exact")
+
+    assert moments.summary() == pytest.approx(reference(df['valor_remuneracao_media']), rel=1e-9)
+    by_year = BasicStatistics(df).calculate_average_salary_by_year()
+    expected = df.groupby('ano')['valor_remuneracao_media'].mean()
+    assert list(by_year['Ano']) == list(expected.index)
+    np.testing.assert_allclose(by_year['Média Salarial'], expected, rtol=1e-12)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.clustered_layout import ClusteredLayout, segment_groupby
+from src.data.data_filter import DataFilter
+from src.data.schema import title_case
+
+
+@pytest.fixture
+def unsorted_sexes():
+    # title_case preserva a ordem do dicionário: ['MASCULINO', 'feminino'] -> ['Masculino', 'Feminino']
+    raw = pd.Series(pd.Categorical(['MASCULINO', 'feminino', 'MASCULINO', 'feminino', 'MASCULINO'],
+                                   categories=['MASCULINO', 'feminino']))
+    sexes = title_case(raw)
+    assert list(sexes.cat.categories) == ['Masculino', 'Feminino']
+    return sexes
+
+
+def test_locate_with_unsorted_categories(unsorted_sexes):
+    # Ordenado pelos códigos, como ao ler do cache um conjunto já agrupado
+    df = pd.DataFrame({'sexo': unsorted_sexes, 'valor_remuneracao_media': [1.0, 2.0, 3.0, 4.0, 5.0]})
+    df = df.sort_values('sexo', kind='stable', ignore_index=True)
+    ClusteredLayout.register(df, ['sexo'])
+
+    women = DataFilter(df).sex('Feminino').collect()
+    assert list(women['sexo']) == ['Feminino', 'Feminino']
+    assert list(women['valor_remuneracao_media']) == [2.0, 4.0]
+    assert DataFilter(df).sex('Outro').collect().empty
+
+
+def test_cluster_sorts_key_categories(unsorted_sexes):
+    df = pd.DataFrame({'sexo': unsorted_sexes, 'idade': [30, 40, 25, 50, 35]})
+    clustered = ClusteredLayout.cluster(df, ['sexo', 'idade'])
+
+    assert clustered['sexo'].cat.categories.is_monotonic_increasing
+    assert list(clustered['sexo']) == ['Feminino', 'Feminino', 'Masculino', 'Masculino', 'Masculino']
+    (start, stop), unused = ClusteredLayout.of(clustered).locate(sexo='Masculino', idade=(30, 40))
+    assert unused == []
+    assert list(clustered['idade'].iloc[start:stop]) == [30, 35]
+
+
+def test_filters_match_boolean_masks(rais_frame):
+    df = rais_frame.dropna(subset=['valor_remuneracao_media']).astype({'sigla_uf': 'category', 'sexo': 'category'})
+    df = df.assign(sexo=title_case(df['sexo']))
+    plain = df.reset_index(drop=True)
+    clustered = ClusteredLayout.cluster(plain.copy(), ['ano', 'sigla_uf', 'sexo', 'idade'])
+
+    cases = [
+        {'year': 2022},
+        {'year': 2022, 'state': 'PR'},
+        {'year': 2023, 'state': 'SP', 'sex': 'Feminino'},
+        {'state': 'PR', 'sex': 'Masculino'},
+        {'year': 2021, 'state': 'SC', 'sex': 'Feminino', 'age': (25, 40)},
+        {'year': [2021, 2023], 'state': 'PR'},
+        {'state': 'RJ'},
+    ]
+    for predicates in cases:
+        expected = DataFilter(plain).where(**predicates).count()
+        assert DataFilter(clustered).where(**predicates).count() == expected, predicates
+
+
+def test_segment_groupby_matches_groupby(rais_frame):
+    df = rais_frame.astype({'sigla_uf': 'category'})
+    clustered = ClusteredLayout.cluster(df, ['ano', 'sigla_uf'])
+    for by in ('ano', 'sigla_uf'):
+        expected = df.groupby(by, observed=True)['valor_remuneracao_media'].agg(['mean', 'sum', 'count'])
+        result = segment_groupby(clustered, by, 'valor_remuneracao_media', ['mean', 'sum', 'count'])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_names=False)
+        assert np.allclose(result['mean'], expected['mean'])
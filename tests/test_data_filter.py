@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from src.data.clustered_layout import ClusteredLayout
+from src.data.data_filter import DataFilter
+
+
+def eager_mask(df, predicates):
+    masks = {
+        'cbo': lambda value: df['cbo_2002'].astype(str).str.startswith(tuple(value)),
+        'age': lambda value: df['idade'].between(*value),
+        'state': lambda value: df['sigla_uf'].isin([value] if isinstance(value, str) else value),
+        'municipality': lambda value: df['id_municipio'].isin([value] if isinstance(value, int) else value),
+        'sex': lambda value: df['sexo'] == value,
+        'year': lambda value: df['ano'].isin([value] if isinstance(value, int) else value),
+        'occupation': lambda value: df['cbo_2002_descricao'] == value,
+    }
+    mask = pd.Series(True, index=df.index)
+    for name, value in predicates.items():
+        mask &= masks[name](value).fillna(False).astype(bool)
+    return mask
+
+
+CASES = [
+    {'state': 'PR'},
+    {'cbo': ['2124', '3171'], 'age': (25, 45), 'state': ['PR', 'SC']},
+    {'year': 2022, 'sex': 'Feminino'},
+    {'municipality': [4106902, 3550308], 'occupation': 'Programador de sistemas de informação'},
+    {'year': [2021, 2023], 'state': 'SP', 'sex': 'Masculino', 'age': (30, 60)},
+    {'state': 'RJ'},
+]
+
+
+@pytest.mark.parametrize("layout", ["plain", "indexed", "clustered"])
+def test_collect_matches_the_eager_mask(rais_data, layout):
+    df = rais_data
+    if layout == "clustered":
+        df = ClusteredLayout.cluster(df.copy(), ['ano', 'sigla_uf', 'sexo', 'idade'])
+
+    for predicates in CASES:
+        data_filter = DataFilter(df)
+        if layout == "indexed":
+            data_filter.build_index()
+        expected = df[eager_mask(df, predicates)]
+        pd.testing.assert_frame_equal(data_filter.where(**predicates).collect(), expected, obj=str(predicates))
+
+
+def test_collect_returns_independent_frames(rais_frame):
+    data_filter = DataFilter(rais_frame)
+    first = data_filter.state('PR').collect()
+    first['valor_remuneracao_media'] = 0.0
+
+    second = data_filter.state('PR').collect()
+    assert (second['valor_remuneracao_media'].dropna() != 0.0).all()
+    assert (rais_frame['valor_remuneracao_media'].dropna() != 0.0).all()
@@ -0,0 +1,88 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.analysis.sections import ANALYSIS_SECTIONS, required_columns
+from src.data import data_loader
+from src.data.data_loader import DataLoader
+from src.data.deduplication import HashDeduplicator
+
+
+def preprocess(path, **kwargs):
+    return DataLoader(path, **kwargs).load_preprocessed_data(use_cache=False)
+
+
+def test_full_preprocessing_matches_drop_duplicates(rais_csv):
+    loader = DataLoader(rais_csv)
+    expected = loader.apply_row_rules(loader.load_data())
+    expected = DataLoader.remove_outliers(expected, 'valor_remuneracao_media').drop_duplicates()
+
+    assert len(preprocess(rais_csv)) == len(expected)
+
+
+@pytest.mark.parametrize("section", list(ANALYSIS_SECTIONS))
+def test_row_count_does_not_depend_on_sections(rais_csv, section):
+    full = preprocess(rais_csv)
+    projected = preprocess(rais_csv, columns=required_columns([section]))
+
+    assert len(projected) == len(full)
+    assert projected['valor_remuneracao_media'].sum() == pytest.approx(full['valor_remuneracao_media'].sum())
+    assert HashDeduplicator.HASH_COLUMN not in projected.columns
+    assert set(projected.columns) <= set(required_columns([section])) | set(DataLoader.PREPROCESSING_COLUMNS)
+
+
+@pytest.mark.parametrize("options", [{'chunksize': 300}, {'engine': 'pyarrow'}, {'engine': 'pyarrow', 'chunksize': 300}])
+def test_projected_row_count_with_chunks_and_engines(rais_csv, options):
+    full = preprocess(rais_csv)
+    projected = preprocess(rais_csv, columns=required_columns(['position_analysis']), **options)
+
+    assert len(projected) == len(full)
+
+
+def test_out_of_core_chunks_do_not_depend_on_sections(rais_csv):
+    def rows(columns):
+        loader = DataLoader(rais_csv, columns=columns, chunksize=300)
+        return sum(len(chunk) for chunk in loader.iter_preprocessed_chunks())
+
+    assert rows(required_columns(['position_analysis'])) == rows(None) == len(preprocess(rais_csv))
+
+
+@pytest.mark.parametrize("module", ['deduplication.py', 'data_filter.py', 'quantile_sketch.py', 'clustered_layout.py'])
+def test_cache_key_depends_on_every_preprocessing_module(rais_csv, tmp_path, monkeypatch, module):
+    root = tmp_path / 'data'
+    shutil.copytree(data_loader.DATA_PACKAGE, root, ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.setattr(data_loader, 'DATA_PACKAGE', str(root))
+    original = DataLoader(rais_csv).preprocessing_params()
+    assert DataLoader(rais_csv).preprocessing_params() == original
+
+    with open(root / module, 'a') as f:
+        f.write('\n# alteração\n')
+    assert DataLoader(rais_csv).preprocessing_params()['regras'] != original['regras']
+
+
+@pytest.mark.parametrize("options", [
+    {}, {'chunksize': 300}, {'use_schema': False}, {'columns': required_columns(['gender_analysis']), 'chunksize': 300},
+])
+@pytest.mark.parametrize("compression", [None, 'gzip'])
+def test_arrow_engine_matches_the_default_engine(rais_frame, tmp_path, options, compression):
+    path = str(tmp_path / ("microdados.csv.gz" if compression else "microdados.csv"))
+    rais_frame.to_csv(path, index=False, compression=compression)
+
+    expected = preprocess(path, engine='c', **options)
+    result = preprocess(path, engine='pyarrow', **options)
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("options", [{}, {'chunksize': 300}, {'engine': 'pyarrow'}, {'engine': 'pyarrow', 'chunksize': 300}])
+def test_filter_pushdown_matches_filtering_the_csv_first(rais_frame, rais_csv, tmp_path, options):
+    filters = {'cbo': ['2124', '3171'], 'age': (25, 45), 'state': ['PR', 'SC']}
+    where = (rais_frame['cbo_2002'].astype(str).str.startswith(('2124', '3171'))
+             & rais_frame['idade'].between(25, 45) & rais_frame['sigla_uf'].isin(['PR', 'SC']))
+    path = tmp_path / "selecao.csv"
+    rais_frame[where].to_csv(path, index=False)
+
+    expected = preprocess(str(path))
+    result = preprocess(rais_csv, filters=filters, **options)
+    assert 0 < len(result) < len(preprocess(rais_csv))
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
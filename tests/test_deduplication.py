@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.deduplication import HashDeduplicator, SortedHashRuns
+
+
+def chunks_of(df, size):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+def test_sorted_hash_runs_match_a_set():
+    rng = np.random.default_rng(0)
+    runs, reference = SortedHashRuns(), set()
+    for _ in range(100):
+        hashes = np.unique(rng.integers(0, 2 ** 20, size=rng.integers(0, 300), dtype=np.uint64))
+        found = runs.contains(hashes)
+        assert found.tolist() == [value in reference for value in hashes.tolist()]
+        runs.add(hashes[~found])
+        reference.update(hashes[~found].tolist())
+
+    assert len(runs) == len(reference)
+    assert len(runs.runs) <= int(np.log2(len(reference))) + 1
+    assert set(runs.to_array().tolist()) == reference
+
+
+@pytest.mark.parametrize("memory_mb", [256, 0.0005])
+def test_iter_unique_matches_drop_duplicates(rais_frame, memory_mb):
+    deduplicator = HashDeduplicator(memory_mb=memory_mb, partitions=4)
+    unique = pd.concat(list(deduplicator.iter_unique(chunks_of(rais_frame, 150))))
+    expected = rais_frame.drop_duplicates()
+
+    assert len(unique) == len(expected)
+    assert deduplicator.removed == len(rais_frame) - len(expected)
+    pd.testing.assert_frame_equal(unique.sort_index(), expected)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.data.filter_index import FilterIndex
+
+
+@pytest.fixture(params=["raw", "preprocessed"])
+def frame(request, rais_frame, rais_data):
+    df = rais_frame if request.param == "raw" else rais_data.copy()
+    # Valores ausentes nas dimensões indexadas
+    df.loc[df.index[::37], 'idade'] = np.nan
+    df.loc[df.index[::41], 'cbo_2002'] = np.nan
+    df.loc[df.index[::43], 'sigla_uf'] = np.nan
+    return df.reset_index(drop=True)
+
+
+def masks(df):
+    return {
+        'state': ('PR', df['sigla_uf'] == 'PR'),
+        'municipality': ([4106902, 3550308, 1], df['id_municipio'].isin([4106902, 3550308])),
+        'sex': (df['sexo'].iloc[0], df['sexo'] == df['sexo'].iloc[0]),
+        'year': ([2021, 2023], df['ano'].isin([2021, 2023])),
+        'age': ((18, 30), df['idade'].between(18, 30)),
+        'cbo': (['2124', '3171', '142505'],
+                df['cbo_2002'].astype(object).astype(str).str.startswith(('2124', '3171', '142505'))
+                & df['cbo_2002'].notna()),
+        'occupation': ('Programador de sistemas de informação',
+                       df['cbo_2002_descricao'] == 'Programador de sistemas de informação'),
+    }
+
+
+def test_each_dimension_matches_its_boolean_mask(frame):
+    index = FilterIndex(frame)
+
+    for name, (value, mask) in masks(frame).items():
+        expected = np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+        np.testing.assert_array_equal(index.select(**{name: value}), expected, err_msg=name)
+
+
+def test_combined_predicates_match_the_combined_mask(frame):
+    index = FilterIndex(frame)
+    predicates = masks(frame)
+
+    for names in [('state', 'age'), ('cbo', 'year', 'sex'), ('municipality', 'occupation', 'age', 'year')]:
+        mask = np.logical_and.reduce([predicates[name][1].fillna(False).to_numpy(dtype=bool) for name in names])
+        rows = index.select(**{name: predicates[name][0] for name in names})
+        np.testing.assert_array_equal(rows, np.flatnonzero(mask), err_msg=str(names))
+
+
+def test_empty_selections_and_unknown_dimensions(frame):
+    index = FilterIndex(frame)
+
+    assert len(index.select(state='XX')) == 0
+    assert len(index.select(age=(200, 300), state='PR')) == 0
+    np.testing.assert_array_equal(index.select(), np.arange(len(frame)))
+    with pytest.raises(ValueError):
+        FilterIndex(frame.drop(columns='idade')).age(18, 30)
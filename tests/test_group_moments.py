@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import f as f_distribution
+from scipy.stats import f_oneway
+
+from src.analysis.aggregate_cube import AggregateCube
+from src.analysis.group_moments import GroupMoments
+
+
+def welch_reference(groups):
+    # ANOVA de Welch (1951), calculada diretamente sobre os valores de cada grupo
+    k = len(groups)
+    n = np.array([len(group) for group in groups], dtype='float64')
+    means = np.array([np.mean(group) for group in groups])
+    weights = n / np.array([np.var(group, ddof=1) for group in groups])
+    weighted_mean = (weights * means).sum() / weights.sum()
+    lambda_ = ((1 - weights / weights.sum()) ** 2 / (n - 1)).sum()
+    stat = (weights * (means - weighted_mean) ** 2).sum() / (k - 1) / (1 + 2 * (k - 2) / (k ** 2 - 1) * lambda_)
+    return stat, f_distribution.sf(stat, k - 1, (k ** 2 - 1) / (3 * lambda_))
+
+
+def test_constant_groups():
+    df = pd.DataFrame({
+        'grupo': ['a'] * 1000 + ['b'] * 1000,
+        'valor_remuneracao_media': [1412.37] * 1000 + [1500.11] * 1000,
+    })
+    moments = GroupMoments.from_frame(df, 'grupo')
+
+    assert (moments.variances() == 0).all()
+    result = moments.anova()
+    assert result['Estatística'] == np.inf
+    assert result['Valor-p'] == 0
+    reference = f_oneway([1412.37] * 1000, [1500.11] * 1000)
+    assert reference.statistic == np.inf and reference.pvalue == 0
+
+    same = GroupMoments.from_frame(df.assign(valor_remuneracao_media=1412.37), 'grupo').anova()
+    assert np.isnan(same['Estatística'])
+
+
+def test_small_variance_around_large_mean():
+    rng = np.random.default_rng(1)
+    groups = [1e8 + rng.normal(loc, 0.01, size=500) for loc in (0.0, 0.001, 0.002)]
+    df = pd.DataFrame({'grupo': np.repeat([0, 1, 2], 500), 'valor_remuneracao_media': np.concatenate(groups)})
+    moments = GroupMoments.from_frame(df, 'grupo')
+
+    assert np.allclose(moments.variances(), [np.var(group, ddof=1) for group in groups], rtol=1e-6)
+    result, reference = moments.anova(), f_oneway(*groups)
+    # As médias (da ordem de 1e8) diferem em 1e-3, o que limita a precisão de ambos os cálculos
+    assert result['Estatística'] == pytest.approx(reference.statistic, rel=1e-4)
+    assert result['Valor-p'] == pytest.approx(reference.pvalue, rel=1e-4)
+
+
+def test_anova_and_welch_match_references(rais_data):
+    groups = [group.to_numpy() for _, group in rais_data.groupby('sigla_uf', observed=True)['valor_remuneracao_media']]
+    moments = GroupMoments.from_frame(rais_data, 'sigla_uf')
+
+    result, reference = moments.anova(), f_oneway(*groups)
+    assert result['Estatística'] == pytest.approx(reference.statistic)
+    assert result['Valor-p'] == pytest.approx(reference.pvalue)
+
+    welch, (stat, p_value) = moments.welch_anova(), welch_reference(groups)
+    assert welch['Estatística'] == pytest.approx(stat)
+    assert welch['Valor-p'] == pytest.approx(p_value)
+
+
+def test_merge_after_chunking_matches_whole_frame(rais_data):
+    by = ['sigla_uf', 'sexo']
+    whole = GroupMoments.from_frame(rais_data, by)
+    chunked = GroupMoments.from_chunks((rais_data.iloc[start:start + 250] for start in range(0, len(rais_data), 250)), by)
+
+    pd.testing.assert_frame_equal(chunked.table, whole.table, check_index_type=False, check_categorical=False)
+    assert chunked.anova() == pytest.approx(whole.anova())
+
+
+def test_cube_matches_records(rais_data):
+    cube = AggregateCube(rais_data)
+    from_cube = GroupMoments('sigla_uf', table=cube.table(['sigla_uf'])[GroupMoments.COLUMNS])
+    records = rais_data.groupby('sigla_uf', observed=True)['valor_remuneracao_media']
+
+    assert np.allclose(from_cube.means(), records.mean())
+    assert np.allclose(from_cube.variances(), records.var())
@@ -0,0 +1,37 @@
+import shutil
+
+import pandas as pd
+
+from src.analysis import memoization
+from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.memoization import AnalysisMemo
+from src.config import Config
+
+
+def key(memo, df):
+    return memo.key(df, BasicStatistics.calculate_average_salary, {})
+
+
+def test_key_depends_on_result_settings(monkeypatch):
+    df = pd.DataFrame({'valor_remuneracao_media': [1.0, 2.0]})
+    memo = AnalysisMemo()
+    original = key(memo, df)
+
+    monkeypatch.setattr(Config, 'MEMO_MAX_ENTRIES', 1)
+    assert key(memo, df) == original
+    monkeypatch.setattr(Config, 'MEDIAN_METHOD', 'sketch')
+    assert key(memo, df) != original
+
+
+def test_key_depends_on_every_source_module(tmp_path, monkeypatch):
+    df = pd.DataFrame({'valor_remuneracao_media': [1.0, 2.0]})
+    root = tmp_path / 'src'
+    shutil.copytree(memoization.SOURCE_ROOT, root, ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.setattr(memoization, 'SOURCE_ROOT', str(root))
+    original = key(AnalysisMemo(), df)
+    assert key(AnalysisMemo(), df) == original
+
+    # Alteração em um módulo auxiliar, e não no módulo do método memorizado
+    with open(root / 'data' / 'quantile_sketch.py', 'a') as f:
+        f.write('\n# alteração\n')
+    assert key(AnalysisMemo(), df) != original
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.basic_statistics import BasicStatistics
+from src.analysis.bootstrap import Bootstrap
+from src.analysis.employment_indexes import EmploymentIndexes
+from src.analysis.gender_analysis import GenderAnalysis
+from src.analysis.out_of_core import OutOfCoreAnalysis
+from src.analysis.position_analysis import PositionAnalysis
+from src.analysis.predictive_models import PredictiveModels
+from src.analysis.regional_analysis import RegionalAnalysis
+from src.analysis.statistical_tests import StatisticalTests
+from src.data.data_loader import DataLoader
+from tests.conftest import make_rais_frame
+
+
+# Os dados e os resumos são lidos uma vez por módulo (as análises não os modificam)
+@pytest.fixture(scope="module")
+def module_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp("rais") / "microdados.csv"
+    make_rais_frame().to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def rais_data(module_csv):
+    return DataLoader(module_csv).load_preprocessed_data(use_cache=False)
+
+
+@pytest.fixture(scope="module")
+def summaries(module_csv):
+    return OutOfCoreAnalysis.from_chunks(DataLoader(module_csv, chunksize=300).iter_preprocessed_chunks())
+
+
+def assert_same(expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(
+            expected.reset_index(drop=True), actual.reset_index(drop=True), check_dtype=False, check_categorical=False
+        )
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(expected, actual, check_dtype=False, check_index_type=False)
+    elif isinstance(expected, dict):
+        assert expected.keys() == actual.keys()
+        for key in expected:
+            assert_same(expected[key], actual[key])
+    elif isinstance(expected, (tuple, list)):
+        for left, right in zip(expected, actual):
+            assert_same(left, right)
+    elif expected is None or isinstance(expected, str):
+        assert actual == expected
+    else:
+        assert actual == pytest.approx(expected, rel=1e-9, nan_ok=True)
+
+
+CALLS = [
+    (BasicStatistics, 'calculate_average_salary_by_year', {}),
+    (BasicStatistics, 'calculate_total_employees', {}),
+    (BasicStatistics, 'calculate_average_salary', {}),
+    (GenderAnalysis, 'gender_salary_gap', {}),
+    (GenderAnalysis, 'gender_counts', {}),
+    (GenderAnalysis, 'gender_equality_metrics', {}),
+    (GenderAnalysis, 'gender_equality_metrics', {'occupation': 'Programador de sistemas de informação',
+                                                 'region': 'PR'}),
+    (GenderAnalysis, 'gender_equality_matrix', {}),
+    (GenderAnalysis, 'compare_salary_by_gender_top_10_jobs', {}),
+    (GenderAnalysis, 'top_active_employees_by_year', {'sigla_uf': 'PR'}),
+    (GenderAnalysis, 'top_active_municipalities_by_state', {}),
+    (PositionAnalysis, 'analyze_unique_positions', {'sort_by': 'Frequência', 'ascending': False}),
+    (RegionalAnalysis, 'regional_analysis', {}),
+    (RegionalAnalysis, 'concentration_of_jobs', {'level': 'municipio'}),
+    (RegionalAnalysis, 'average_salary_by_region', {}),
+    (RegionalAnalysis, 'average_salary_top_5_cities', {}),
+    (EmploymentIndexes, 'salary_disparity_index', {}),
+    (EmploymentIndexes, 'regional_concentration_index', {'state': 'SP'}),
+    (EmploymentIndexes, 'regional_concentration_indexes', {'by_year': True}),
+    (EmploymentIndexes, 'education_index', {}),
+    (StatisticalTests, 'compare_gender_salaries', {'test': 't-test'}),
+    (StatisticalTests, 'compare_gender_salaries', {'test': 'mann-whitney'}),
+    (StatisticalTests, 'gender_salary_means', {}),
+    (StatisticalTests, 'anova_salary_by_region', {'welch': True}),
+    (StatisticalTests, 'anova_salary_by_sector', {}),
+    (StatisticalTests, 'gender_gap_tests', {'by': ('cbo_2002_descricao', 'sigla_uf')}),
+    (Bootstrap, 'confidence_intervals', {'n_replicates': 50}),
+]
+
+
+@pytest.mark.parametrize("analysis_class, method, kwargs", CALLS)
+def test_summaries_match_in_memory_analysis(rais_data, summaries, analysis_class, method, kwargs):
+    expected = getattr(analysis_class(rais_data), method)(**kwargs)
+    actual = getattr(analysis_class(summaries), method)(**kwargs)
+
+    assert_same(expected, actual)
+
+
+def test_salary_moments_match_except_for_the_sketched_median(rais_data, summaries):
+    expected = BasicStatistics(rais_data).salary_moments()
+    actual = BasicStatistics(summaries).salary_moments()
+
+    expected.pop("Mediana")
+    assert_same(expected, {key: value for key, value in actual.items() if key != "Mediana"})
+    salaries = np.sort(rais_data['valor_remuneracao_media'].dropna())
+    rank = np.searchsorted(salaries, actual["Mediana"], side='right') / len(salaries)
+    assert rank == pytest.approx(0.5, abs=0.01)
+
+
+def test_gender_equality_matrix_counts_rows_and_covers_all_records(rais_data, summaries):
+    matrix = GenderAnalysis(summaries).gender_equality_matrix()
+    genders = rais_data['sexo'].isin(['Masculino', 'Feminino'])
+
+    assert matrix['Homens'].sum() + matrix['Mulheres'].sum() == genders.sum()
+    assert summaries.salary_counts.to_numpy().sum() == rais_data['valor_remuneracao_media'].notna().sum()
+
+
+def test_predictions_match_linear_regression(rais_data):
+    from sklearn.linear_model import LinearRegression
+
+    # Níveis de escolaridade com os rótulos da RAIS
+    levels = {'Médio Completo': 'MEDIO COMPL', 'Superior Completo': 'SUP. COMP', 'Mestrado': 'MESTRADO'}
+    data = rais_data.assign(grau_instrucao_apos_2005=rais_data['grau_instrucao_apos_2005'].astype(object).map(levels))
+    summaries = OutOfCoreAnalysis.from_chunks(data.iloc[start:start + 300] for start in range(0, len(data), 300))
+
+    expected = {}
+    for gender in ['Masculino', 'Feminino']:
+        rows = data[data['sexo'] == gender].copy()
+        rows['grau_instrucao_num'] = rows['grau_instrucao_apos_2005'].map(PredictiveModels.EDUCATION_MAPPING)
+        rows = rows.dropna(subset=PredictiveModels.PREDICTION_FEATURES + ['valor_remuneracao_media'])
+        model = LinearRegression().fit(rows[PredictiveModels.PREDICTION_FEATURES], rows['valor_remuneracao_media'])
+        expected[gender] = model.predict(pd.DataFrame(PredictiveModels.PREDICTION_PROFILES)).mean()
+
+    for source in (data, summaries):
+        predictions = PredictiveModels(source).predict_gender_salary_2024()
+        assert predictions == pytest.approx(expected, rel=1e-6)
+
+
+def test_merged_summaries_match_a_single_pass(module_csv, summaries):
+    chunks = list(DataLoader(module_csv, chunksize=300).iter_preprocessed_chunks())
+    left = OutOfCoreAnalysis.from_chunks(chunks[:3])
+    right = OutOfCoreAnalysis.from_chunks(chunks[3:], seed=1)
+    merged = left.merge(right)
+
+    assert merged.count == summaries.count
+    assert_same(GenderAnalysis(summaries).gender_equality_matrix(), GenderAnalysis(merged).gender_equality_matrix())
+    assert_same(StatisticalTests(summaries).anova_salary_by_region(), StatisticalTests(merged).anova_salary_by_region())
+
+
+def test_unsupported_aggregations_raise(summaries):
+    with pytest.raises(ValueError):
+        GenderAnalysis(summaries).gender_equality_matrix(level="municipio")
+    with pytest.raises(ValueError):
+        StatisticalTests(summaries).gender_gap_tests(rank_test=True)
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from src.data.partitioned_store import PartitionedStore
+from tests.conftest import make_rais_frame
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PartitionedStore(str(tmp_path / 'particoes'))
+
+
+def write_csv(path, years):
+    df = make_rais_frame(n=600)
+    df[df['ano'].isin(years)].to_csv(path, index=False)
+    return str(path)
+
+
+def test_reingest_removes_years_that_left_the_file(tmp_path, store):
+    path = write_csv(tmp_path / 'a.csv', [2021, 2022, 2023])
+    assert store.ingest(path) == [2021, 2022, 2023]
+
+    write_csv(tmp_path / 'a.csv', [2021, 2022])
+    assert store.ingest(path) == [2021, 2022]
+
+    assert store.years() == [2021, 2022]
+    assert not os.path.exists(store.partition_path(2023))
+    assert store.manifest['arquivos'][os.path.abspath(path)]['anos'] == [2021, 2022]
+    assert set(PartitionedStore(store.base_dir).load()['ano']) == {2021, 2022}
+
+
+def test_takeover_updates_previous_owner(tmp_path, store):
+    first = write_csv(tmp_path / 'a.csv', [2021, 2022, 2023])
+    second = write_csv(tmp_path / 'b.csv', [2023])
+    store.ingest(first)
+    store.ingest(second)
+
+    files = store.manifest['arquivos']
+    assert files[os.path.abspath(first)]['anos'] == [2021, 2022]
+    assert files[os.path.abspath(second)]['anos'] == [2023]
+    assert store.manifest['anos']['2023']['arquivo'] == os.path.abspath(second)
+
+    # O segundo arquivo deixa de ter 2023 e passa a ter 2022, que era do primeiro
+    write_csv(tmp_path / 'b.csv', [2022])
+    store.ingest(second)
+    assert store.years() == [2021, 2022]
+    assert files[os.path.abspath(first)]['anos'] == [2021]
+    assert files[os.path.abspath(second)]['anos'] == [2022]
+
+
+def test_single_year_ingestion_keeps_other_years(tmp_path, store):
+    path = write_csv(tmp_path / 'a.csv', [2021, 2022, 2023])
+    store.ingest(path, year=2021)
+    store.ingest(path, year=2022)
+
+    assert store.years() == [2021, 2022]
+    assert store.manifest['arquivos'][os.path.abspath(path)]['anos'] == [2021, 2022]
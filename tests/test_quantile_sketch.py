@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.data.quantile_sketch import KLLSketch
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def rank_errors(sketch, values):
+    """Distância entre o rank (normalizado) de cada quantil estimado e o quantil pedido."""
+    values = np.sort(values)
+    estimates = sketch.quantile(QUANTILES)
+    low = np.searchsorted(values, estimates, side='left') / len(values)
+    high = np.searchsorted(values, estimates, side='right') / len(values)
+    # Com empates, qualquer rank do trecho do valor estimado é aceito
+    return np.maximum(0, np.maximum(low - QUANTILES, QUANTILES - high))
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [50, 200])
+def test_rank_error_is_within_the_bound(k, seed):
+    values = np.random.default_rng(seed).lognormal(8.2, 0.5, size=100_000)
+    sketch = KLLSketch.from_values(values, k=k, seed=seed)
+
+    assert rank_errors(sketch, values).max() <= sketch.rank_error()
+    assert sum(len(items) for items in sketch.compactors) <= 3 * k + 8 * len(sketch.compactors)
+
+
+def test_merged_chunks_are_within_the_bound():
+    values = np.round(np.random.default_rng(1).lognormal(8.2, 0.5, size=100_000) / 50) * 50
+    sketch = KLLSketch(k=200)
+    for seed, chunk in enumerate(np.array_split(values, 37)):
+        sketch.merge(KLLSketch.from_values(chunk, k=200, seed=seed))
+
+    assert len(sketch) == len(values)
+    assert rank_errors(sketch, values).max() <= sketch.rank_error()
+
+
+def test_extremes_are_exact_and_missing_values_are_ignored():
+    values = np.array([3.0, np.nan, 1.0, 7.0, np.nan, 5.0])
+    sketch = KLLSketch.from_values(values, k=8)
+
+    assert len(sketch) == 4
+    assert sketch.quantile([0, 1]).tolist() == [1.0, 7.0]
+    assert np.isnan(KLLSketch().median())
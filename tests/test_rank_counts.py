@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.stats import mannwhitneyu
+
+from src.analysis.rank_counts import RankCounts
+
+
+def samples(seed, n1=700, n2=500, step=50):
+    """Salários com muitos empates (múltiplos de `step`) e alguns ausentes."""
+    rng = np.random.default_rng(seed)
+    first = np.round(rng.lognormal(8.3, 0.5, size=n1) / step) * step
+    second = np.round(rng.lognormal(8.2, 0.5, size=n2) / step) * step
+    first[::53] = np.nan
+    return first, second
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("step", [1, 50, 500])
+def test_exact_mode_matches_mannwhitneyu(seed, step):
+    first, second = samples(seed, step=step)
+    result = RankCounts(bin_width=None).update(first, second).test()
+    expected = mannwhitneyu(first[~np.isnan(first)], second, method="asymptotic")
+
+    assert result["Estatística"] == pytest.approx(expected.statistic, rel=1e-12)
+    assert result["Valor-p"] == pytest.approx(expected.pvalue, rel=1e-9)
+    assert result["Erro Máximo da Estatística"] == 0.0
+
+
+def test_merge_after_chunking_matches_a_single_pass():
+    first, second = samples(7)
+    whole = RankCounts(bin_width=None).update(first, second)
+    merged = RankCounts(bin_width=None)
+    for part_first, part_second in zip(np.array_split(first, 9), np.array_split(second, 9)):
+        merged.merge(RankCounts(bin_width=None).update(part_first, part_second))
+
+    assert merged.sizes() == whole.sizes()
+    assert merged.test() == pytest.approx(whole.test())
+
+
+@pytest.mark.parametrize("bin_width", [10, 100, 1000])
+def test_binned_statistic_is_within_max_error(bin_width):
+    first, second = samples(3, step=1)
+    exact = RankCounts(bin_width=None).update(first, second).statistic()
+    binned = RankCounts(bin_width=bin_width).update(first, second)
+
+    assert binned.sizes() == (np.count_nonzero(~np.isnan(first)), len(second))
+    assert abs(binned.statistic() - exact) <= binned.max_error()
+
+
+def test_empty_sample_has_no_p_value():
+    result = RankCounts(bin_width=None).update([1.0, 2.0], []).test()
+
+    assert result["Estatística"] == 0.0
+    assert np.isnan(result["Valor-p"])
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import mannwhitneyu, ttest_ind, ttest_ind_from_stats
+
+from src.analysis.statistical_tests import StatisticalTests
+
+CELLS = ['cbo_2002_descricao', 'sigla_uf', 'ano']
+
+
+def cell_values(df, row):
+    cell = df[(df[CELLS] == [row['Cargo'], row['Estado'], row['Ano']]).all(axis=1)]
+    return (cell.loc[cell['sexo'] == 'Masculino', 'valor_remuneracao_media'],
+            cell.loc[cell['sexo'] == 'Feminino', 'valor_remuneracao_media'])
+
+
+def test_gender_gap_tests_match_scipy(rais_data):
+    results = StatisticalTests(rais_data).gender_gap_tests(rank_test=True)
+    tested = results.dropna(subset=['Valor-p'])
+    assert len(tested) > 10
+
+    for _, row in tested.iterrows():
+        men, women = cell_values(rais_data, row)
+        t_test = ttest_ind(men, women, equal_var=False)
+        assert row['Estatística t'] == pytest.approx(t_test.statistic)
+        assert row['Valor-p'] == pytest.approx(t_test.pvalue)
+
+        u_test = mannwhitneyu(men, women, method='asymptotic')
+        assert row['Estatística U'] == pytest.approx(u_test.statistic)
+        assert row['Valor-p (Mann-Whitney)'] == pytest.approx(u_test.pvalue)
+
+
+def test_constant_salaries_keep_the_cell():
+    men = [1412.37] * 1000
+    women = list(np.linspace(1300.0, 1400.0, 50))
+    df = pd.DataFrame({
+        'cbo_2002_descricao': 'Programador',
+        'sigla_uf': 'PR',
+        'ano': 2023,
+        'sexo': ['Masculino'] * len(men) + ['Feminino'] * len(women),
+        'valor_remuneracao_media': men + women,
+    })
+    row = StatisticalTests(df).gender_gap_tests().iloc[0]
+
+    expected = ttest_ind_from_stats(1412.37, 0.0, len(men), np.mean(women), np.std(women, ddof=1), len(women),
+                                    equal_var=False)
+    assert row['Valor-p'] == pytest.approx(expected.pvalue)
+
+
+def test_rank_test_with_unobserved_categories(rais_data):
+    df = rais_data.astype({key: 'category' for key in ['cbo_2002_descricao', 'sigla_uf']})
+    df['sigla_uf'] = df['sigla_uf'].cat.add_categories(['AC', 'AM'])
+    results = StatisticalTests(df).gender_gap_tests(rank_test=True)
+
+    assert not results['Estado'].isin(['AC', 'AM']).any()
+    expected = StatisticalTests(rais_data).gender_gap_tests(rank_test=True)
+    pd.testing.assert_series_equal(results['Estatística U'], expected['Estatística U'])